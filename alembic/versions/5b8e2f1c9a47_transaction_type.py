@@ -0,0 +1,71 @@
+"""transaction type
+
+Revision ID: 5b8e2f1c9a47
+Revises: 0dbc34e96839
+Create Date: 2026-10-17 10:12:41.503118
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5b8e2f1c9a47"
+down_revision: str | Sequence[str] | None = "0dbc34e96839"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("transactions", sa.Column("transaction_type", sa.Text(), nullable=True))
+    op.add_column("transactions", sa.Column("first_tag", sa.Uuid(), nullable=True))
+    # the same rules as refresh_transaction_types of the store
+    op.execute(
+        """
+        UPDATE transactions AS t
+        SET transaction_type = derived.transaction_type, first_tag = derived.first_tag
+        FROM (
+            SELECT
+                t.id,
+                t.tags[1] AS first_tag,
+                CASE
+                    WHEN t.outcome = 0 AND t.income > 0 THEN
+                        CASE WHEN tag.show_outcome AND NOT tag.show_income THEN 'ReturnIncome' ELSE 'Income' END
+                    WHEN t.income = 0 AND t.outcome > 0 THEN
+                        CASE WHEN tag.show_income AND NOT tag.show_outcome THEN 'ReturnExpense' ELSE 'Expense' END
+                    WHEN t.income > 0 AND t.outcome > 0 THEN
+                        CASE
+                            WHEN income_account.type = 'debt' THEN 'LentOut'
+                            WHEN outcome_account.type = 'debt' THEN 'DebtRepaid'
+                            ELSE 'Transfer'
+                        END
+                    ELSE 'Transfer'
+                END AS transaction_type
+            FROM transactions AS t
+            LEFT JOIN tag ON tag.id = t.tags[1]
+            LEFT JOIN account AS income_account ON income_account.id = t.income_account
+            LEFT JOIN account AS outcome_account ON outcome_account.id = t.outcome_account
+        ) AS derived
+        WHERE t.id = derived.id
+        """
+    )
+    op.create_index(
+        "idx_transactions_exist_by_type_and_date",
+        "transactions",
+        ["transaction_type", "date"],
+        unique=False,
+        postgresql_where=sa.text("deleted = false"),
+    )
+    op.create_index("idx_transactions_first_tag", "transactions", ["first_tag"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_transactions_first_tag", table_name="transactions")
+    op.drop_index("idx_transactions_exist_by_type_and_date", table_name="transactions", postgresql_where=sa.text("deleted = false"))
+    op.drop_column("transactions", "first_tag")
+    op.drop_column("transactions", "transaction_type")
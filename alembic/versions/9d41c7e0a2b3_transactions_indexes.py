@@ -0,0 +1,94 @@
+"""transactions indexes
+
+Revision ID: 9d41c7e0a2b3
+Revises: 5b8e2f1c9a47
+Create Date: 2026-10-17 11:03:17.220954
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9d41c7e0a2b3"
+down_revision: str | Sequence[str] | None = "5b8e2f1c9a47"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY cannot run inside a transaction, the table stays writable while indexes are built
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_transactions_exist_by_sort_key",
+            "transactions",
+            ["date", "created", "id"],
+            unique=False,
+            postgresql_where=sa.text("deleted = false"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "idx_transactions_not_viewed_by_sort_key",
+            "transactions",
+            ["date", "created", "id"],
+            unique=False,
+            postgresql_where=sa.text("deleted = false AND viewed = false"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "idx_transactions_income_account",
+            "transactions",
+            ["income_account"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "idx_transactions_outcome_account",
+            "transactions",
+            ["outcome_account"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "idx_transactions_tags",
+            "transactions",
+            ["tags"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        # a prefix of the sort key index
+        op.drop_index(
+            "idx_transactions_exist_by_date_and_created",
+            table_name="transactions",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_transactions_exist_by_date_and_created",
+            "transactions",
+            ["date", "created"],
+            unique=False,
+            postgresql_where=sa.text("deleted = false"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index("idx_transactions_tags", table_name="transactions", postgresql_concurrently=True, if_exists=True)
+        op.drop_index("idx_transactions_outcome_account", table_name="transactions", postgresql_concurrently=True, if_exists=True)
+        op.drop_index("idx_transactions_income_account", table_name="transactions", postgresql_concurrently=True, if_exists=True)
+        op.drop_index("idx_transactions_not_viewed_by_sort_key", table_name="transactions", postgresql_concurrently=True, if_exists=True)
+        op.drop_index("idx_transactions_exist_by_sort_key", table_name="transactions", postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,66 @@
+"""transactions daily
+
+Revision ID: c3a7e91d5f20
+Revises: 9d41c7e0a2b3
+Create Date: 2026-10-17 15:04:19.220417
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c3a7e91d5f20"
+down_revision: str | Sequence[str] | None = "9d41c7e0a2b3"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "transactions_daily",
+        sa.Column("id", sa.BigInteger(), sa.Identity(), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("account", sa.Uuid(), nullable=False),
+        sa.Column("first_tag", sa.Uuid(), nullable=True),
+        sa.Column("instrument", sa.Integer(), nullable=False),
+        sa.Column("transaction_type", sa.Text(), nullable=True),
+        sa.Column("income", sa.DECIMAL(), nullable=False),
+        sa.Column("outcome", sa.DECIMAL(), nullable=False),
+        sa.Column("transactions_count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "idx_transactions_daily_key",
+        "transactions_daily",
+        ["date", "account", "first_tag", "instrument", "transaction_type"],
+        unique=True,
+        postgresql_nulls_not_distinct=True,
+    )
+    # the same sums as rebuild_daily_rollup of the store
+    op.execute(
+        """
+        INSERT INTO transactions_daily (date, account, first_tag, instrument, transaction_type, income, outcome, transactions_count)
+        SELECT date, account, first_tag, instrument, transaction_type, sum(income), sum(outcome), count(DISTINCT id)
+        FROM (
+            SELECT id, date, income_account AS account, first_tag, income_instrument AS instrument, transaction_type, income, 0 AS outcome
+            FROM transactions
+            WHERE deleted = false AND income != 0
+            UNION ALL
+            SELECT id, date, outcome_account AS account, first_tag, outcome_instrument AS instrument, transaction_type, 0 AS income, outcome
+            FROM transactions
+            WHERE deleted = false AND outcome != 0
+        ) AS sides
+        GROUP BY date, account, first_tag, instrument, transaction_type
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_transactions_daily_key", table_name="transactions_daily")
+    op.drop_table("transactions_daily")
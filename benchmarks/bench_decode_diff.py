@@ -0,0 +1,64 @@
+"""Items/sec of decoding diff transactions: `mr.load` into zm models with `zm_*_to_*` converters and explicit decoders.
+
+No network is needed, the payload is built from dumps of test transactions and parsed as the client does.
+
+    uv run python benchmarks/bench_decode_diff.py --rows 10000
+"""
+
+import argparse
+import dataclasses
+import decimal
+import json
+import time
+import uuid
+from collections.abc import Callable
+from typing import Any
+
+import marshmallow_recipe as mr
+
+from finstats.domain import Transaction
+from finstats.zenmoney.convert import transactions_to_zm_transactions, zm_transactions_to_transactions
+from finstats.zenmoney.decode import decode_entities
+from finstats.zenmoney.models import ZmTransaction
+from testing import testdata
+
+
+def make_items(count: int) -> list[dict[str, Any]]:
+    transactions = [dataclasses.replace(testdata.TransactionSalary, id=uuid.uuid4()) for _ in range(count)]
+    items = [mr.dump(item, naming_case=mr.CAMEL_CASE) for item in transactions_to_zm_transactions(transactions)]
+    return json.loads(json.dumps(items, default=str), parse_float=decimal.Decimal)
+
+
+def decode_by_models(items: list[dict[str, Any]]) -> list[Transaction]:
+    models = mr.load_many(ZmTransaction, items, naming_case=mr.CAMEL_CASE)
+    return zm_transactions_to_transactions(models)
+
+
+def bench(run: Callable[[list[dict[str, Any]]], list[Transaction]], items: list[dict[str, Any]], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run(items)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", default=10000, type=int)
+    parser.add_argument("--repeat", default=5, type=int)
+    args = parser.parse_args()
+
+    items = make_items(args.rows)
+    assert decode_entities("transaction", items) == decode_by_models(items)
+
+    baseline = bench(decode_by_models, items, args.repeat)
+    for name, elapsed in (
+        ("mr.load + convert", baseline),
+        ("decoders", bench(lambda items: decode_entities("transaction", items), items, args.repeat)),
+    ):
+        print(f"{name:>20}: {args.rows} items in {elapsed * 1000:.1f}ms, {args.rows / elapsed:,.0f} items/sec, x{baseline / elapsed:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Pages/sec of encoding a transactions page response: `mr.dump` with `json.dumps` and the compiled response encoder.
+
+No database is needed, the page is built in memory from test transactions.
+
+    uv run python benchmarks/bench_response_encoders.py --transactions 100
+"""
+
+import argparse
+import dataclasses
+import time
+import uuid
+
+from client import TransactionType
+from client.transaction import GetTransactionsResponse
+from finstats.server.convert import transaction_to_transaction_model
+from finstats.server.encoding import CompiledResponseEncoder, MrResponseEncoder, ResponseEncoder
+from testing import testdata
+
+
+def make_response(count: int) -> GetTransactionsResponse:
+    transactions = [
+        transaction_to_transaction_model(
+            dataclasses.replace(testdata.TransactionSalary, id=uuid.uuid4()),
+            tags_titles=["Salary"],
+            income_instrument_title="Russian Ruble",
+            outcome_instrument_title="Russian Ruble",
+            income_account_title="Card",
+            outcome_account_title="Card",
+            merchant_title=None,
+            transaction_type=TransactionType.Income,
+        )
+        for _ in range(count)
+    ]
+    return GetTransactionsResponse(limit=count, offset=0, total_count=count, transactions=transactions)
+
+
+def bench(encoder: ResponseEncoder, response: GetTransactionsResponse, repeat: int, number: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            encoder.encode(response)
+        best = min(best, (time.perf_counter() - started) / number)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--transactions", default=100, type=int)
+    parser.add_argument("--repeat", default=5, type=int)
+    parser.add_argument("--number", default=50, type=int)
+    args = parser.parse_args()
+
+    response = make_response(args.transactions)
+    encoders: dict[str, ResponseEncoder] = {"mr.dump + json": MrResponseEncoder(), "compiled": CompiledResponseEncoder()}
+    body = encoders["mr.dump + json"].encode(response)
+    assert all(encoder.encode(response) == body for encoder in encoders.values())
+
+    results = {name: bench(encoder, response, args.repeat, args.number) for name, encoder in encoders.items()}
+    baseline = results["mr.dump + json"]
+    for name, elapsed in results.items():
+        print(
+            f"{name:>16}: {args.transactions} transactions, {len(body)} bytes in {elapsed * 1000:.2f}ms, "
+            f"{1 / elapsed:,.0f} pages/sec, x{baseline / elapsed:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Client side of the transactions write path: extracting rows of save_transactions and COPY records of the bootstrap.
+
+Compares `dataclasses.asdict` per object (old from_dataclasses) with the precompiled shallow extractor.
+Also shows the cost of compiling the old upsert with inlined multi-row VALUES, now the statement is compiled once
+and executed with many rows. No database is needed, see bench_save_transactions.py for the whole write path.
+
+    uv run python benchmarks/bench_row_extractors.py --rows 10000 100000
+"""
+
+import argparse
+import dataclasses
+import time
+import uuid
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from sqlalchemy.dialects import postgresql as sa_postgresql
+from sqlalchemy.dialects.postgresql.asyncpg import dialect as asyncpg_dialect
+
+from finstats.domain import Transaction
+from finstats.store.base import TransactionsTable
+from finstats.store.misc import DEFAULT_CHUNK_SIZE, chunked, from_dataclasses, get_row_extractor, on_conflict_update_changed
+from testing import testdata
+
+
+def make_transactions(count: int) -> list[Transaction]:
+    return [dataclasses.replace(testdata.TransactionSalary, id=uuid.uuid4()) for _ in range(count)]
+
+
+def from_dataclasses_by_asdict(items: Sequence[Transaction]) -> list[dict[str, Any]]:
+    return [dataclasses.asdict(item) for item in items]
+
+
+def to_copy_records(items: Sequence[Transaction]) -> list[tuple[Any, ...]]:
+    _, values = get_row_extractor(Transaction)
+    return list(map(values, items))
+
+
+def compile_multi_values_upserts(transactions: list[Transaction]) -> None:
+    dialect = asyncpg_dialect()
+    for chunk in chunked(transactions, TransactionsTable, DEFAULT_CHUNK_SIZE):
+        rows = from_dataclasses_by_asdict(chunk)
+        stmt = on_conflict_update_changed(sa_postgresql.insert(TransactionsTable).values(rows), TransactionsTable, list(rows[0]))
+        stmt.compile(dialect=dialect)
+
+
+def bench(run: Callable[[list[Transaction]], object], transactions: list[Transaction], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run(transactions)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", default=[10000, 100000], type=int, nargs="+")
+    parser.add_argument("--repeat", default=3, type=int)
+    # compiling inlined VALUES takes too long to compare on big sizes
+    parser.add_argument("--compile-limit", default=10000, type=int)
+    args = parser.parse_args()
+
+    for count in args.rows:
+        transactions = make_transactions(count)
+        assert from_dataclasses(transactions) == from_dataclasses_by_asdict(transactions)
+        for name, run in (
+            ("asdict rows", from_dataclasses_by_asdict),
+            ("extracted rows", from_dataclasses),
+            ("copy records", to_copy_records),
+        ):
+            elapsed = bench(run, transactions, args.repeat)
+            print(f"{name:>20}: {count} rows in {elapsed * 1000:.1f}ms, {count / elapsed:,.0f} rows/sec")
+        if count <= args.compile_limit:
+            elapsed = bench(compile_multi_values_upserts, transactions, 1)
+            print(f"{'old VALUES compile':>20}: {count} rows in {elapsed * 1000:.1f}ms, {count / elapsed:,.0f} rows/sec")
+
+
+if __name__ == "__main__":
+    main()
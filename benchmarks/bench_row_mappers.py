@@ -0,0 +1,64 @@
+"""Rows/sec of mapping query rows to `Transaction`: kwargs built by getattr per field (old to_dataclass) and generated row mappers.
+
+No database is needed, rows are built in memory with the columns of `select(TransactionsTable)`.
+
+    uv run python benchmarks/bench_row_mappers.py --rows 10000
+"""
+
+import argparse
+import dataclasses
+import time
+import uuid
+from collections.abc import Callable, Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.engine.result import IteratorResult, SimpleResultMetaData
+
+from finstats.domain import Transaction
+from finstats.store.base import TransactionsTable
+from finstats.store.misc import to_dataclasses
+from testing import testdata
+
+
+def make_rows(count: int) -> Sequence[sa.Row]:
+    columns = tuple(column.name for column in TransactionsTable.__table__.columns)
+    values = []
+    for _ in range(count):
+        data = dataclasses.asdict(dataclasses.replace(testdata.TransactionSalary, id=uuid.uuid4()))
+        values.append(tuple(data.get(column) for column in columns))
+    return IteratorResult(SimpleResultMetaData(columns), iter(values)).all()
+
+
+def to_dataclasses_by_kwargs(rows: Sequence[sa.Row]) -> list[Transaction]:
+    field_names = tuple(field.name for field in dataclasses.fields(Transaction))
+    return [Transaction(**{field_name: getattr(row, field_name) for field_name in field_names}) for row in rows]
+
+
+def bench(run: Callable[[], list[Transaction]], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", default=10000, type=int)
+    parser.add_argument("--repeat", default=5, type=int)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    assert to_dataclasses(Transaction, rows) == to_dataclasses_by_kwargs(rows)
+
+    baseline = bench(lambda: to_dataclasses_by_kwargs(rows), args.repeat)
+    for name, elapsed in (
+        ("getattr kwargs", baseline),
+        ("row mapper", bench(lambda: to_dataclasses(Transaction, rows), args.repeat)),
+    ):
+        print(f"{name:>20}: {args.rows} rows in {elapsed * 1000:.1f}ms, {args.rows / elapsed:,.0f} rows/sec, x{baseline / elapsed:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Rows/sec of transactions upsert: one statement per row (old Syncer.save_diff), chunked multi-row statements and COPY bootstrap.
+
+Requires a migrated database configured by POSTGRES_* env, inserted rows are removed afterwards.
+
+    uv run python benchmarks/bench_save_transactions.py --rows 10000 100000 --chunk-size 1000
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import datetime
+import time
+import uuid
+
+import sqlalchemy as sa
+
+from finstats.container import Container
+from finstats.domain import Transaction
+from finstats.store import BootstrapLoader, ConnectionScope, TransactionsRepository, configure_container, get_pg_url_from_env
+from finstats.store.base import TransactionsTable
+from finstats.store.transactions import uuid_array
+from testing import testdata
+
+
+def make_transactions(count: int) -> list[Transaction]:
+    # a few transactions a day as in real histories, rows of one day are re-aggregated by the daily rollup on every save
+    salary = testdata.TransactionSalary
+    return [dataclasses.replace(salary, id=uuid.uuid4(), date=salary.date - datetime.timedelta(days=i // 5)) for i in range(count)]
+
+
+async def cleanup(connection_scope: ConnectionScope, transactions: list[Transaction]) -> None:
+    async with connection_scope.acquire() as connection:
+        await connection.execute(sa.delete(TransactionsTable).where(TransactionsTable.id == sa.any_(uuid_array([t.id for t in transactions]))))
+
+
+async def bench_one_by_one(repository: TransactionsRepository, connection_scope: ConnectionScope, transactions: list[Transaction]) -> float:
+    started = time.perf_counter()
+    async with connection_scope.acquire():
+        for transaction in transactions:
+            await repository.save_transactions([transaction])
+    return time.perf_counter() - started
+
+
+async def bench_chunked(
+    repository: TransactionsRepository,
+    connection_scope: ConnectionScope,
+    transactions: list[Transaction],
+    chunk_size: int,
+) -> float:
+    started = time.perf_counter()
+    async with connection_scope.acquire():
+        await repository.save_transactions(transactions, chunk_size=chunk_size)
+    return time.perf_counter() - started
+
+
+async def bench_bootstrap(
+    loader: BootstrapLoader,
+    repository: TransactionsRepository,
+    connection_scope: ConnectionScope,
+    transactions: list[Transaction],
+) -> float:
+    started = time.perf_counter()
+    async with connection_scope.acquire():
+        await loader.load(TransactionsTable, Transaction, transactions)
+        # as Syncer.bootstrap_diff, COPY bypasses the repository
+        await repository.refresh_transaction_types()
+    return time.perf_counter() - started
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", default=[10000, 100000], type=int, nargs="+")
+    # one statement per row is too slow to compare on big sizes
+    parser.add_argument("--one-by-one-limit", default=20000, type=int)
+    parser.add_argument("--chunk-size", default=1000, type=int)
+    args = parser.parse_args()
+
+    container = Container()
+    engine = configure_container(container, get_pg_url_from_env())
+    repository = container.resolve(TransactionsRepository)
+    loader = container.resolve(BootstrapLoader)
+    connection_scope = container.resolve(ConnectionScope)
+    try:
+        for count in args.rows:
+            for name, run in (
+                ("one by one", lambda txs: bench_one_by_one(repository, connection_scope, txs)),
+                (f"chunked by {args.chunk_size}", lambda txs: bench_chunked(repository, connection_scope, txs, args.chunk_size)),
+                ("copy bootstrap", lambda txs: bench_bootstrap(loader, repository, connection_scope, txs)),
+            ):
+                if name == "one by one" and count > args.one_by_one_limit:
+                    continue
+                transactions = make_transactions(count)
+                elapsed = await run(transactions)
+                print(f"{name:>20}: {count} rows in {elapsed:.2f}s, {count / elapsed:,.0f} rows/sec")
+                await cleanup(connection_scope, transactions)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,107 @@
+"""Pages/sec of building a transactions page response: enriching domain transactions into `TransactionModel`,
+then `mr.dump` and `json.dumps` as `web.json_response` does, with `dataclasses.asdict` converters and compiled ones.
+
+No database is needed, the page is built in memory from test transactions.
+
+    uv run python benchmarks/bench_transaction_models.py --transactions 100
+"""
+
+import argparse
+import dataclasses
+import json
+import time
+import uuid
+from collections.abc import Callable
+from unittest import mock
+
+import marshmallow_recipe as mr
+
+from client import TransactionModel
+from client.transaction import GetTransactionsResponse
+from finstats.domain import Transaction
+from finstats.server import transactions as transactions_controller
+from finstats.server.transactions import TransactionsController
+from finstats.store import TransactionReferences, TransactionsPage
+from testing import testdata
+
+
+def make_page(count: int) -> TransactionsPage:
+    transactions = [dataclasses.replace(testdata.TransactionSalary, id=uuid.uuid4()) for _ in range(count)]
+    references = TransactionReferences(
+        tags_titles=["Salary"],
+        income_account_title="Card",
+        income_account_type="ccard",
+        outcome_account_title="Card",
+        outcome_account_type="ccard",
+        income_instrument_title="Russian Ruble",
+        outcome_instrument_title="Russian Ruble",
+        merchant_title=None,
+    )
+    return TransactionsPage(
+        transactions=transactions,
+        total_count=count,
+        transaction_types={},
+        references={transaction.id: references for transaction in transactions},
+    )
+
+
+def transaction_to_transaction_model_by_asdict(transaction: Transaction, **kwargs: object) -> TransactionModel:
+    allowed = {field.name for field in dataclasses.fields(TransactionModel)}
+    data = {key: value for key, value in dataclasses.asdict(transaction).items() if key in allowed}
+    data.update(kwargs)
+    return TransactionModel(**data)
+
+
+def enrich(page: TransactionsPage) -> list[TransactionModel]:
+    return TransactionsController.enrich_transactions(page, page.transactions)
+
+
+def render(page: TransactionsPage) -> str:
+    response = GetTransactionsResponse(transactions=enrich(page), limit=len(page.transactions), offset=0, total_count=page.total_count)
+    return json.dumps(mr.dump(response))
+
+
+def bench(run: Callable[[TransactionsPage], object], page: TransactionsPage, repeat: int, number: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            run(page)
+        best = min(best, (time.perf_counter() - started) / number)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--transactions", default=100, type=int)
+    parser.add_argument("--repeat", default=5, type=int)
+    parser.add_argument("--number", default=50, type=int)
+    args = parser.parse_args()
+
+    page = make_page(args.transactions)
+    expected = enrich(page)
+
+    results: dict[str, dict[str, float]] = {}
+    for converters, converter in (
+        ("asdict", transaction_to_transaction_model_by_asdict),
+        ("compiled", transactions_controller.transaction_to_transaction_model),
+    ):
+        # the controller looks the converter up in its module on every call
+        with mock.patch.object(transactions_controller, "transaction_to_transaction_model", converter):
+            assert enrich(page) == expected
+            results[converters] = {
+                "enrich": bench(enrich, page, args.repeat, args.number),
+                "page": bench(render, page, args.repeat, args.number),
+            }
+
+    for stage in ("enrich", "page"):
+        baseline = results["asdict"][stage]
+        for converters, elapsed in results.items():
+            print(
+                f"{stage + ' ' + converters:>16}: {args.transactions} transactions in {elapsed[stage] * 1000:.2f}ms, "
+                f"{1 / elapsed[stage]:,.0f} pages/sec, x{baseline / elapsed[stage]:.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -15,8 +15,9 @@ from client.models import (
     TransactionId,
     UserId,
 )
+from client.stats import CategoryStatsModel, DailyStatsModel, TagStatsModel
 from client.tag import TagModel, TagType
-from client.transaction import TransactionModel, TransactionType
+from client.transaction import TotalCountMode, TransactionModel, TransactionType
 from client.user import UserModel
 
 __all__ = [
@@ -30,11 +31,15 @@ __all__ = [
     "TransactionId",
     "ReminderMarkerId",
     "TagType",
+    "TotalCountMode",
     "TransactionType",
     "AccountModel",
     "TransactionModel",
     "UserModel",
     "TagModel",
+    "CategoryStatsModel",
+    "DailyStatsModel",
+    "TagStatsModel",
     "InstrumentModel",
     "CountryModel",
     "MerchantModel",
@@ -16,6 +16,7 @@ from client.health import HealthResponse
 from client.instrument import GetInstrumentsResponse
 from client.merchant import GetMerchantsResponse, MerchantModel
 from client.models import ErrorResponse
+from client.stats import GetDailyStatsQueryData, GetDailyStatsResponse, GetStatsByTagQueryData, GetStatsByTagResponse
 from client.tag import GetTagsResponse
 from client.transaction import GetTransactionsQueryData, GetTransactionsResponse
 
@@ -36,16 +37,33 @@ class FinstatsClient:
             response_body = await self.__handle_response(HealthResponse, response)
             return response_body.api == "ok"
 
-    async def get_transactions(self, token: str | None = None) -> GetTransactionsResponse:
+    async def metrics(self) -> str:
+        response_ctx = self.__get(url="/metrics")
+        async with response_ctx as response:
+            if not response.is_successful():
+                raise Exception(await FinstatsClient.__try_parse_error_from_response(response))
+            return await response.text(encoding="utf-8")
+
+    async def get_transactions(self, query: GetTransactionsQueryData | None = None, token: str | None = None) -> GetTransactionsResponse:
         response_ctx = self.__get(
             url="/api/v1/transactions",
-            query=GetTransactionsQueryData(),
+            query=query or GetTransactionsQueryData(),
             token=token,
         )
 
         async with response_ctx as response:
             return await self.__handle_response(GetTransactionsResponse, response)
 
+    async def get_stats_by_tag(self, query: GetStatsByTagQueryData | None = None, token: str | None = None) -> GetStatsByTagResponse:
+        response_ctx = self.__get(url="/api/v1/stats/by-tag", query=query or GetStatsByTagQueryData(), token=token)
+        async with response_ctx as response:
+            return await self.__handle_response(GetStatsByTagResponse, response)
+
+    async def get_daily_stats(self, query: GetDailyStatsQueryData | None = None, token: str | None = None) -> GetDailyStatsResponse:
+        response_ctx = self.__get(url="/api/v1/stats/daily", query=query or GetDailyStatsQueryData(), token=token)
+        async with response_ctx as response:
+            return await self.__handle_response(GetDailyStatsResponse, response)
+
     async def get_accounts(
         self,
         show_archive: bool = False,
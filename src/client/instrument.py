@@ -20,4 +20,4 @@ class InstrumentModel:
     title: Annotated[str, mr.meta(description="Instrument title")]
     short_title: Annotated[str, mr.meta(description="Short instrument title")]
     symbol: Annotated[str, mr.meta(description="Instrument symbol")]
-    rate: Annotated[decimal.Decimal, mr.meta(description="Exchange rate relative to the base instrument")]
+    rate: Annotated[decimal.Decimal, mr.decimal_meta(places=None), mr.meta(description="Exchange rate relative to the base instrument")]
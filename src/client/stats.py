@@ -0,0 +1,69 @@
+import dataclasses
+import datetime
+import decimal
+from typing import Annotated
+
+import marshmallow_recipe as mr
+
+from client.models import AccountId, InstrumentId, TagId
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class GetStatsByTagQueryData:
+    from_date: Annotated[datetime.date | None, mr.meta(description="Count transactions starting from this date (inclusive)")] = None
+    to_date: Annotated[datetime.date | None, mr.meta(description="Count transactions up to this date (inclusive)")] = None
+    account_id: Annotated[AccountId | None, mr.meta(description="Count only transactions of this account (either income or outcome account)")] = None
+    in_user_currency: Annotated[
+        bool,
+        mr.meta(description="Convert amounts to the currency of the user by instrument rates, instruments without a rate stay as they are"),
+    ] = False
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class GetStatsByTagResponse:
+    categories: Annotated[list[CategoryStatsModel], mr.meta(description="Totals of top-level tags, one entry per tag and instrument")]
+
+
+@dataclasses.dataclass(frozen=True, slots=True, kw_only=True)
+class TagStatsModel:
+    tag_id: Annotated[TagId | None, mr.meta(description="Tag ID, null for transactions without tags")]
+    tag_title: Annotated[str | None, mr.meta(description="Tag title, null for transactions without tags")]
+    instrument: Annotated[InstrumentId, mr.meta(description="Instrument (currency) ID of the amounts")]
+    instrument_title: Annotated[str | None, mr.meta(description="Instrument title")]
+    income: Annotated[decimal.Decimal, mr.meta(description="Sum of incomes, including refunds of expenses")]
+    outcome: Annotated[decimal.Decimal, mr.meta(description="Sum of expenses, including returns of incomes")]
+    transactions_count: Annotated[int, mr.meta(description="Number of counted transactions")]
+
+
+@dataclasses.dataclass(frozen=True, slots=True, kw_only=True)
+class CategoryStatsModel:
+    tag_id: Annotated[TagId | None, mr.meta(description="Top-level tag ID, null for transactions without tags")]
+    tag_title: Annotated[str | None, mr.meta(description="Top-level tag title, null for transactions without tags")]
+    instrument: Annotated[InstrumentId, mr.meta(description="Instrument (currency) ID of the amounts")]
+    instrument_title: Annotated[str | None, mr.meta(description="Instrument title")]
+    income: Annotated[decimal.Decimal, mr.meta(description="Sum of incomes of the tag and its children, including refunds of expenses")]
+    outcome: Annotated[decimal.Decimal, mr.meta(description="Sum of expenses of the tag and its children, including returns of incomes")]
+    transactions_count: Annotated[int, mr.meta(description="Number of counted transactions")]
+    tags: Annotated[list[TagStatsModel], mr.meta(description="Totals of the tag itself and of each of its children in the same instrument")]
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class GetDailyStatsQueryData:
+    from_date: Annotated[datetime.date | None, mr.meta(description="Count transactions starting from this date (inclusive)")] = None
+    to_date: Annotated[datetime.date | None, mr.meta(description="Count transactions up to this date (inclusive)")] = None
+    account_id: Annotated[AccountId | None, mr.meta(description="Count only amounts of this account")] = None
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class GetDailyStatsResponse:
+    days: Annotated[list[DailyStatsModel], mr.meta(description="Totals of days with transactions, one entry per day and instrument")]
+
+
+@dataclasses.dataclass(frozen=True, slots=True, kw_only=True)
+class DailyStatsModel:
+    date: Annotated[datetime.date, mr.meta(description="Day of the totals")] = dataclasses.field(metadata=mr.datetime_meta(format="%Y-%m-%d"))
+    instrument: Annotated[InstrumentId, mr.meta(description="Instrument (currency) ID of the amounts")]
+    instrument_title: Annotated[str | None, mr.meta(description="Instrument title")]
+    income: Annotated[decimal.Decimal, mr.meta(description="Sum of incomes, including refunds of expenses")]
+    outcome: Annotated[decimal.Decimal, mr.meta(description="Sum of expenses, including returns of incomes")]
+    transactions_count: Annotated[int, mr.meta(description="Number of counted transactions")]
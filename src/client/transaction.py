@@ -19,17 +19,30 @@ class TransactionType(enum.StrEnum):
     ReturnExpense = "ReturnExpense"
 
 
+class TotalCountMode(enum.StrEnum):
+    Exact = "exact"
+    Estimated = "estimated"
+    Skip = "skip"
+
+
 @dataclasses.dataclass(frozen=True, slots=True)
 class GetTransactionsResponse:
     limit: Annotated[int, mr.meta(description="Maximum number of transactions returned in this response")]
     offset: Annotated[int, mr.meta(description="Number of records skipped from the beginning")]
-    total_count: Annotated[int, mr.meta(description="Total number of transactions matching the query filters")]
+    total_count: Annotated[
+        int | None,
+        mr.meta(description="Total number of transactions matching the query filters, estimated or null depending on total_count_mode"),
+    ]
     transactions: Annotated[list[TransactionModel], mr.meta(description="List of transaction objects")]
+    next_cursor: Annotated[
+        str | None,
+        mr.meta(description="Pass as cursor to get the next page, null when this page is the last one"),
+    ] = None
 
 
 @dataclasses.dataclass(frozen=True, slots=True)
 class GetTransactionsQueryData:
-    offset: Annotated[int, mr.meta(description="Number of records to skip for pagination")] = 0
+    offset: Annotated[int, mr.meta(description="Number of records to skip for pagination, cannot be combined with cursor")] = 0
     limit: Annotated[int, mr.meta(description="Maximum number of transactions to return (max: 100)")] = 100
     from_date: Annotated[datetime.date | None, mr.meta(description="Filter transactions starting from this date (inclusive)")] = None
     to_date: Annotated[datetime.date | None, mr.meta(description="Filter transactions up to this date (inclusive)")] = None
@@ -44,6 +57,18 @@ class GetTransactionsQueryData:
     transaction_type: Annotated[TransactionType, mr.meta(description="Filter transactions by transaction type: Income, Expense, Transfer")] = (
         mr.MISSING
     )
+    cursor: Annotated[
+        str | None,
+        mr.meta(description="Opaque cursor from next_cursor of the previous page, pages with a cursor cost the same at any depth"),
+    ] = None
+    total_count_mode: Annotated[
+        TotalCountMode,
+        mr.meta(description="How to compute total_count: exact (default), estimated (cheap planner estimate) or skip (null)"),
+    ] = TotalCountMode.Exact
+    in_user_currency: Annotated[
+        bool,
+        mr.meta(description="Also return income and outcome converted to the currency of the user by instrument rates"),
+    ] = False
 
 
 @dataclasses.dataclass(frozen=True, slots=True)
@@ -123,3 +148,12 @@ class TransactionModel:
     outcome_account_title: Annotated[str, mr.meta(description="Human-readable title for the outcomeAccount field")]
     merchant_title: Annotated[str | None, mr.meta(description="Human-readable title for the merchant field")]
     transaction_type: Annotated[TransactionType, mr.meta(description="Computed transaction type: Income, Expense, Transfer, DebtRepaid, or LentOut")]
+    user_currency: Annotated[InstrumentId | None, mr.meta(description="Currency of the user, set only when requested with in_user_currency")] = None
+    income_in_user_currency: Annotated[
+        decimal.Decimal | None,
+        mr.meta(description="Income converted to user_currency, null when not requested or a rate is unknown"),
+    ] = None
+    outcome_in_user_currency: Annotated[
+        decimal.Decimal | None,
+        mr.meta(description="Outcome converted to user_currency, null when not requested or a rate is unknown"),
+    ] = None
@@ -10,8 +10,8 @@ from finstats.args import CliArgs
 from finstats.container import Container, get_container
 from finstats.daemons import DaemonRegistry, SyncDiffDaemon
 from finstats.server import create_web_server, register_service_routes
-from finstats.store import configure_container, get_pg_url_from_env
-from finstats.syncer import Syncer
+from finstats.store import TransactionsRepository, configure_container, get_pg_url_from_env
+from finstats.syncer import Syncer, SyncMetrics
 from finstats.zenmoney import ZenMoneyClient
 
 
@@ -27,6 +27,7 @@ class MyApplication(Application):
         async with super()._configure_context(container):
             pg_url = get_pg_url_from_env()
             engine = configure_container(container, pg_url)
+            container.register(SyncMetrics)
             container.register(Syncer)
 
             client = ZenMoneyClient()
@@ -41,6 +42,11 @@ class MyApplication(Application):
         create_web_server(app, args)
 
     async def _run_command(self, app: web.Application, args: CliArgs) -> None:
+        if args.is_rebuild_rollup():
+            rows = await get_container(app).resolve(TransactionsRepository).rebuild_daily_rollup()
+            print(f"daily rollup rebuilt, {rows} rows")
+            return
+
         cli_syncer = get_container(app).resolve(Syncer)
         token = args.get_token()
 
@@ -66,6 +66,8 @@ class CliArgs:
         # sync command + token
         p.add_argument("--sync", action="store_true")
 
+        p.add_argument("--rebuild-rollup", action="store_true")
+
         local_environment = LocalEnvironment(self)
         self.__environment: HostingEnvironment = FlyEnvironment(local_environment) if (os.getenv("FLY_MACHINE_ID") is not None) else local_environment
         self.__args = p.parse_args(argv)
@@ -110,12 +112,51 @@ class CliArgs:
         port = os.getenv("APP_PORT")
         return 8080 if port is None else int(port)
 
+    def get_auth_cache_max_size(self) -> int:
+        size = os.getenv("AUTH_CACHE_MAX_SIZE")
+        return 1024 if size is None else int(size)
+
+    def get_auth_cache_ttl_seconds(self) -> float:
+        ttl = os.getenv("AUTH_CACHE_TTL_SECONDS")
+        return 300.0 if ttl is None else float(ttl)
+
+    def get_auth_cache_negative_ttl_seconds(self) -> float:
+        ttl = os.getenv("AUTH_CACHE_NEGATIVE_TTL_SECONDS")
+        return 5.0 if ttl is None else float(ttl)
+
+    def is_auth_piggyback_sync(self) -> bool:
+        value = os.getenv("AUTH_PIGGYBACK_SYNC")
+        return value is not None and value.lower() in ("1", "true", "yes")
+
+    def get_sync_chunk_size(self) -> int:
+        size = os.getenv("SYNC_CHUNK_SIZE")
+        return 1000 if size is None else int(size)
+
+    def is_sync_streaming(self) -> bool:
+        value = os.getenv("SYNC_STREAMING")
+        return value is not None and value.lower() in ("1", "true", "yes")
+
+    def get_sync_min_period_seconds(self) -> float:
+        period = os.getenv("SYNC_MIN_PERIOD_SECONDS")
+        return 30.0 if period is None else float(period)
+
+    def get_sync_max_period_seconds(self) -> float:
+        period = os.getenv("SYNC_MAX_PERIOD_SECONDS")
+        return 600.0 if period is None else float(period)
+
+    def get_response_encoder(self) -> str:
+        encoder = os.getenv("RESPONSE_ENCODER")
+        return "compiled" if encoder is None else encoder
+
     def get_output_file(self) -> str:
         return self.__args.out
 
     def is_sync(self) -> bool:
         return self.__args.sync
 
+    def is_rebuild_rollup(self) -> bool:
+        return self.__args.rebuild_rollup
+
     @property
     def hosting_environment(self) -> HostingEnvironment:
         return self.__environment
@@ -1,5 +1,14 @@
-from finstats.daemons.base import BaseDaemon, CronDaemon, PeriodicDaemon
+from finstats.daemons.base import AdaptivePeriodicDaemon, BaseDaemon, CronDaemon, PeriodicDaemon
 from finstats.daemons.registry import DaemonRegistry
+from finstats.daemons.schedule import AdaptiveSchedule
 from finstats.daemons.sync_diff import SyncDiffDaemon
 
-__all__ = ["DaemonRegistry", "BaseDaemon", "CronDaemon", "PeriodicDaemon", "SyncDiffDaemon"]
+__all__ = [
+    "DaemonRegistry",
+    "AdaptivePeriodicDaemon",
+    "AdaptiveSchedule",
+    "BaseDaemon",
+    "CronDaemon",
+    "PeriodicDaemon",
+    "SyncDiffDaemon",
+]
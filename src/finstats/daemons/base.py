@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 
+from finstats.daemons.schedule import AdaptiveSchedule
+
 
 class BaseDaemon(ABC):
     @abstractmethod
@@ -19,3 +21,21 @@ class PeriodicDaemon(BaseDaemon, ABC):
     @abstractmethod
     def get_run_period_seconds(self) -> float:
         pass
+
+
+class AdaptivePeriodicDaemon(PeriodicDaemon, ABC):
+    """Periodic daemon which runs more often while there is work and backs off while idle or failing."""
+
+    @abstractmethod
+    async def run_once(self) -> bool:
+        """Returns whether the run has found some work."""
+
+    @abstractmethod
+    def get_schedule(self) -> AdaptiveSchedule:
+        pass
+
+    async def run(self) -> None:
+        await self.run_once()
+
+    def get_run_period_seconds(self) -> float:
+        return self.get_schedule().min_seconds
@@ -9,7 +9,8 @@ from aiohttp import web
 
 from finstats.args import CliArgs
 from finstats.container import Container
-from finstats.daemons.base import BaseDaemon, CronDaemon, PeriodicDaemon
+from finstats.daemons.base import AdaptivePeriodicDaemon, BaseDaemon, CronDaemon, PeriodicDaemon
+from finstats.daemons.schedule import run_adaptively
 
 
 class DaemonRegistry:
@@ -34,6 +35,12 @@ class DaemonRegistry:
                     cron_expr=daemon.get_cron_expr(),
                     name=name,
                 )
+            if isinstance(daemon, AdaptivePeriodicDaemon):
+                return run_adaptively(
+                    func=daemon.run_once,
+                    schedule=daemon.get_schedule(),
+                    name=name,
+                )
             if isinstance(daemon, PeriodicDaemon):
                 return aio_background.run_periodically(
                     func=daemon.run,
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+import aio_background
+
+log = logging.getLogger(__name__)
+
+
+class AdaptiveSchedule:
+    """Interval between runs which drops to `min_seconds` after a run that found work
+    and grows by `backoff_factor` up to `max_seconds` after idle or failed runs.
+    """
+
+    __slots__ = (
+        "__backoff_factor",
+        "__interval",
+        "__jitter",
+        "__max_seconds",
+        "__min_seconds",
+        "__random",
+    )
+
+    def __init__(
+        self,
+        min_seconds: float,
+        max_seconds: float,
+        backoff_factor: float = 2.0,
+        jitter: float = 0.1,
+        random_func: Callable[[], float] = random.random,
+    ) -> None:
+        if min_seconds <= 0:
+            raise ValueError(f"min_seconds should be positive, got {min_seconds}")
+        if max_seconds < min_seconds:
+            raise ValueError(f"max_seconds {max_seconds} < min_seconds {min_seconds}")
+        if backoff_factor < 1:
+            raise ValueError(f"backoff_factor should be at least 1, got {backoff_factor}")
+        if not 0 <= jitter < 1:
+            raise ValueError(f"jitter should be in [0, 1), got {jitter}")
+        self.__min_seconds = min_seconds
+        self.__max_seconds = max_seconds
+        self.__backoff_factor = backoff_factor
+        self.__jitter = jitter
+        self.__random = random_func
+        self.__interval = min_seconds
+
+    @property
+    def min_seconds(self) -> float:
+        return self.__min_seconds
+
+    @property
+    def interval(self) -> float:
+        return self.__interval
+
+    def on_success(self, has_work: bool) -> float:
+        if has_work:
+            self.__interval = self.__min_seconds
+        else:
+            self.__back_off()
+        return self.__next_delay()
+
+    def on_failure(self) -> float:
+        self.__back_off()
+        return self.__next_delay()
+
+    def __back_off(self) -> None:
+        self.__interval = min(self.__interval * self.__backoff_factor, self.__max_seconds)
+
+    def __next_delay(self) -> float:
+        spread = self.__interval * self.__jitter
+        delay = self.__interval - spread + 2 * spread * self.__random()
+        return min(max(delay, self.__min_seconds), self.__max_seconds)
+
+
+def run_adaptively(func: Callable[[], Coroutine[Any, Any, bool]], *, schedule: AdaptiveSchedule, name: str = "unknown") -> aio_background.Job:
+    """Like `aio_background.run_periodically`, but the delay is taken from the schedule after each run.
+
+    The next run is scheduled only after the previous one finished, so runs never overlap.
+    """
+
+    async def adaptively() -> None:
+        # to de-synchronize jobs started at the same time
+        await asyncio.sleep(schedule.min_seconds * random.random())
+
+        attempt = 0
+        while True:
+            try:
+                # to have independent async context per run
+                has_work = await asyncio.create_task(func(), name=f"{name}.{attempt}")
+            except Exception:
+                log.exception("Job %s has got unexpected exception", name)
+                delay = schedule.on_failure()
+            else:
+                delay = schedule.on_success(has_work)
+
+            attempt += 1
+            log.debug("Job %s next run in %.1fs", name, delay)
+            await asyncio.sleep(delay)
+
+    return aio_background.run(adaptively, name=name)
@@ -1,10 +1,12 @@
 from finstats.args import CliArgs
-from finstats.daemons import PeriodicDaemon
+from finstats.daemons.base import AdaptivePeriodicDaemon
+from finstats.daemons.schedule import AdaptiveSchedule
 from finstats.syncer import Syncer
 
 
-class SyncDiffDaemon(PeriodicDaemon):
+class SyncDiffDaemon(AdaptivePeriodicDaemon):
     __slots__ = (
+        "__schedule",
         "__syncer",
         "__zm_client_token",
     )
@@ -12,10 +14,13 @@ class SyncDiffDaemon(PeriodicDaemon):
     def __init__(self, syncer: Syncer, cli_args: CliArgs) -> None:
         self.__syncer = syncer
         self.__zm_client_token = cli_args.get_token()
-        return
+        self.__schedule = AdaptiveSchedule(
+            min_seconds=cli_args.get_sync_min_period_seconds(),
+            max_seconds=cli_args.get_sync_max_period_seconds(),
+        )
 
-    async def run(self) -> None:
-        await self.__syncer.sync_once(self.__zm_client_token)
+    async def run_once(self) -> bool:
+        return await self.__syncer.sync_once(self.__zm_client_token)
 
-    def get_run_period_seconds(self) -> float:
-        return 60.0
+    def get_schedule(self) -> AdaptiveSchedule:
+        return self.__schedule
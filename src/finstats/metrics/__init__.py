@@ -0,0 +1,3 @@
+from finstats.metrics.metrics import DEFAULT_BUCKETS, Counter, Gauge, Histogram, Metric, render_metrics
+
+__all__ = ["DEFAULT_BUCKETS", "Counter", "Gauge", "Histogram", "Metric", "render_metrics"]
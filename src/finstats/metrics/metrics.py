@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import bisect
+import math
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Sequence
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Metric(ABC):
+    """Base of in-process metrics rendered in Prometheus text exposition format.
+
+    Every metric has a fixed set of label names, values are passed as keyword arguments.
+    """
+
+    __slots__ = ("__documentation", "__label_names", "__name")
+
+    metric_type = "untyped"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> None:
+        self.__name = name
+        self.__documentation = documentation
+        self.__label_names = tuple(label_names)
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    def render(self) -> list[str]:
+        documentation = self.__documentation.replace("\\", "\\\\").replace("\n", "\\n")
+        return [f"# HELP {self.__name} {documentation}", f"# TYPE {self.__name} {self.metric_type}", *self._render_samples()]
+
+    @abstractmethod
+    def _render_samples(self) -> list[str]: ...
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        if labels.keys() != set(self.__label_names):
+            raise ValueError(f"{self.__name} expects labels {self.__label_names}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.__label_names)
+
+    def _sample(self, suffix: str, key: tuple[str, ...], value: float, extra: tuple[tuple[str, str], ...] = ()) -> str:
+        pairs = (*zip(self.__label_names, key, strict=True), *extra)
+        labels = ",".join(f'{name}="{_escape_label_value(label)}"' for name, label in pairs)
+        return f"{self.__name}{suffix}{{{labels}}} {_format_value(value)}" if labels else f"{self.__name}{suffix} {_format_value(value)}"
+
+
+class Counter(Metric):
+    __slots__ = ("__values",)
+
+    metric_type = "counter"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, label_names)
+        self.__values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        if amount < 0:
+            raise ValueError(f"counter can only be increased, got {amount}")
+        key = self._key(labels)
+        self.__values[key] = self.__values.get(key, 0.0) + amount
+
+    def get(self, **labels: str) -> float:
+        return self.__values.get(self._key(labels), 0.0)
+
+    def _render_samples(self) -> list[str]:
+        return [self._sample("", key, value) for key, value in sorted(self.__values.items())]
+
+
+class Gauge(Metric):
+    __slots__ = ("__values",)
+
+    metric_type = "gauge"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, label_names)
+        self.__values: dict[tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        self.__values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        self.__values[key] = self.__values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def get(self, **labels: str) -> float:
+        return self.__values.get(self._key(labels), 0.0)
+
+    def _render_samples(self) -> list[str]:
+        return [self._sample("", key, value) for key, value in sorted(self.__values.items())]
+
+
+class Histogram(Metric):
+    __slots__ = ("__buckets", "__values")
+
+    metric_type = "histogram"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        if "le" in label_names:
+            raise ValueError("histogram cannot have 'le' label")
+        if list(buckets) != sorted(set(buckets)):
+            raise ValueError(f"buckets should be sorted and unique, got {buckets}")
+        super().__init__(name, documentation, label_names)
+        self.__buckets = tuple(buckets)
+        # per labels: observations count per bucket (the last one is +Inf), sum of observed values
+        self.__values: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        values = self.__values.get(key)
+        if values is None:
+            values = self.__values[key] = ([0] * (len(self.__buckets) + 1), [0.0])
+        counts, total = values
+        counts[bisect.bisect_left(self.__buckets, value)] += 1
+        total[0] += value
+
+    def get_count(self, **labels: str) -> int:
+        values = self.__values.get(self._key(labels))
+        return sum(values[0]) if values is not None else 0
+
+    def get_sum(self, **labels: str) -> float:
+        values = self.__values.get(self._key(labels))
+        return values[1][0] if values is not None else 0.0
+
+    def _render_samples(self) -> list[str]:
+        samples = []
+        for key, (counts, total) in sorted(self.__values.items()):
+            cumulative = 0
+            for upper_bound, count in zip((*self.__buckets, math.inf), counts, strict=True):
+                cumulative += count
+                samples.append(self._sample("_bucket", key, cumulative, extra=(("le", _format_value(upper_bound)),)))
+            samples.append(self._sample("_sum", key, total[0]))
+            samples.append(self._sample("_count", key, cumulative))
+        return samples
+
+
+def render_metrics(metrics: Iterable[Metric]) -> str:
+    lines = []
+    for metric in metrics:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    if float(value).is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
@@ -20,6 +20,10 @@ class AccountsController(BaseController):
     @aiohttp_apigami.response_schema(mr.schema(ErrorResponse), 500)
     async def get(self) -> web.StreamResponse:
         query_data = self.parse_request_query(GetAccountsQueryData)
-        repository = self.get_accounts_repository()
-        accounts = await repository.find_accounts(query_data.show_archive, query_data.show_debts)
-        return web.json_response(mr.dump(GetAccountsResponse(accounts_to_account_models(accounts))))
+        references = await self.get_reference_data()
+        accounts = [
+            account
+            for account in references.accounts.values()
+            if account.archive == query_data.show_archive and (query_data.show_debts or account.type != "debt")
+        ]
+        return self.json_response(GetAccountsResponse(accounts_to_account_models(accounts)))
@@ -3,12 +3,18 @@ from __future__ import annotations
 from aiohttp import web
 
 from finstats.args import CliArgs
+from finstats.container import get_container
 from finstats.server.accounts import AccountsController
+from finstats.server.auth import SingleFlight, TokenValidationCache
+from finstats.server.encoding import ResponseEncoder, create_response_encoder
 from finstats.server.health import HealthController
+from finstats.server.http_metrics import HttpMetrics
 from finstats.server.instruments import InstrumentsController
 from finstats.server.merchants import MerchantsController
-from finstats.server.middleware import auth_mw, error_middleware, request_id_middleware
+from finstats.server.metrics import MetricsController
+from finstats.server.middleware import auth_mw, error_middleware, metrics_middleware, request_id_middleware
 from finstats.server.openapi import setup_openapi
+from finstats.server.stats import DailyStatsController, StatsByTagController
 from finstats.server.tags import TagsController
 from finstats.server.transaction_expense import ExpenseTransactionsController
 from finstats.server.transaction_income import IncomeTransactionsController
@@ -16,12 +22,27 @@ from finstats.server.transactions import TransactionsController
 
 
 def register_service_routes(app: web.Application) -> None:
+    # registered on the root app, so requests to the api sub-app are measured too
+    get_container(app).register(HttpMetrics, instance=HttpMetrics())
+    response_encoder = create_response_encoder(get_container(app).resolve(CliArgs).get_response_encoder())
+    get_container(app).register(ResponseEncoder, instance=response_encoder)
+    app.middlewares.append(metrics_middleware)
+
     app.router.add_view("/health", HealthController)
+    app.router.add_view("/metrics", MetricsController)
 
 
 def create_web_server(app: web.Application, args: CliArgs) -> None:
     setup_openapi(app, args)
 
+    token_cache = TokenValidationCache(
+        max_size=args.get_auth_cache_max_size(),
+        positive_ttl_seconds=args.get_auth_cache_ttl_seconds(),
+        negative_ttl_seconds=args.get_auth_cache_negative_ttl_seconds(),
+    )
+    get_container(app).register(TokenValidationCache, instance=token_cache)
+    get_container(app).register(SingleFlight, instance=SingleFlight[bool]())
+
     web_server = web.Application(middlewares=[error_middleware, request_id_middleware, auth_mw])
     web_server.router.add_view("/v1/transactions", TransactionsController)
     web_server.router.add_view("/v1/transactions/expenses", ExpenseTransactionsController)
@@ -30,5 +51,7 @@ def create_web_server(app: web.Application, args: CliArgs) -> None:
     web_server.router.add_view("/v1/tags", TagsController)
     web_server.router.add_view("/v1/instruments", InstrumentsController)
     web_server.router.add_view("/v1/merchants", MerchantsController)
+    web_server.router.add_view("/v1/stats/by-tag", StatsByTagController)
+    web_server.router.add_view("/v1/stats/daily", DailyStatsController)
 
     app.add_subapp("/api", web_server)
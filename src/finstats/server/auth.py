@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import hashlib
+import time
+from collections.abc import Awaitable, Callable
+
+
+class TokenValidationCache:
+    """Bounded LRU cache of ZenMoney token validation results.
+
+    Tokens are never stored as is, entries are keyed by sha256 of the token.
+    Accepted tokens live for `positive_ttl_seconds`, rejected ones for `negative_ttl_seconds`.
+    """
+
+    __slots__ = (
+        "__clock",
+        "__entries",
+        "__hits",
+        "__max_size",
+        "__misses",
+        "__negative_ttl_seconds",
+        "__positive_ttl_seconds",
+    )
+
+    def __init__(
+        self,
+        max_size: int,
+        positive_ttl_seconds: float,
+        negative_ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_size < 0:
+            raise ValueError(f"max_size cannot be negative, got {max_size}")
+        self.__max_size = max_size
+        self.__positive_ttl_seconds = positive_ttl_seconds
+        self.__negative_ttl_seconds = negative_ttl_seconds
+        self.__clock = clock
+        self.__entries: collections.OrderedDict[bytes, tuple[bool, float]] = collections.OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+
+    @property
+    def hits(self) -> int:
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        return self.__misses
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def get(self, token: str) -> bool | None:
+        key = _hash_token(token)
+        entry = self.__entries.get(key)
+        if entry is None:
+            self.__misses += 1
+            return None
+
+        is_valid, expires_at = entry
+        if expires_at <= self.__clock():
+            del self.__entries[key]
+            self.__misses += 1
+            return None
+
+        self.__entries.move_to_end(key)
+        self.__hits += 1
+        return is_valid
+
+    def put(self, token: str, is_valid: bool) -> None:
+        ttl = self.__positive_ttl_seconds if is_valid else self.__negative_ttl_seconds
+        if ttl <= 0 or self.__max_size == 0:
+            return
+
+        key = _hash_token(token)
+        self.__entries[key] = (is_valid, self.__clock() + ttl)
+        self.__entries.move_to_end(key)
+        while len(self.__entries) > self.__max_size:
+            self.__entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self.__entries.clear()
+        self.__hits = 0
+        self.__misses = 0
+
+
+class SingleFlight[T]:
+    """Coalesces concurrent calls with the same key into a single in-flight call.
+
+    Waiters are shielded from the shared call, so cancelling one of them does not cancel the call for others.
+    """
+
+    __slots__ = ("__calls",)
+
+    def __init__(self) -> None:
+        self.__calls: dict[bytes, asyncio.Task[T]] = {}
+
+    def __len__(self) -> int:
+        return len(self.__calls)
+
+    async def do(self, token: str, fn: Callable[[], Awaitable[T]]) -> T:
+        key = _hash_token(token)
+        task = self.__calls.get(key)
+        if task is None:
+            task = asyncio.create_task(_call(fn))
+            self.__calls[key] = task
+            task.add_done_callback(lambda t: self.__forget(key, t))
+        return await asyncio.shield(task)
+
+    def __forget(self, key: bytes, task: asyncio.Task[T]) -> None:
+        if self.__calls.get(key) is task:
+            del self.__calls[key]
+        # result may be left without waiters if all of them were cancelled
+        if not task.cancelled():
+            task.exception()
+
+
+async def _call[T](fn: Callable[[], Awaitable[T]]) -> T:
+    return await fn()
+
+
+def _hash_token(token: str) -> bytes:
+    return hashlib.sha256(token.encode("utf-8")).digest()
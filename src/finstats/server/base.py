@@ -2,6 +2,9 @@ import marshmallow_recipe as mr
 from aiohttp import web
 
 from finstats.container import Container
+from finstats.server.auth import SingleFlight, TokenValidationCache
+from finstats.server.encoding import ResponseEncoder
+from finstats.server.http_metrics import HttpMetrics
 from finstats.store import (
     AccountsRepository,
     CompaniesRepository,
@@ -9,6 +12,9 @@ from finstats.store import (
     CountriesRepository,
     InstrumentsRepository,
     MerchantsRepository,
+    ReferenceData,
+    ReferenceDataCache,
+    StatsRepository,
     TagsRepository,
     TimestampRepository,
     TransactionsRepository,
@@ -34,6 +40,9 @@ class BaseController(web.View):
     def get_tags_repository(self) -> TagsRepository:
         return get_container(self.request).resolve(TagsRepository)
 
+    def get_stats_repository(self) -> StatsRepository:
+        return get_container(self.request).resolve(StatsRepository)
+
     def get_transactions_repository(self) -> TransactionsRepository:
         return get_container(self.request).resolve(TransactionsRepository)
 
@@ -49,6 +58,9 @@ class BaseController(web.View):
     def get_merchants_repository(self) -> MerchantsRepository:
         return get_container(self.request).resolve(MerchantsRepository)
 
+    async def get_reference_data(self) -> ReferenceData:
+        return await get_container(self.request).resolve(ReferenceDataCache).get()
+
     def get_syncer(self) -> Syncer:
         return get_container(self.request).resolve(Syncer)
 
@@ -72,6 +84,9 @@ class BaseController(web.View):
         except mr.ValidationError as e:
             raise web.HTTPBadRequest(reason=f"failed to parse query params: {e.normalized_messages()}") from e
 
+    def json_response(self, data: object, *, status: int = 200) -> web.Response:
+        return json_response(self.request, data, status=status)
+
     async def parse_request_body[T](self, cls: type[T]) -> T:
         try:
             json_body = await self.request.json()
@@ -84,6 +99,28 @@ def get_client(request: web.Request) -> ZenMoneyClient:
     return get_container(request).resolve(ZenMoneyClient)
 
 
+def get_token_validation_cache(request: web.Request) -> TokenValidationCache:
+    return get_container(request).resolve(TokenValidationCache)
+
+
+def get_token_validation_single_flight(request: web.Request) -> SingleFlight[bool]:
+    return get_container(request).resolve(SingleFlight)
+
+
+def get_http_metrics(request: web.Request) -> HttpMetrics:
+    return get_container(request).resolve(HttpMetrics)
+
+
+def get_response_encoder(request: web.Request) -> ResponseEncoder:
+    return get_container(request).resolve(ResponseEncoder)
+
+
+def json_response(request: web.Request, data: object, *, status: int = 200) -> web.Response:
+    # the same body and headers as web.json_response(mr.dump(data)) with the default encoder
+    body = get_response_encoder(request).encode(data)
+    return web.Response(body=body, status=status, content_type="application/json", charset="utf-8")
+
+
 def get_token(request: web.Request) -> str:
     token = request.headers.get("Authorization")
     if not token:
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import dataclasses
+import decimal
+from collections.abc import Callable
 from typing import Any
 
 from client import (
@@ -20,6 +22,7 @@ from finstats.domain import (
     Company,
     Country,
     Instrument,
+    InstrumentId,
     Merchant,
     Tag,
     TagId,
@@ -30,8 +33,7 @@ from finstats.domain import (
 
 # Account conversions
 def account_model_to_account(account: AccountModel) -> Account:
-    data = _filter_fields(dataclasses.asdict(account), Account)
-    return Account(**data)
+    return _account_model_to_account(account)
 
 
 def account_models_to_accounts(accounts: list[AccountModel]) -> list[Account]:
@@ -39,8 +41,7 @@ def account_models_to_accounts(accounts: list[AccountModel]) -> list[Account]:
 
 
 def account_to_account_model(account: Account) -> AccountModel:
-    data = _filter_fields(dataclasses.asdict(account), AccountModel)
-    return AccountModel(**data)
+    return _account_to_account_model(account)
 
 
 def accounts_to_account_models(accounts: list[Account]) -> list[AccountModel]:
@@ -49,8 +50,7 @@ def accounts_to_account_models(accounts: list[Account]) -> list[AccountModel]:
 
 # Transaction conversions
 def transaction_model_to_transaction(transaction: TransactionModel) -> Transaction:
-    data = _filter_fields(dataclasses.asdict(transaction), Transaction)
-    return Transaction(**data)
+    return _transaction_model_to_transaction(transaction)
 
 
 def transaction_models_to_transactions(transactions: list[TransactionModel]) -> list[Transaction]:
@@ -67,25 +67,28 @@ def transaction_to_transaction_model(
     outcome_account_title: str,
     merchant_title: str | None,
     transaction_type: TransactionType,
+    user_currency: InstrumentId | None = None,
+    income_in_user_currency: decimal.Decimal | None = None,
+    outcome_in_user_currency: decimal.Decimal | None = None,
 ) -> TransactionModel:
-    data = _filter_fields(dataclasses.asdict(transaction), TransactionModel)
-    data.update(
-        {
-            "tags_titles": tags_titles,
-            "income_instrument_title": income_instrument_title,
-            "outcome_instrument_title": outcome_instrument_title,
-            "income_account_title": income_account_title,
-            "outcome_account_title": outcome_account_title,
-            "merchant_title": merchant_title,
-            "transaction_type": transaction_type,
-        }
+    return _transaction_to_transaction_model(
+        transaction,
+        tags_titles=tags_titles,
+        income_instrument_title=income_instrument_title,
+        outcome_instrument_title=outcome_instrument_title,
+        income_account_title=income_account_title,
+        outcome_account_title=outcome_account_title,
+        merchant_title=merchant_title,
+        transaction_type=transaction_type,
+        user_currency=user_currency,
+        income_in_user_currency=income_in_user_currency,
+        outcome_in_user_currency=outcome_in_user_currency,
     )
-    return TransactionModel(**data)
 
 
 # User conversions
 def user_model_to_user(user: UserModel) -> User:
-    return User(**dataclasses.asdict(user))
+    return _user_model_to_user(user)
 
 
 def user_models_to_users(users: list[UserModel]) -> list[User]:
@@ -93,7 +96,7 @@ def user_models_to_users(users: list[UserModel]) -> list[User]:
 
 
 def user_to_user_model(user: User) -> UserModel:
-    return UserModel(**dataclasses.asdict(user))
+    return _user_to_user_model(user)
 
 
 def users_to_user_models(users: list[User]) -> list[UserModel]:
@@ -102,8 +105,7 @@ def users_to_user_models(users: list[User]) -> list[UserModel]:
 
 # Tag conversions
 def tag_model_to_tag(tag: TagModel) -> Tag:
-    data = _filter_fields(dataclasses.asdict(tag), Tag)
-    return Tag(**data)
+    return _tag_model_to_tag(tag)
 
 
 def tag_models_to_tags(tags: list[TagModel]) -> list[Tag]:
@@ -111,7 +113,7 @@ def tag_models_to_tags(tags: list[TagModel]) -> list[Tag]:
 
 
 def tag_to_tag_model(tag: Tag, *, children_ids: list[TagId]) -> TagModel:
-    return TagModel(**dataclasses.asdict(tag), children=children_ids)
+    return _tag_to_tag_model(tag, children=children_ids)
 
 
 def tags_to_tag_models(tags: list[Tag], *, children_ids_map: dict[TagId, list[TagId]]) -> list[TagModel]:
@@ -120,7 +122,7 @@ def tags_to_tag_models(tags: list[Tag], *, children_ids_map: dict[TagId, list[Ta
 
 # Instrument conversions
 def instrument_model_to_instrument(instrument: InstrumentModel) -> Instrument:
-    return Instrument(**dataclasses.asdict(instrument))
+    return _instrument_model_to_instrument(instrument)
 
 
 def instrument_models_to_instruments(instruments: list[InstrumentModel]) -> list[Instrument]:
@@ -128,7 +130,7 @@ def instrument_models_to_instruments(instruments: list[InstrumentModel]) -> list
 
 
 def instrument_to_instrument_model(instrument: Instrument) -> InstrumentModel:
-    return InstrumentModel(**dataclasses.asdict(instrument))
+    return _instrument_to_instrument_model(instrument)
 
 
 def instruments_to_instrument_models(instruments: list[Instrument]) -> list[InstrumentModel]:
@@ -137,7 +139,7 @@ def instruments_to_instrument_models(instruments: list[Instrument]) -> list[Inst
 
 # Country conversions
 def country_model_to_country(country: CountryModel) -> Country:
-    return Country(**dataclasses.asdict(country))
+    return _country_model_to_country(country)
 
 
 def country_models_to_countries(countries: list[CountryModel]) -> list[Country]:
@@ -145,7 +147,7 @@ def country_models_to_countries(countries: list[CountryModel]) -> list[Country]:
 
 
 def country_to_country_model(country: Country) -> CountryModel:
-    return CountryModel(**dataclasses.asdict(country))
+    return _country_to_country_model(country)
 
 
 def countries_to_country_models(countries: list[Country]) -> list[CountryModel]:
@@ -154,7 +156,7 @@ def countries_to_country_models(countries: list[Country]) -> list[CountryModel]:
 
 # Merchant conversions
 def merchant_model_to_merchant(merchant: MerchantModel) -> Merchant:
-    return Merchant(**dataclasses.asdict(merchant))
+    return _merchant_model_to_merchant(merchant)
 
 
 def merchant_models_to_merchants(merchants: list[MerchantModel]) -> list[Merchant]:
@@ -162,7 +164,7 @@ def merchant_models_to_merchants(merchants: list[MerchantModel]) -> list[Merchan
 
 
 def merchant_to_merchant_model(merchant: Merchant) -> MerchantModel:
-    return MerchantModel(**dataclasses.asdict(merchant))
+    return _merchant_to_merchant_model(merchant)
 
 
 def merchants_to_merchant_models(merchants: list[Merchant]) -> list[MerchantModel]:
@@ -171,7 +173,7 @@ def merchants_to_merchant_models(merchants: list[Merchant]) -> list[MerchantMode
 
 # Company conversions
 def company_model_to_company(company: CompanyModel) -> Company:
-    return Company(**dataclasses.asdict(company))
+    return _company_model_to_company(company)
 
 
 def company_models_to_companies(companies: list[CompanyModel]) -> list[Company]:
@@ -179,16 +181,44 @@ def company_models_to_companies(companies: list[CompanyModel]) -> list[Company]:
 
 
 def company_to_company_model(company: Company) -> CompanyModel:
-    return CompanyModel(**dataclasses.asdict(company))
+    return _company_to_company_model(company)
 
 
 def companies_to_company_models(companies: list[Company]) -> list[CompanyModel]:
     return [company_to_company_model(company) for company in companies]
 
 
-def _filter_fields(data: dict[str, Any], target_type: type) -> dict[str, Any]:
-    allowed = {field.name for field in dataclasses.fields(target_type)}
-    return {key: value for key, value in data.items() if key in allowed}
+def _compile_converter[S, T](source: type[S], target: type[T]) -> Callable[..., T]:
+    """Returns a function building `target` from the fields of `source` it has, other fields of `target` are keyword arguments.
+
+    The field map is computed once per pair of classes. Values are not copied, unlike with `dataclasses.asdict`,
+    which is fine for frozen entities.
+    """
+    source_fields = {field.name for field in dataclasses.fields(source)}  # ty:ignore[invalid-argument-type]
+    names = [field.name for field in dataclasses.fields(target) if field.init and field.name in source_fields]  # ty:ignore[invalid-argument-type]
+    arguments = "".join(f"{name}=obj.{name}, " for name in names)
+    source_code = f"def convert(obj, **kwargs):\n    return target({arguments}**kwargs)\n"
+    namespace: dict[str, Any] = {"target": target}
+    exec(compile(source_code, f"<converter of {source.__qualname__} to {target.__qualname__}>", "exec"), namespace)
+    return namespace["convert"]
+
+
+_account_model_to_account = _compile_converter(AccountModel, Account)
+_account_to_account_model = _compile_converter(Account, AccountModel)
+_transaction_model_to_transaction = _compile_converter(TransactionModel, Transaction)
+_transaction_to_transaction_model = _compile_converter(Transaction, TransactionModel)
+_user_model_to_user = _compile_converter(UserModel, User)
+_user_to_user_model = _compile_converter(User, UserModel)
+_tag_model_to_tag = _compile_converter(TagModel, Tag)
+_tag_to_tag_model = _compile_converter(Tag, TagModel)
+_instrument_model_to_instrument = _compile_converter(InstrumentModel, Instrument)
+_instrument_to_instrument_model = _compile_converter(Instrument, InstrumentModel)
+_country_model_to_country = _compile_converter(CountryModel, Country)
+_country_to_country_model = _compile_converter(Country, CountryModel)
+_merchant_model_to_merchant = _compile_converter(MerchantModel, Merchant)
+_merchant_to_merchant_model = _compile_converter(Merchant, MerchantModel)
+_company_model_to_company = _compile_converter(CompanyModel, Company)
+_company_to_company_model = _compile_converter(Company, CompanyModel)
 
 
 def calculate_transaction_type(
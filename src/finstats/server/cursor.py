@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import datetime
+import json
+import uuid
+
+from finstats.store import TransactionCursor
+
+
+def encode_transaction_cursor(cursor: TransactionCursor) -> str:
+    data = [cursor.date.isoformat(), cursor.created.isoformat(), str(cursor.id)]
+    return base64.urlsafe_b64encode(json.dumps(data, separators=(",", ":")).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_transaction_cursor(value: str) -> TransactionCursor:
+    """Raises ValueError if the value is not a cursor returned by `encode_transaction_cursor`."""
+    try:
+        raw = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+        date, created, transaction_id = json.loads(raw)
+        return TransactionCursor(
+            date=datetime.date.fromisoformat(date),
+            created=datetime.datetime.fromisoformat(created),
+            id=uuid.UUID(transaction_id),
+        )
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+        raise ValueError(f"invalid cursor {value!r}") from e
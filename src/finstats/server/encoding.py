@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import abc
+import datetime
+import decimal
+import itertools
+import json
+import math
+from collections.abc import Callable
+from typing import Any
+
+import marshmallow as m
+import marshmallow_recipe as mr
+
+from finstats.models import CliException
+
+type Encode = Callable[[Any], str]
+
+_encode_str = json.encoder.encode_basestring_ascii
+
+
+class ResponseEncoder(abc.ABC):
+    @abc.abstractmethod
+    def encode(self, data: object) -> bytes: ...
+
+
+class MrResponseEncoder(ResponseEncoder):
+    """`mr.dump` followed by `json.dumps`, what `web.json_response(mr.dump(data))` sends."""
+
+    def encode(self, data: object) -> bytes:
+        return json.dumps(mr.dump(data)).encode("utf-8")
+
+
+class CompiledResponseEncoder(ResponseEncoder):
+    """Writes JSON straight from response dataclasses, byte for byte what `MrResponseEncoder` writes for valid data.
+
+    An encoder is generated once per class from its `mr.schema`, so names, formats and decimal places stay
+    the ones of marshmallow_recipe. Unlike `mr.dump`, the dumped data is not validated.
+    Classes with fields the generator does not know are encoded by `MrResponseEncoder`.
+    """
+
+    __slots__ = (
+        "__encoders",
+        "__fallback",
+    )
+
+    def __init__(self) -> None:
+        self.__encoders: dict[type, Callable[[Any], bytes]] = {}
+        self.__fallback = MrResponseEncoder()
+
+    def encode(self, data: object) -> bytes:
+        encode = self.__encoders.get(type(data))
+        if encode is None:
+            encode = self.__compile(type(data))
+            self.__encoders[type(data)] = encode
+        return encode(data)
+
+    def __compile(self, cls: type) -> Callable[[Any], bytes]:
+        try:
+            encode = _SchemaCompiler().compile(mr.schema(cls))
+        except _UnsupportedSchemaError:
+            return self.__fallback.encode
+        return lambda data: encode(data).encode("utf-8")
+
+
+def create_response_encoder(name: str) -> ResponseEncoder:
+    match name:
+        case "compiled":
+            return CompiledResponseEncoder()
+        case "mr":
+            return MrResponseEncoder()
+        case _:
+            raise CliException(f"unknown response encoder {name!r}, expected 'compiled' or 'mr'")
+
+
+class _UnsupportedSchemaError(Exception):
+    pass
+
+
+class _SchemaCompiler:
+    """Generates functions returning the JSON text of `json.dumps(schema.dump(obj))`."""
+
+    __slots__ = (
+        "__compiling",
+        "__names",
+        "__namespace",
+    )
+
+    def __init__(self) -> None:
+        self.__compiling: set[int] = set()
+        self.__names = itertools.count()
+        self.__namespace: dict[str, Any] = {
+            "encode_str": _encode_str,
+            "encode_float": _encode_float,
+        }
+
+    def compile(self, schema: m.Schema) -> Encode:
+        if id(schema) in self.__compiling:
+            raise _UnsupportedSchemaError(f"cyclic schema {type(schema).__name__}")
+        self.__compiling.add(id(schema))
+
+        lines = ["    parts = []"]
+        include_none = _includes_none(schema)
+        for name, field in schema.dump_fields.items():
+            key = _encode_str(field.data_key if field.data_key is not None else name)
+            value = self.__value(field, "value")
+            lines.append(f"    value = obj.{field.attribute or name}")
+            if include_none:
+                lines.append(f"    parts.append({key + ': '!r} + ('null' if value is None else {value}))")
+            else:
+                lines.append("    if value is not None:")
+                lines.append(f"        parts.append({key + ': '!r} + {value})")
+        lines.append("    return '{' + ', '.join(parts) + '}'")
+
+        self.__compiling.discard(id(schema))
+        function_name = f"encode_{type(schema).__name__}_{next(self.__names)}"
+        source = f"def {function_name}(obj):\n" + "\n".join(lines) + "\n"
+        exec(compile(source, f"<response encoder of {type(schema).__name__}>", "exec"), self.__namespace)
+        return self.__namespace[function_name]
+
+    def __value(self, field: m.fields.Field, value: str) -> str:
+        """Returns an expression encoding a not None `value` of `field`."""
+        match field:
+            case mr.StrField() if not field.strip_whitespaces:  # ty:ignore[unresolved-attribute]
+                return f"encode_str({value})"
+            case m.fields.UUID():
+                return f"'\"' + str({value}) + '\"'"
+            case m.fields.Boolean():
+                return f"('true' if {value} else 'false')"
+            case m.fields.Integer() if not field.as_string:
+                return f"repr(int({value}))"
+            case m.fields.Float() if not field.as_string:
+                return f"encode_float({value})"
+            case m.fields.Decimal() if field.as_string:
+                return f"{self.__add(_decimal_encoder(field))}({value})"
+            case mr.DateTimeField():
+                return f"{self.__add(_datetime_encoder(field))}({value})"
+            case mr.DateField():
+                return f"{self.__add(_date_encoder(field))}({value})"
+            case mr.EnumField():
+                values = {member: json.dumps(member.value) for member in field.enum_type}  # ty:ignore[unresolved-attribute]
+                return f"{self.__add(values)}[{value}]"
+            case m.fields.List():
+                item = f"item_{next(self.__names)}"
+                encoded = self.__value(field.inner, item)
+                if field.inner.allow_none:
+                    encoded = f"('null' if {item} is None else {encoded})"
+                return f"('[' + ', '.join([{encoded} for {item} in {value}]) + ']')"
+            case m.fields.Nested() if not field.many and field.only is None and not field.exclude:
+                return f"{self.__add(self.compile(field.schema))}({value})"
+        raise _UnsupportedSchemaError(f"unsupported field {type(field).__name__}")
+
+    def __add(self, value: object) -> str:
+        name = f"helper_{next(self.__names)}"
+        self.__namespace[name] = value
+        return name
+
+
+def _includes_none(schema: m.Schema) -> bool:
+    # mr drops None values of a schema in a post_dump hook, unless the dataclass has other `mr.options`
+    remove_none_values = getattr(schema, "remove_none_values", None)
+    if remove_none_values is None:
+        raise _UnsupportedSchemaError(f"{type(schema).__name__} is not a schema of marshmallow_recipe")
+    return "value" in remove_none_values({"value": None})
+
+
+def _encode_float(value: float) -> str:
+    value = float(value)
+    if not math.isfinite(value):
+        raise ValueError(f"Out of range float values are not JSON compliant: {value!r}")
+    return float.__repr__(value)
+
+
+def _decimal_encoder(field: m.fields.Decimal) -> Encode:
+    places, rounding = field.places, field.rounding
+
+    def encode(value: decimal.Decimal) -> str:
+        # Decimal(str(value)) of a Decimal keeps its exponent, so only other numbers are converted
+        number = value if type(value) is decimal.Decimal else decimal.Decimal(str(value))
+        if not number.is_finite():
+            raise ValueError(f"Special numeric values are not permitted: {number!r}")
+        if places is not None:
+            number = number.quantize(places, rounding=rounding)
+        return '"' + format(number, "f") + '"'
+
+    return encode
+
+
+def _datetime_encoder(field: m.fields.DateTime) -> Encode:
+    serialize = _formatter(field)
+
+    def encode(value: datetime.datetime) -> str:
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=datetime.UTC)
+        return _encode_scalar(serialize(value))
+
+    return encode
+
+
+def _date_encoder(field: m.fields.Date) -> Encode:
+    serialize = _formatter(field)
+
+    def encode(value: datetime.date) -> str:
+        if isinstance(value, datetime.datetime):
+            value = value.date()
+        return _encode_scalar(serialize(value))
+
+    return encode
+
+
+def _formatter(field: m.fields.DateTime) -> Callable[[Any], str | float]:
+    data_format = field.format or field.DEFAULT_FORMAT
+    serialize = field.SERIALIZATION_FUNCS.get(data_format)
+    if serialize is not None:
+        return serialize
+    return lambda value: value.strftime(data_format)
+
+
+def _encode_scalar(value: str | float) -> str:
+    return _encode_str(value) if isinstance(value, str) else _encode_float(value)
@@ -17,6 +17,6 @@ class HealthController(BaseController):
         repository = self.get_timestamp_repository()
         try:
             last_timestamp = f"{await repository.get_last_timestamp()}"
-            return web.json_response(mr.dump(HealthResponse(api="ok", last_synced_timestamp=last_timestamp)))
+            return self.json_response(HealthResponse(api="ok", last_synced_timestamp=last_timestamp))
         except Exception:
-            return web.json_response(mr.dump(HealthResponse(api="error", last_synced_timestamp="unavailable")), status=503)
+            return self.json_response(HealthResponse(api="error", last_synced_timestamp="unavailable"), status=503)
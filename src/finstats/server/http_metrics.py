@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from finstats.metrics import Gauge, Histogram, Metric
+
+
+class HttpMetrics:
+    __slots__ = ("request_seconds", "requests_in_flight")
+
+    def __init__(self) -> None:
+        self.request_seconds = Histogram(
+            "finstats_http_request_seconds",
+            "Duration of HTTP requests by route, unmatched requests are reported as route 'unmatched'.",
+            ["method", "route", "status"],
+        )
+        self.requests_in_flight = Gauge("finstats_http_requests_in_flight", "HTTP requests being handled right now.", ["route"])
+
+    def get_metrics(self) -> list[Metric]:
+        return [self.request_seconds, self.requests_in_flight]
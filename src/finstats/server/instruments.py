@@ -17,7 +17,7 @@ class InstrumentsController(BaseController):
     @aiohttp_apigami.response_schema(mr.schema(ErrorResponse), 401)
     @aiohttp_apigami.response_schema(mr.schema(ErrorResponse), 500)
     async def get(self) -> web.StreamResponse:
-        repository = self.get_instruments_repository()
-        instruments = await repository.get_instruments()
+        references = await self.get_reference_data()
+        instruments = sorted(references.instruments.values(), key=lambda instrument: instrument.id)
         instrument_models = instruments_to_instrument_models(instruments)
-        return web.json_response(mr.dump(GetInstrumentsResponse(instrument_models)))
+        return self.json_response(GetInstrumentsResponse(instrument_models))
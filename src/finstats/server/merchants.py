@@ -17,7 +17,7 @@ class MerchantsController(BaseController):
     @aiohttp_apigami.response_schema(mr.schema(ErrorResponse), 401)
     @aiohttp_apigami.response_schema(mr.schema(ErrorResponse), 500)
     async def get(self) -> web.StreamResponse:
-        repository = self.get_merchants_repository()
-        merchants = await repository.get_merchants()
+        references = await self.get_reference_data()
+        merchants = list(references.merchants.values())
         merchant_models = merchants_to_merchant_models(merchants)
-        return web.json_response(mr.dump(GetMerchantsResponse(merchant_models)))
+        return self.json_response(GetMerchantsResponse(merchant_models))
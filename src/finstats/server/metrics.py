@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import logging
+import time
+
+import aiohttp_apigami
+from aiohttp import web
+from sqlalchemy.pool import QueuePool
+
+from finstats.metrics import Counter, Gauge, Metric, render_metrics
+from finstats.server.base import BaseController, get_container, get_http_metrics
+from finstats.store import ConnectionScope, TimestampRepository
+from finstats.syncer import SyncMetrics
+from finstats.zenmoney import ZenMoneyClient
+
+log = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsController(BaseController):
+    @aiohttp_apigami.docs(tags=["Health"], summary="Get server metrics in Prometheus text format", operationId="serviceMetrics")
+    async def get(self) -> web.Response:
+        container = get_container(self.request)
+        metrics = get_http_metrics(self.request).get_metrics()
+        if container.is_registered(ConnectionScope):
+            metrics.extend(_get_pool_metrics(container.resolve(ConnectionScope)))
+        if container.is_registered(ZenMoneyClient):
+            client_metrics = container.resolve(ZenMoneyClient).metrics
+            metrics.extend([client_metrics.request_seconds, client_metrics.errors_total])
+        if container.is_registered(SyncMetrics):
+            metrics.extend(_get_sync_metrics(container.resolve(SyncMetrics)))
+        if container.is_registered(TimestampRepository):
+            metrics.extend(await _get_sync_lag_metrics(container.resolve(TimestampRepository)))
+        return web.Response(body=render_metrics(metrics).encode("utf-8"), headers={"Content-Type": CONTENT_TYPE})
+
+
+def _get_pool_metrics(connection_scope: ConnectionScope) -> list[Metric]:
+    metrics: list[Metric] = [connection_scope.acquire_seconds]
+    pool = connection_scope.pool
+    if isinstance(pool, QueuePool):
+        size = Gauge("finstats_db_pool_size", "Configured size of the connection pool.")
+        size.set(pool.size())
+        checked_out = Gauge("finstats_db_pool_checked_out", "Connections currently checked out of the pool.")
+        checked_out.set(pool.checkedout())
+        overflow = Gauge("finstats_db_pool_overflow", "Connections opened over the pool size, negative while the pool is not full.")
+        overflow.set(pool.overflow())
+        metrics.extend([size, checked_out, overflow])
+    return metrics
+
+
+def _get_sync_metrics(sync_metrics: SyncMetrics) -> list[Metric]:
+    runs = Counter("finstats_sync_runs_total", "Sync runs finished by this process.")
+    runs.inc(sync_metrics.runs_total)
+    failures = Counter("finstats_sync_failures_total", "Sync runs failed in this process.")
+    failures.inc(sync_metrics.failures_total)
+    payload = Counter("finstats_sync_payload_bytes_total", "Bytes of ZenMoney diff responses received by sync runs.")
+    payload.inc(sync_metrics.payload_bytes_total)
+    phases = Counter("finstats_sync_phase_seconds_total", "Time spent by sync runs per phase.", ["phase"])
+    for phase, seconds in sync_metrics.phase_seconds_total.items():
+        phases.inc(seconds, phase=phase)
+    rows = Counter("finstats_sync_rows_total", "Rows written by sync runs per entity and outcome.", ["entity", "outcome"])
+    for entity, result in sync_metrics.rows_total.items():
+        rows.inc(result.inserted, entity=entity, outcome="inserted")
+        rows.inc(result.updated, entity=entity, outcome="updated")
+        rows.inc(result.skipped, entity=entity, outcome="skipped")
+    metrics: list[Metric] = [runs, failures, payload, phases, rows]
+
+    if sync_metrics.last_success_at is not None:
+        last_success = Gauge("finstats_sync_last_success_timestamp_seconds", "Unix time of the last successful sync run in this process.")
+        last_success.set(sync_metrics.last_success_at)
+        metrics.append(last_success)
+    return metrics
+
+
+async def _get_sync_lag_metrics(timestamp_repository: TimestampRepository) -> list[Metric]:
+    try:
+        timestamp = await timestamp_repository.get_last_timestamp()
+    except Exception:
+        log.exception("failed to get last synced timestamp")
+        return []
+
+    lag = Gauge("finstats_sync_lag_seconds", "Seconds since the ZenMoney server timestamp of the last saved sync.")
+    if timestamp > 0:
+        lag.set(max(time.time() - timestamp, 0.0))
+    return [lag]
@@ -6,19 +6,31 @@ import time as time_module
 import uuid
 from collections.abc import Awaitable, Callable
 
-import marshmallow_recipe as mr
 from aiohttp import web
 from aiohttp.web_request import Request
 
 from client import ErrorResponse
+from finstats.args import CliArgs
 from finstats.domain import ZenmoneyDiff
-from finstats.server.base import get_client, get_token
-from finstats.zenmoney import ZenMoneyClientAuthException
+from finstats.server.base import (
+    get_client,
+    get_container,
+    get_http_metrics,
+    get_token,
+    get_token_validation_cache,
+    get_token_validation_single_flight,
+    json_response,
+)
+from finstats.store import TimestampRepository
+from finstats.syncer import Syncer, is_empty_diff
+from finstats.zenmoney import ZenMoneyClientAuthException, ZenMoneyClientException
 
 Handler = Callable[[Request], Awaitable[web.StreamResponse]]
 
 log = logging.getLogger(__name__)
 
+_AUTH_TIMEOUT_SECONDS = 5
+
 
 def _get_request_id(request: Request) -> str:
     # если пришёл request-id от клиента/прокси — уважаем, иначе генерим
@@ -44,14 +56,82 @@ def _get_peer(request: Request) -> str:
 async def auth_mw(request: Request, handler: Handler) -> web.StreamResponse:
     token = get_token(request)
 
-    client = get_client(request)
+    is_valid = get_token_validation_cache(request).get(token)
+    if is_valid is None:
+        single_flight = get_token_validation_single_flight(request)
+        is_valid = await single_flight.do(token, lambda: _validate_token(request, token))
+
+    if not is_valid:
+        raise web.HTTPUnauthorized(reason="Invalid Authorization token")
+
+    return await handler(request)
+
+
+async def _validate_token(request: Request, token: str) -> bool:
+    # runs once per token for all concurrent requests, so the result is cached here, not by the waiters
+    is_valid = None
+    if get_container(request).resolve(CliArgs).is_auth_piggyback_sync():
+        is_valid = await _validate_token_with_sync(request, token)
+    if is_valid is None:
+        is_valid = await _check_token(request, token)
+    get_token_validation_cache(request).put(token, is_valid)
+    return is_valid
+
+
+async def _validate_token_with_sync(request: Request, token: str) -> bool | None:
+    # the check asks for changes since the last sync and saves them, bootstrap is left to the daemon;
+    # None when the token is not checked this way, e.g. the diff is too big to be fetched in the time of the check
+    container = get_container(request)
+    timestamp = await container.resolve(TimestampRepository).get_last_timestamp()
+    if not timestamp:
+        return None
+
     try:
-        await client.sync_diff(token, ZenmoneyDiff(server_timestamp=int(time_module.time())), 5)
+        diff = await get_client(request).sync_diff(token, ZenmoneyDiff(server_timestamp=timestamp), _AUTH_TIMEOUT_SECONDS)
     except ZenMoneyClientAuthException as e:
         log.info("ZenMoney auth failed: %r", e)
-        raise web.HTTPUnauthorized(reason="Invalid Authorization token") from None
+        return False
+    except ZenMoneyClientException, TimeoutError:
+        log.exception("Piggybacked sync failed, the token is checked without it")
+        return None
 
-    return await handler(request)
+    if not is_empty_diff(diff):
+        container.resolve(Syncer).save_diff_in_background(diff, expected_timestamp=timestamp)
+    return True
+
+
+async def _check_token(request: Request, token: str) -> bool:
+    try:
+        await get_client(request).sync_diff(token, ZenmoneyDiff(server_timestamp=int(time_module.time())), _AUTH_TIMEOUT_SECONDS)
+    except ZenMoneyClientAuthException as e:
+        log.info("ZenMoney auth failed: %r", e)
+        return False
+    return True
+
+
+def _get_route(request: Request) -> str:
+    # the canonical path keeps cardinality bounded, it has placeholders instead of path params and includes sub-app prefix
+    resource = request.match_info.route.resource
+    return resource.canonical if resource is not None else "unmatched"
+
+
+@web.middleware
+async def metrics_middleware(request: Request, handler: Handler) -> web.StreamResponse:
+    metrics = get_http_metrics(request)
+    route = _get_route(request)
+    status = 500
+    started = time_module.perf_counter()
+    metrics.requests_in_flight.inc(route=route)
+    try:
+        response = await handler(request)
+        status = response.status
+        return response
+    except web.HTTPException as e:
+        status = e.status
+        raise
+    finally:
+        metrics.requests_in_flight.dec(route=route)
+        metrics.request_seconds.observe(time_module.perf_counter() - started, method=request.method, route=route, status=str(status))
 
 
 @web.middleware
@@ -78,7 +158,7 @@ async def error_middleware(request: Request, handler: Handler) -> web.StreamResp
         if e.content_type == "application/json" and e.text:
             raise
 
-        resp = web.json_response(mr.dump(ErrorResponse(e.reason or e.__class__.__name__)), status=e.status)
+        resp = json_response(request, ErrorResponse(e.reason or e.__class__.__name__), status=e.status)
         resp.headers.update(e.headers)
         resp.headers["content-type"] = "application/json"
         resp.set_status(e.status, reason=e.reason)
@@ -89,4 +169,4 @@ async def error_middleware(request: Request, handler: Handler) -> web.StreamResp
 
     except Exception:
         log.exception("Unhandled error rid=%s path=%s", _get_request_id(request), request.path_qs)
-        return web.json_response(mr.dump(ErrorResponse("Internal Server Error")), status=500)
+        return json_response(request, ErrorResponse("Internal Server Error"), status=500)
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import aiohttp_apigami
+import marshmallow_recipe as mr
+from aiohttp import web
+
+from client import ErrorResponse
+from client.stats import (
+    CategoryStatsModel,
+    DailyStatsModel,
+    GetDailyStatsQueryData,
+    GetDailyStatsResponse,
+    GetStatsByTagQueryData,
+    GetStatsByTagResponse,
+    TagStatsModel,
+)
+from finstats.domain import InstrumentId, TagId
+from finstats.server.base import BaseController
+from finstats.store import ReferenceData, TagStats
+
+
+class StatsByTagController(BaseController):
+    @aiohttp_apigami.docs(security=[{"BearerAuth": []}])
+    @aiohttp_apigami.docs(tags=["Stats"], summary="Get income and outcome totals by tag", operationId="statsByTag")
+    @aiohttp_apigami.querystring_schema(mr.schema(GetStatsByTagQueryData))
+    @aiohttp_apigami.response_schema(mr.schema(GetStatsByTagResponse), 200)
+    @aiohttp_apigami.response_schema(mr.schema(ErrorResponse), 400)
+    @aiohttp_apigami.response_schema(mr.schema(ErrorResponse), 401)
+    @aiohttp_apigami.response_schema(mr.schema(ErrorResponse), 500)
+    async def get(self) -> web.StreamResponse:
+        query_data = self.parse_request_query(GetStatsByTagQueryData)
+        if query_data.from_date is not None and query_data.to_date is not None and query_data.from_date > query_data.to_date:
+            raise web.HTTPBadRequest(reason="from_date cannot be greater than to_date")
+
+        currency = (await self.get_users_repository().get_user()).currency if query_data.in_user_currency else None
+        report = await self.get_stats_repository().get_stats_by_tag(
+            from_date=query_data.from_date,
+            to_date=query_data.to_date,
+            account_id=query_data.account_id,
+            currency=currency,
+        )
+        references = await self.get_reference_data()
+
+        tags_by_category: dict[tuple[TagId | None, InstrumentId], list[TagStatsModel]] = {}
+        for stats in report.tags:
+            tags_by_category.setdefault((stats.category_id, stats.instrument), []).append(
+                TagStatsModel(
+                    tag_id=stats.tag_id,
+                    tag_title=_get_tag_title(references, stats.tag_id),
+                    instrument=stats.instrument,
+                    instrument_title=_get_instrument_title(references, stats.instrument),
+                    income=stats.income,
+                    outcome=stats.outcome,
+                    transactions_count=stats.transactions_count,
+                )
+            )
+
+        categories = [_to_category_stats_model(stats, references, tags_by_category) for stats in report.categories]
+        return self.json_response(GetStatsByTagResponse(categories))
+
+
+class DailyStatsController(BaseController):
+    @aiohttp_apigami.docs(security=[{"BearerAuth": []}])
+    @aiohttp_apigami.docs(tags=["Stats"], summary="Get income and outcome totals by day", operationId="dailyStats")
+    @aiohttp_apigami.querystring_schema(mr.schema(GetDailyStatsQueryData))
+    @aiohttp_apigami.response_schema(mr.schema(GetDailyStatsResponse), 200)
+    @aiohttp_apigami.response_schema(mr.schema(ErrorResponse), 400)
+    @aiohttp_apigami.response_schema(mr.schema(ErrorResponse), 401)
+    @aiohttp_apigami.response_schema(mr.schema(ErrorResponse), 500)
+    async def get(self) -> web.StreamResponse:
+        query_data = self.parse_request_query(GetDailyStatsQueryData)
+        if query_data.from_date is not None and query_data.to_date is not None and query_data.from_date > query_data.to_date:
+            raise web.HTTPBadRequest(reason="from_date cannot be greater than to_date")
+
+        days = await self.get_stats_repository().get_daily_stats(
+            from_date=query_data.from_date,
+            to_date=query_data.to_date,
+            account_id=query_data.account_id,
+        )
+        references = await self.get_reference_data()
+        return self.json_response(
+            GetDailyStatsResponse(
+                [
+                    DailyStatsModel(
+                        date=stats.date,
+                        instrument=stats.instrument,
+                        instrument_title=_get_instrument_title(references, stats.instrument),
+                        income=stats.income,
+                        outcome=stats.outcome,
+                        transactions_count=stats.transactions_count,
+                    )
+                    for stats in days
+                ]
+            )
+        )
+
+
+def _to_category_stats_model(
+    stats: TagStats,
+    references: ReferenceData,
+    tags_by_category: dict[tuple[TagId | None, InstrumentId], list[TagStatsModel]],
+) -> CategoryStatsModel:
+    return CategoryStatsModel(
+        tag_id=stats.category_id,
+        tag_title=_get_tag_title(references, stats.category_id),
+        instrument=stats.instrument,
+        instrument_title=_get_instrument_title(references, stats.instrument),
+        income=stats.income,
+        outcome=stats.outcome,
+        transactions_count=stats.transactions_count,
+        tags=tags_by_category.get((stats.category_id, stats.instrument), []),
+    )
+
+
+def _get_tag_title(references: ReferenceData, tag_id: TagId | None) -> str | None:
+    tag = None if tag_id is None else references.tags.get(tag_id)
+    return None if tag is None else tag.title
+
+
+def _get_instrument_title(references: ReferenceData, instrument_id: InstrumentId) -> str | None:
+    instrument = references.instruments.get(instrument_id)
+    return None if instrument is None else instrument.title
@@ -4,10 +4,10 @@ import aiohttp_apigami
 import marshmallow_recipe as mr
 from aiohttp import web
 
-from client import ErrorResponse, TagModel
+from client import ErrorResponse
 from client.tag import GetTagsResponse
 from finstats.server.base import BaseController
-from finstats.server.convert import tag_to_tag_model
+from finstats.server.convert import tags_to_tag_models
 
 
 class TagsController(BaseController):
@@ -17,13 +17,7 @@ class TagsController(BaseController):
     @aiohttp_apigami.response_schema(mr.schema(ErrorResponse), 401)
     @aiohttp_apigami.response_schema(mr.schema(ErrorResponse), 500)
     async def get(self) -> web.StreamResponse:
-        repository = self.get_tags_repository()
-        tag_models: list[TagModel] = []
-        tags = await repository.get_tags()
-        for tag in tags:
-            children = await repository.get_children_tags(parent_tag_id=tag.id)
-            tag_model = tag_to_tag_model(tag, children_ids=[child.id for child in children])
-            tag_models.append(tag_model)
-
+        references = await self.get_reference_data()
+        tag_models = tags_to_tag_models(list(references.tags.values()), children_ids_map=references.children_tags)
         response = GetTagsResponse(tag_models)
-        return web.json_response(mr.dump(response))
+        return self.json_response(response)
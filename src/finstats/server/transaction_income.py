@@ -35,17 +35,18 @@ class IncomeTransactionsController(BaseController):
             raise web.HTTPConflict(reason="Transaction with same id already exists")
 
         user = await self.get_users_repository().get_user()
-        account = await self.get_accounts_repository().get_account(request.account_id)
+        references = await self.get_reference_data()
+        account = references.accounts.get(request.account_id)
         if account is None:
             raise web.HTTPNotFound(reason="Account not found")
 
-        tag = await self.get_tags_repository().get_tag(request.tag_id)
+        tag = references.tags.get(request.tag_id)
         if tag is None:
             raise web.HTTPNotFound(reason="Tag not found")
         if not tag.show_income:
             raise web.HTTPBadRequest(reason="Tag cannot be income")
 
-        merchant = None if request.merchant_id is None else await self.get_merchants_repository().get_merchant_by_id(request.merchant_id)
+        merchant = None if request.merchant_id is None else references.merchants.get(request.merchant_id)
 
         request_transaction = _create_income_transaction(
             transaction_id=request.transaction_id,
@@ -68,15 +69,15 @@ class IncomeTransactionsController(BaseController):
                 status_code = 201
                 break
 
-        instruments = await self.get_instruments_repository().get_instruments_by_id([account.instrument])
-        if not instruments:
+        instrument = references.instruments.get(account.instrument)
+        if instrument is None:
             raise web.HTTPInternalServerError(reason="Instrument not found")
 
         model = transaction_to_transaction_model(
             transaction=zm_transaction,
             tags_titles=[tag.title],
-            income_instrument_title=instruments[0].title,
-            outcome_instrument_title=instruments[0].title,
+            income_instrument_title=instrument.title,
+            outcome_instrument_title=instrument.title,
             income_account_title=account.title,
             outcome_account_title=account.title,
             merchant_title=None if not merchant else merchant.title,
@@ -88,7 +89,7 @@ class IncomeTransactionsController(BaseController):
             ),
         )
 
-        return web.json_response(mr.dump(model), status=status_code)
+        return self.json_response(model, status=status_code)
 
     @staticmethod
     def validate_request_body(body: PostCreateIncomeRequestBody) -> None:
@@ -4,11 +4,13 @@ import aiohttp_apigami
 import marshmallow_recipe as mr
 from aiohttp import web
 
-from client import ErrorResponse, TransactionModel
+from client import ErrorResponse, TransactionModel, TransactionType
 from client.transaction import GetTransactionsQueryData, GetTransactionsResponse
-from finstats.domain import AccountId, InstrumentId, MerchantId, TagId, Transaction
+from finstats.domain import InstrumentId, Transaction
 from finstats.server.base import BaseController
 from finstats.server.convert import calculate_transaction_type, transaction_to_transaction_model
+from finstats.server.cursor import decode_transaction_cursor, encode_transaction_cursor
+from finstats.store import TotalCountMode, TransactionCursor, TransactionsPage, TransactionTypeFilter
 
 
 class TransactionsController(BaseController):
@@ -22,103 +24,98 @@ class TransactionsController(BaseController):
     async def get(self) -> web.StreamResponse:
         query_data = self.parse_request_query(GetTransactionsQueryData, {"tags"})
         self.validate_get_query_params(query_data)
+        cursor = self.parse_cursor(query_data.cursor)
         repository = self.get_transactions_repository()
-        transactions, total = await repository.find_transactions(
-            limit=query_data.limit,
+        currency = (await self.get_users_repository().get_user()).currency if query_data.in_user_currency else None
+        # one extra row tells whether there is a next page
+        page = await repository.find_transactions_page(
+            limit=query_data.limit + 1,
             offset=query_data.offset,
+            cursor=cursor,
+            total_count=TotalCountMode(query_data.total_count_mode.value),
             from_date=query_data.from_date,
             to_date=query_data.to_date,
             not_viewed=query_data.not_viewed,
             account_id=query_data.account_id,
             tags=query_data.tags,
-            transaction_type=None if query_data.transaction_type is mr.MISSING else query_data.transaction_type.value,
+            transaction_type=None if query_data.transaction_type is mr.MISSING else TransactionTypeFilter(query_data.transaction_type.value),
+            with_references=True,
+            currency=currency,
         )
-        enriched = await self.enrich_transactions(transactions)
+        has_next_page = len(page.transactions) > query_data.limit
+        transactions = page.transactions[: query_data.limit]
+        enriched = self.enrich_transactions(page, transactions, currency)
 
         response = GetTransactionsResponse(
             transactions=enriched,
             limit=query_data.limit,
             offset=query_data.offset,
-            total_count=total,
+            total_count=page.total_count,
+            next_cursor=encode_transaction_cursor(TransactionCursor.after(transactions[-1])) if has_next_page else None,
         )
 
-        dump = mr.dump(response)
-        return web.json_response(dump)
-
-    async def enrich_transactions(self, transactions: list[Transaction]) -> list[TransactionModel]:
-        tags_set: set[TagId] = set()
-        instrument_set: set[InstrumentId] = set()
-        account_set: set[AccountId] = set()
-        merchants_set: set[MerchantId] = set()
-        for transaction in transactions:
-            for tag in transaction.tags:
-                tags_set.add(tag)
-
-            instrument_set.add(transaction.income_instrument)
-            instrument_set.add(transaction.outcome_instrument)
-            account_set.add(transaction.income_account)
-            account_set.add(transaction.outcome_account)
-            if transaction.merchant:
-                merchants_set.add(transaction.merchant)
-
-        tags = await self.get_tags_repository().get_tags_by_id(tag_ids=list(tags_set))
-        accounts = await self.get_accounts_repository().get_accounts_by_id(account_ids=list(account_set))
-        instruments = await self.get_instruments_repository().get_instruments_by_id(instrument_ids=list(instrument_set))
-        merchants = await self.get_merchants_repository().get_merchants_by_id(merchant_ids=list(merchants_set))
-
-        tags_dict = {obj.id: obj for obj in tags}
-        accounts_dict = {obj.id: obj for obj in accounts}
-        instrument_dict = {obj.id: obj for obj in instruments}
-        merchants_dict = {obj.id: obj for obj in merchants}
+        return self.json_response(response)
 
+    @staticmethod
+    def enrich_transactions(
+        page: TransactionsPage,
+        transactions: list[Transaction],
+        currency: InstrumentId | None = None,
+    ) -> list[TransactionModel]:
         transaction_models: list[TransactionModel] = []
         for transaction in transactions:
-            tag_list: list[str] = []
-            first_tag = tags_dict.get(transaction.tags[0]) if transaction.tags else None
-            for tag in transaction.tags:
-                tag_list.append("NO TAG TITLE" if tags_dict.get(tag) is None else tags_dict[tag].title)
-
-            income_instrument_title = (
-                "NO INSTRUMENT TITLE"
-                if instrument_dict.get(transaction.income_instrument) is None
-                else instrument_dict[transaction.income_instrument].title
-            )
-            outcome_instrument_title = (
-                "NO INSTRUMENT TITLE"
-                if instrument_dict.get(transaction.outcome_instrument) is None
-                else instrument_dict[transaction.outcome_instrument].title
-            )
-            income_account = accounts_dict.get(transaction.income_account)
-            outcome_account = accounts_dict.get(transaction.outcome_account)
-            income_account_title = "NO ACCOUNT TITLE" if income_account is None else income_account.title
-            outcome_account_title = "NO ACCOUNT TITLE" if outcome_account is None else outcome_account.title
-
-            transaction_type = calculate_transaction_type(
-                transaction,
-                income_account_type=income_account.type if income_account else None,
-                outcome_account_type=outcome_account.type if outcome_account else None,
-                tag=first_tag,
+            references = page.references[transaction.id]
+            converted = page.converted.get(transaction.id)
+            stored_type = page.transaction_types.get(transaction.id)
+            transaction_type = (
+                TransactionType(stored_type.value)
+                if stored_type is not None
+                else calculate_transaction_type(
+                    transaction,
+                    income_account_type=references.income_account_type,
+                    outcome_account_type=references.outcome_account_type,
+                    # every save stores the type, so the tag is only missing for rows never derived yet
+                    tag=None,
+                )
             )
 
             transaction_models.append(
                 transaction_to_transaction_model(
                     transaction=transaction,
-                    tags_titles=tag_list,
-                    income_instrument_title=income_instrument_title,
-                    outcome_instrument_title=outcome_instrument_title,
-                    income_account_title=income_account_title,
-                    outcome_account_title=outcome_account_title,
-                    merchant_title=None if merchants_dict.get(transaction.merchant) is None else merchants_dict[transaction.merchant].title,
+                    tags_titles=[_title_or_default(title, "NO TAG TITLE") for title in references.tags_titles],
+                    income_instrument_title=_title_or_default(references.income_instrument_title, "NO INSTRUMENT TITLE"),
+                    outcome_instrument_title=_title_or_default(references.outcome_instrument_title, "NO INSTRUMENT TITLE"),
+                    income_account_title=_title_or_default(references.income_account_title, "NO ACCOUNT TITLE"),
+                    outcome_account_title=_title_or_default(references.outcome_account_title, "NO ACCOUNT TITLE"),
+                    merchant_title=references.merchant_title,
                     transaction_type=transaction_type,
+                    user_currency=currency,
+                    income_in_user_currency=None if converted is None else converted.income,
+                    outcome_in_user_currency=None if converted is None else converted.outcome,
                 )
             )
         return transaction_models
 
+    @staticmethod
+    def parse_cursor(value: str | None) -> TransactionCursor | None:
+        if value is None:
+            return None
+        try:
+            return decode_transaction_cursor(value)
+        except ValueError as e:
+            raise web.HTTPBadRequest(reason="cursor is invalid, pass next_cursor of the previous page") from e
+
     @staticmethod
     def validate_get_query_params(query_data: GetTransactionsQueryData) -> None:
         if query_data.limit <= 0 or query_data.limit > 100:
             raise web.HTTPBadRequest(reason="limit cannot be negative or bigger than 100")
         if query_data.offset < 0:
             raise web.HTTPBadRequest(reason="offset cannot be negative")
+        if query_data.cursor is not None and query_data.offset != 0:
+            raise web.HTTPBadRequest(reason="offset cannot be combined with cursor")
         if query_data.from_date is not None and query_data.to_date is not None and query_data.from_date > query_data.to_date:
             raise web.HTTPBadRequest(reason="from_date cannot be greater than to_date")
+
+
+def _title_or_default(title: str | None, default: str) -> str:
+    return default if title is None else title
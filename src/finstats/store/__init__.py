@@ -1,26 +1,58 @@
 from finstats.store.accounts import AccountsRepository
+from finstats.store.bootstrap import BootstrapLoader
+from finstats.store.cache import VersionedCache
 from finstats.store.companies import CompaniesRepository
 from finstats.store.config import configure_container, get_pg_url_from_env, run_migrations
 from finstats.store.connection import ConnectionScope
 from finstats.store.countries import CountriesRepository
 from finstats.store.instruments import InstrumentsRepository
 from finstats.store.merchants import MerchantsRepository
+from finstats.store.misc import UpsertResult
+from finstats.store.reference import ReferenceData, ReferenceDataCache
+from finstats.store.rollup import DailyRollup
+from finstats.store.stats import DailyStats, StatsRepository, TagStats, TagStatsReport
 from finstats.store.tags import TagsRepository
 from finstats.store.timestamp import TimestampRepository
-from finstats.store.transactions import TransactionsRepository
+from finstats.store.transactions import (
+    ConvertedAmounts,
+    TotalCountMode,
+    TransactionCountCache,
+    TransactionCursor,
+    TransactionReferences,
+    TransactionsPage,
+    TransactionsRepository,
+    TransactionTypeFilter,
+)
 from finstats.store.users import UsersRepository
 
 __all__ = [
     "ConnectionScope",
+    "ConvertedAmounts",
     "AccountsRepository",
+    "BootstrapLoader",
     "CompaniesRepository",
     "CountriesRepository",
+    "DailyRollup",
+    "DailyStats",
     "InstrumentsRepository",
     "MerchantsRepository",
+    "ReferenceData",
+    "ReferenceDataCache",
+    "StatsRepository",
+    "TagStats",
+    "TagStatsReport",
     "TagsRepository",
     "TimestampRepository",
+    "TotalCountMode",
+    "TransactionCountCache",
+    "TransactionCursor",
+    "TransactionReferences",
+    "TransactionsPage",
     "TransactionsRepository",
+    "TransactionTypeFilter",
     "UsersRepository",
+    "UpsertResult",
+    "VersionedCache",
     "run_migrations",
     "get_pg_url_from_env",
     "configure_container",
@@ -1,10 +1,10 @@
 import sqlalchemy as sa
-from sqlalchemy.dialects import postgresql as sa_postgresql
 
 from finstats.domain import Account, AccountId
-from finstats.store.base import AccountTable
+from finstats.store.base import AccountTable, TransactionsTable
 from finstats.store.connection import ConnectionScope
-from finstats.store.misc import from_dataclasses, to_dataclass, to_dataclasses
+from finstats.store.misc import DEFAULT_CHUNK_SIZE, UpsertResult, to_dataclass, to_dataclasses, upsert_dataclasses
+from finstats.store.transactions import refresh_transaction_types, uuid_array
 
 
 class AccountsRepository:
@@ -19,6 +19,12 @@ class AccountsRepository:
             result = await connection.execute(stmt)
             return to_dataclass(Account, result.one_or_none())
 
+    async def get_accounts(self) -> list[Account]:
+        stmt = sa.select(AccountTable)
+        async with self.__connection_scope.acquire() as connection:
+            result = await connection.execute(stmt)
+            return to_dataclasses(Account, result.all())
+
     async def find_accounts(self, show_archive: bool = False, show_debts: bool = False) -> list[Account]:
         stmt = sa.select(AccountTable).where(AccountTable.archive.is_(show_archive))
         if not show_debts:
@@ -35,17 +41,18 @@ class AccountsRepository:
             result = await connection.execute(stmt)
             return to_dataclasses(Account, result.all())
 
-    async def save_accounts(self, accounts: list[Account]) -> None:
+    async def save_accounts(self, accounts: list[Account], chunk_size: int = DEFAULT_CHUNK_SIZE) -> UpsertResult:
         if not accounts:
-            return
-
-        stmt = sa_postgresql.insert(AccountTable).values(from_dataclasses(accounts))
-        excluded = stmt.excluded
-        set_cols = {c.name: getattr(excluded, c.name) for c in AccountTable.__table__.columns if c.name != "id"}
+            return UpsertResult()
 
         async with self.__connection_scope.acquire() as connection:
-            stmt = stmt.on_conflict_do_update(
-                index_elements=[AccountTable.id],
-                set_=set_cols,
-            )
-            await connection.execute(stmt)
+            result = await upsert_dataclasses(connection, AccountTable, accounts, chunk_size)
+            if result.inserted or result.updated:
+                # the type of a transfer depends on types of its accounts
+                account_ids = uuid_array([a.id for a in accounts])
+                t = TransactionsTable
+                await refresh_transaction_types(
+                    connection,
+                    (t.income > 0) & (t.outcome > 0) & ((t.income_account == sa.any_(account_ids)) | (t.outcome_account == sa.any_(account_ids))),
+                )
+            return result
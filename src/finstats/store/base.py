@@ -168,5 +168,48 @@ class TransactionsTable(Base):
     tags: orm.Mapped[list[uuid.UUID]] = orm.mapped_column(sa.ARRAY(sa.Uuid))
     date: orm.Mapped[datetime.date] = orm.mapped_column(sa.Date)
 
+    # not a part of the domain model, derived at write time from the row, its first tag and accounts
+    transaction_type: orm.Mapped[str | None] = orm.mapped_column(sa.Text, nullable=True)
+    first_tag: orm.Mapped[uuid.UUID | None] = orm.mapped_column(sa.Uuid, nullable=True)
+
     __tablename__ = "transactions"
-    __table_args__ = (sa.Index("idx_transactions_exist_by_date_and_created", "date", "created", postgresql_where=sa.text("deleted = false")),)
+    __table_args__ = (
+        sa.Index("idx_transactions_exist_by_sort_key", "date", "created", "id", postgresql_where=sa.text("deleted = false")),
+        sa.Index("idx_transactions_not_viewed_by_sort_key", "date", "created", "id", postgresql_where=sa.text("deleted = false AND viewed = false")),
+        sa.Index("idx_transactions_income_account", "income_account"),
+        sa.Index("idx_transactions_outcome_account", "outcome_account"),
+        sa.Index("idx_transactions_tags", "tags", postgresql_using="gin"),
+        sa.Index("idx_transactions_exist_by_type_and_date", "transaction_type", "date", postgresql_where=sa.text("deleted = false")),
+        sa.Index("idx_transactions_first_tag", "first_tag"),
+    )
+
+
+class TransactionsDailyTable(Base):
+    """Sums of transactions by day, maintained by the store from the `transactions` table.
+
+    A transaction contributes its income to the row of its income account and its outcome to the row of its outcome account.
+    """
+
+    id: orm.Mapped[int] = orm.mapped_column(sa.BigInteger, sa.Identity(), primary_key=True)
+    date: orm.Mapped[datetime.date] = orm.mapped_column(sa.Date)
+    account: orm.Mapped[uuid.UUID] = orm.mapped_column(sa.Uuid)
+    first_tag: orm.Mapped[uuid.UUID | None] = orm.mapped_column(sa.Uuid, nullable=True)
+    instrument: orm.Mapped[int] = orm.mapped_column(sa.Integer)
+    transaction_type: orm.Mapped[str | None] = orm.mapped_column(sa.Text, nullable=True)
+    income: orm.Mapped[decimal.Decimal] = orm.mapped_column(sa.DECIMAL)
+    outcome: orm.Mapped[decimal.Decimal] = orm.mapped_column(sa.DECIMAL)
+    transactions_count: orm.Mapped[int] = orm.mapped_column(sa.Integer)
+
+    __tablename__ = "transactions_daily"
+    __table_args__ = (
+        sa.Index(
+            "idx_transactions_daily_key",
+            "date",
+            "account",
+            "first_tag",
+            "instrument",
+            "transaction_type",
+            unique=True,
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
@@ -0,0 +1,49 @@
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql as sa_postgresql
+
+from finstats.store.base import Base
+from finstats.store.connection import ConnectionScope
+from finstats.store.misc import UpsertResult, execute_upsert, get_row_extractor, on_conflict_update_changed, unique_by_id
+
+
+class BootstrapLoader:
+    """Loads a full diff with COPY into a temporary staging table and merges it with one statement per table.
+
+    Meant for the initial sync, where ORM upserts of the whole history are too slow.
+    """
+
+    __connection_scope: ConnectionScope
+
+    def __init__(self, connection: ConnectionScope) -> None:
+        self.__connection_scope = connection
+
+    async def load[T](self, table: type[Base], cls: type[T], items: Sequence[T]) -> UpsertResult:
+        if not items:
+            return UpsertResult()
+
+        unique_items = unique_by_id(items)
+
+        table_name = table.__tablename__
+        staging_name = f"staging_{table_name}"
+        fields, values = get_row_extractor(cls)
+        columns = list(fields)
+
+        staging = sa.table(staging_name, *(sa.column(c) for c in columns))
+        stmt = on_conflict_update_changed(sa_postgresql.insert(table).from_select(columns, sa.select(*staging.columns)), table, columns)
+
+        async with self.__connection_scope.acquire() as connection:
+            await connection.execute(sa.text(f'CREATE TEMP TABLE "{staging_name}" (LIKE "{table_name}" INCLUDING DEFAULTS) ON COMMIT DROP'))
+            raw_connection = await connection.get_raw_connection()
+            driver_connection = raw_connection.driver_connection
+            if driver_connection is None:
+                raise RuntimeError("Connection is already closed")
+            await driver_connection.copy_records_to_table(
+                staging_name,
+                records=map(values, unique_items),
+                columns=columns,
+            )
+            result = await execute_upsert(connection, stmt, len(unique_items))
+            await connection.execute(sa.text(f'DROP TABLE "{staging_name}"'))
+            return result
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import collections
+from collections.abc import Hashable
+
+
+class VersionedCache[K: Hashable, V]:
+    """Bounded LRU cache whose entries are valid only for the version they were computed at.
+
+    The version is meant to be the last synced timestamp, so entries go stale exactly when a sync saves new data.
+    """
+
+    __slots__ = ("__entries", "__hits", "__max_size", "__misses")
+
+    def __init__(self, max_size: int = 256) -> None:
+        if max_size < 0:
+            raise ValueError(f"max_size cannot be negative, got {max_size}")
+        self.__max_size = max_size
+        self.__entries: collections.OrderedDict[K, tuple[int, V]] = collections.OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+
+    @property
+    def hits(self) -> int:
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        return self.__misses
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def get(self, key: K, version: int) -> V | None:
+        entry = self.__entries.get(key)
+        if entry is None or entry[0] != version:
+            self.__misses += 1
+            return None
+
+        self.__entries.move_to_end(key)
+        self.__hits += 1
+        return entry[1]
+
+    def put(self, key: K, version: int, value: V) -> None:
+        if self.__max_size == 0:
+            return
+
+        self.__entries[key] = (version, value)
+        self.__entries.move_to_end(key)
+        while len(self.__entries) > self.__max_size:
+            self.__entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self.__entries.clear()
@@ -1,10 +1,9 @@
 import sqlalchemy as sa
-from sqlalchemy.dialects import postgresql as sa_postgresql
 
 from finstats.domain import Company, CompanyId
 from finstats.store.base import CompanyTable
 from finstats.store.connection import ConnectionScope
-from finstats.store.misc import from_dataclasses, to_dataclasses
+from finstats.store.misc import DEFAULT_CHUNK_SIZE, UpsertResult, to_dataclasses, upsert_dataclasses
 
 
 class CompaniesRepository:
@@ -13,20 +12,12 @@ class CompaniesRepository:
     def __init__(self, connection: ConnectionScope) -> None:
         self.__connection_scope = connection
 
-    async def save_companies(self, companies: list[Company]) -> None:
+    async def save_companies(self, companies: list[Company], chunk_size: int = DEFAULT_CHUNK_SIZE) -> UpsertResult:
         if not companies:
-            return
-
-        stmt = sa_postgresql.insert(CompanyTable).values(from_dataclasses(companies))
-        excluded = stmt.excluded
-        set_cols = {c.name: getattr(excluded, c.name) for c in CompanyTable.__table__.columns if c.name != "id"}
+            return UpsertResult()
 
         async with self.__connection_scope.acquire() as connection:
-            stmt = stmt.on_conflict_do_update(
-                index_elements=[CompanyTable.id],
-                set_=set_cols,
-            )
-            await connection.execute(stmt)
+            return await upsert_dataclasses(connection, CompanyTable, companies, chunk_size)
 
     async def get_company(self, company_id: CompanyId) -> Company | None:
         companies = await self.get_companies_by_id([company_id])
@@ -6,14 +6,17 @@ from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from alembic import command
 from finstats.container import Container
 from finstats.store.accounts import AccountsRepository
+from finstats.store.bootstrap import BootstrapLoader
 from finstats.store.companies import CompaniesRepository
 from finstats.store.connection import ConnectionScope
 from finstats.store.countries import CountriesRepository
 from finstats.store.instruments import InstrumentsRepository
 from finstats.store.merchants import MerchantsRepository
+from finstats.store.reference import ReferenceDataCache
+from finstats.store.stats import StatsRepository
 from finstats.store.tags import TagsRepository
 from finstats.store.timestamp import TimestampRepository
-from finstats.store.transactions import TransactionsRepository
+from finstats.store.transactions import TransactionCountCache, TransactionsRepository
 from finstats.store.users import UsersRepository
 
 
@@ -38,12 +41,16 @@ def configure_container(container: Container, pg_url: str) -> AsyncEngine:
     engine = create_async_engine(pg_url, pool_pre_ping=True)
     container.register(ConnectionScope, instance=ConnectionScope(engine))
     container.register(AccountsRepository)
+    container.register(BootstrapLoader)
     container.register(CompaniesRepository)
     container.register(CountriesRepository)
     container.register(InstrumentsRepository)
     container.register(MerchantsRepository)
+    container.register(ReferenceDataCache)
+    container.register(StatsRepository)
     container.register(TagsRepository)
     container.register(TimestampRepository)
+    container.register(TransactionCountCache)
     container.register(TransactionsRepository)
     container.register(UsersRepository)
     return engine
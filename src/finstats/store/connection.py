@@ -2,12 +2,16 @@ import asyncio
 import contextlib
 import contextvars
 import sys
+import time
 import uuid
 from collections.abc import AsyncIterator, Iterator
 from contextlib import AbstractAsyncContextManager
 from types import TracebackType
 
 import sqlalchemy.ext.asyncio as sa_async
+from sqlalchemy.pool import Pool
+
+from finstats.metrics import Histogram
 
 connection_var = contextvars.ContextVar[sa_async.AsyncConnection | None](str(uuid.uuid4()), default=None)
 
@@ -37,10 +41,22 @@ class ShieldedConnectionContext(AbstractAsyncContextManager[sa_async.AsyncConnec
 
 
 class ConnectionScope:
-    __slots__ = ("__engine",)
+    __slots__ = ("__acquire_seconds", "__engine")
 
     def __init__(self, engine: sa_async.AsyncEngine) -> None:
         self.__engine = engine
+        self.__acquire_seconds = Histogram(
+            "finstats_db_pool_acquire_seconds",
+            "Time spent waiting for a pooled connection and its transaction to start.",
+        )
+
+    @property
+    def pool(self) -> Pool:
+        return self.__engine.pool
+
+    @property
+    def acquire_seconds(self) -> Histogram:
+        return self.__acquire_seconds
 
     @contextlib.asynccontextmanager
     async def acquire(self) -> AsyncIterator[sa_async.AsyncConnection]:
@@ -48,7 +64,9 @@ class ConnectionScope:
         if context_connection is not None:
             yield context_connection
         else:
+            started = time.perf_counter()
             async with self._acquire_connection_with_transaction(self.__engine) as connection:
+                self.__acquire_seconds.observe(time.perf_counter() - started)
                 with self.__set_context_connection(connection):
                     yield connection
 
@@ -1,10 +1,9 @@
 import sqlalchemy as sa
-from sqlalchemy.dialects import postgresql as sa_postgresql
 
 from finstats.domain import Country, CountryId
 from finstats.store.base import CountryTable
 from finstats.store.connection import ConnectionScope
-from finstats.store.misc import from_dataclasses, to_dataclasses
+from finstats.store.misc import DEFAULT_CHUNK_SIZE, UpsertResult, to_dataclasses, upsert_dataclasses
 
 
 class CountriesRepository:
@@ -13,20 +12,12 @@ class CountriesRepository:
     def __init__(self, connection: ConnectionScope) -> None:
         self.__connection_scope = connection
 
-    async def save_countries(self, countries: list[Country]) -> None:
+    async def save_countries(self, countries: list[Country], chunk_size: int = DEFAULT_CHUNK_SIZE) -> UpsertResult:
         if not countries:
-            return
-
-        stmt = sa_postgresql.insert(CountryTable).values(from_dataclasses(countries))
-        excluded = stmt.excluded
-        set_cols = {c.name: getattr(excluded, c.name) for c in CountryTable.__table__.columns if c.name != "id"}
+            return UpsertResult()
 
         async with self.__connection_scope.acquire() as connection:
-            stmt = stmt.on_conflict_do_update(
-                index_elements=[CountryTable.id],
-                set_=set_cols,
-            )
-            await connection.execute(stmt)
+            return await upsert_dataclasses(connection, CountryTable, countries, chunk_size)
 
     async def get_country(self, country_id: CountryId) -> Country | None:
         countries = await self.get_countries_by_id([country_id])
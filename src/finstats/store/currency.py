@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import decimal
+
+import sqlalchemy as sa
+from sqlalchemy import orm
+
+from finstats.domain import InstrumentId
+from finstats.store.base import InstrumentTable
+
+# amounts of the service have kopecks precision, converted ones are rounded to it
+CONVERTED_SCALE = 2
+
+
+def conversion_rate(
+    instrument: sa.ColumnElement[int],
+    rate: sa.ColumnExpressionArgument[decimal.Decimal],
+    currency: InstrumentId,
+) -> sa.ColumnElement[decimal.Decimal]:
+    """Factor converting amounts of `instrument` having `rate` to `currency`, NULL when a rate is unknown or zero.
+
+    Rates of instruments are prices of a unit in the same base currency, so the factor is their ratio.
+    The rate of `currency` is a subquery not correlated with rows, so it is evaluated once per statement.
+    """
+    target = orm.aliased(InstrumentTable, name="target_instrument")
+    target_rate = sa.select(target.rate).where(target.id == currency).scalar_subquery()
+    return sa.case(
+        (instrument == currency, sa.literal(1, sa.DECIMAL)),
+        else_=sa.func.nullif(rate, 0) / sa.func.nullif(target_rate, 0),
+    )
+
+
+def convert_amount(
+    amount: sa.ColumnElement[decimal.Decimal],
+    instrument: sa.ColumnElement[int],
+    rate: sa.ColumnExpressionArgument[decimal.Decimal],
+    currency: InstrumentId,
+) -> sa.ColumnElement[decimal.Decimal]:
+    return sa.func.round(amount * conversion_rate(instrument, rate, currency), CONVERTED_SCALE)
@@ -1,10 +1,9 @@
 import sqlalchemy as sa
-from sqlalchemy.dialects import postgresql as sa_postgresql
 
 from finstats.domain import Instrument, InstrumentId
 from finstats.store.base import InstrumentTable
 from finstats.store.connection import ConnectionScope
-from finstats.store.misc import from_dataclasses, to_dataclasses
+from finstats.store.misc import DEFAULT_CHUNK_SIZE, UpsertResult, to_dataclasses, upsert_dataclasses
 
 
 class InstrumentsRepository:
@@ -27,17 +26,9 @@ class InstrumentsRepository:
             result = await connection.execute(stmt)
             return to_dataclasses(Instrument, result.all())
 
-    async def save_instruments(self, instruments: list[Instrument]) -> None:
+    async def save_instruments(self, instruments: list[Instrument], chunk_size: int = DEFAULT_CHUNK_SIZE) -> UpsertResult:
         if not instruments:
-            return
-
-        stmt = sa_postgresql.insert(InstrumentTable).values(from_dataclasses(instruments))
-        excluded = stmt.excluded
-        set_cols = {c.name: getattr(excluded, c.name) for c in InstrumentTable.__table__.columns if c.name != "id"}
+            return UpsertResult()
 
         async with self.__connection_scope.acquire() as connection:
-            stmt = stmt.on_conflict_do_update(
-                index_elements=[InstrumentTable.id],
-                set_=set_cols,
-            )
-            await connection.execute(stmt)
+            return await upsert_dataclasses(connection, InstrumentTable, instruments, chunk_size)
@@ -1,10 +1,9 @@
 import sqlalchemy as sa
-from sqlalchemy.dialects import postgresql as sa_postgresql
 
 from finstats.domain import Merchant, MerchantId
 from finstats.store.base import MerchantTable
 from finstats.store.connection import ConnectionScope
-from finstats.store.misc import from_dataclasses, to_dataclasses
+from finstats.store.misc import DEFAULT_CHUNK_SIZE, UpsertResult, to_dataclasses, upsert_dataclasses
 
 
 class MerchantsRepository:
@@ -33,17 +32,9 @@ class MerchantsRepository:
             result = await connection.execute(stmt)
             return to_dataclasses(Merchant, result.all())
 
-    async def save_merchants(self, merchants: list[Merchant]) -> None:
+    async def save_merchants(self, merchants: list[Merchant], chunk_size: int = DEFAULT_CHUNK_SIZE) -> UpsertResult:
         if not merchants:
-            return
-
-        stmt = sa_postgresql.insert(MerchantTable).values(from_dataclasses(merchants))
-        excluded = stmt.excluded
-        set_cols = {c.name: getattr(excluded, c.name) for c in MerchantTable.__table__.columns if c.name != "id"}
+            return UpsertResult()
 
         async with self.__connection_scope.acquire() as connection:
-            stmt = stmt.on_conflict_do_update(
-                index_elements=[MerchantTable.id],
-                set_=set_cols,
-            )
-            await connection.execute(stmt)
+            return await upsert_dataclasses(connection, MerchantTable, merchants, chunk_size)
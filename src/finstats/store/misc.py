@@ -1,21 +1,69 @@
+from __future__ import annotations
+
 import dataclasses
-from collections.abc import Sequence
+import operator
+import types
+from collections.abc import Callable, Iterator, Sequence
 from typing import Any, get_origin, overload
 
 import sqlalchemy as sa
+import sqlalchemy.ext.asyncio as sa_async
+from sqlalchemy.dialects import postgresql as sa_postgresql
+from sqlalchemy.sql.dml import ReturningInsert
+
+from finstats.store.base import Base
+
+# postgres protocol limits a single statement to 32767 bind parameters
+MAX_BIND_PARAMETERS = 32767
+DEFAULT_CHUNK_SIZE = 1000
+
+__row_extractors: dict[type, tuple[tuple[str, ...], Callable[[Any], tuple[Any, ...]]]] = {}
+__row_mappers: dict[tuple[type, tuple[str, ...]], Callable[[sa.Row], Any]] = {}
+
 
-__field_names: dict[type, tuple[str, ...]] = {}
+@dataclasses.dataclass(frozen=True, slots=True)
+class UpsertResult:
+    inserted: int = 0
+    updated: int = 0
+    skipped: int = 0
 
+    def __add__(self, other: UpsertResult) -> UpsertResult:
+        return UpsertResult(
+            inserted=self.inserted + other.inserted,
+            updated=self.updated + other.updated,
+            skipped=self.skipped + other.skipped,
+        )
 
-def from_dataclass[T](cls: T) -> dict[str, Any]:
-    if not dataclasses.is_dataclass(cls) or isinstance(cls, type):
-        raise TypeError("content must be a dataclass instance")
 
-    return dataclasses.asdict(cls)
+def from_dataclass[T](obj: T) -> dict[str, Any]:
+    columns, values = get_row_extractor(type(obj))
+    return dict(zip(columns, values(obj), strict=True))
 
 
-def from_dataclasses[T](cls: Sequence[T]) -> Sequence[dict[str, Any]]:
-    return [from_dataclass(c) for c in cls]
+def from_dataclasses[T](items: Sequence[T]) -> list[dict[str, Any]]:
+    if not items:
+        return []
+
+    columns, values = get_row_extractor(type(items[0]))
+    return [dict(zip(columns, values(item), strict=True)) for item in items]
+
+
+def get_row_extractor[T](cls: type[T]) -> tuple[tuple[str, ...], Callable[[T], tuple[Any, ...]]]:
+    """Returns names of fields of the dataclass `cls` and a function returning their values as a tuple in the same order.
+
+    Values are not copied, unlike with `dataclasses.asdict`, lists of frozen entities are copied into bind parameters anyway.
+    """
+    extractor = __row_extractors.get(cls)
+    if extractor is None:
+        if not dataclasses.is_dataclass(cls):
+            raise TypeError(f"{cls.__name__} is not a dataclass")
+        columns = tuple(field.name for field in dataclasses.fields(cls))
+        getter = operator.attrgetter(*columns)
+        # attrgetter of a single attribute returns its value, not a tuple
+        values = getter if len(columns) > 1 else lambda obj: (getter(obj),)
+        extractor = (columns, values)
+        __row_extractors[cls] = extractor
+    return extractor
 
 
 @overload
@@ -30,14 +78,123 @@ def to_dataclass[T](cls: type[T], row: sa.Row | None) -> T | None:
     if row is None:
         return None
 
-    field_names = __field_names.get(cls)
-    if not field_names:
-        effective_cls = get_origin(cls) or cls
-        field_names = tuple(field.name for field in dataclasses.fields(effective_cls))
-        __field_names[cls] = field_names
-
-    return cls(**{field_name: getattr(row, field_name) for field_name in field_names})
+    return get_row_mapper(cls, row._fields)(row)
 
 
 def to_dataclasses[T](cls: type[T], rows: Sequence[sa.Row]) -> list[T]:
-    return [to_dataclass(cls, row) for row in rows]
+    if not rows:
+        return []
+
+    # rows of one result share columns, so one mapper fits them all
+    return list(map(get_row_mapper(cls, rows[0]._fields), rows))
+
+
+def get_row_mapper[T](cls: type[T], columns: tuple[str, ...]) -> Callable[[sa.Row], T]:
+    """Returns a function building `cls` from rows with `columns`, generated once per class and columns.
+
+    Fields are read by their position in the row. Slotted dataclasses without `__post_init__` are built
+    by setting slots directly, which skips `__init__` and the frozen `__setattr__` guard.
+    """
+    key = (cls, columns)
+    mapper = __row_mappers.get(key)
+    if mapper is None:
+        mapper = _compile_row_mapper(cls, columns)
+        __row_mappers[key] = mapper
+    return mapper
+
+
+def _compile_row_mapper[T](cls: type[T], columns: tuple[str, ...]) -> Callable[[sa.Row], T]:
+    effective_cls: Any = get_origin(cls) or cls
+    fields = dataclasses.fields(effective_cls)
+    positions: dict[str, int] = {}
+    for position, column in enumerate(columns):
+        # the first column wins, like for attribute access of a row
+        positions.setdefault(column, position)
+    missing = [field.name for field in fields if field.name not in positions]
+    if missing:
+        raise AttributeError(f"Rows have no columns {missing} of {effective_cls.__name__}")
+
+    namespace: dict[str, Any] = {"cls": cls, "new": object.__new__, "effective_cls": effective_cls}
+    if _can_set_slots(effective_cls, fields):
+        lines = ["    obj = new(effective_cls)"]
+        for i, field in enumerate(fields):
+            namespace[f"set_{i}"] = getattr(effective_cls, field.name).__set__
+            lines.append(f"    set_{i}(obj, row[{positions[field.name]}])")
+        lines.append("    return obj")
+    else:
+        arguments = ", ".join(f"{field.name}=row[{positions[field.name]}]" for field in fields)
+        lines = [f"    return cls({arguments})"]
+
+    source = "def map_row(row):\n" + "\n".join(lines) + "\n"
+    exec(compile(source, f"<row mapper of {effective_cls.__qualname__}>", "exec"), namespace)
+    return namespace["map_row"]
+
+
+def _can_set_slots(cls: type, fields: tuple[dataclasses.Field, ...]) -> bool:
+    # fields with init=False and __post_init__ need __init__ to run
+    return (
+        not hasattr(cls, "__post_init__")
+        and all(field.init for field in fields)
+        and all(isinstance(getattr(cls, field.name, None), types.MemberDescriptorType) for field in fields)
+    )
+
+
+def chunked[T](items: Sequence[T], table: type[Base], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Sequence[T]]:
+    """Splits rows of a multi-row insert into `table` so that every chunk fits into the bind parameters limit."""
+    if chunk_size <= 0:
+        raise ValueError(f"chunk_size should be positive, got {chunk_size}")
+
+    max_chunk_size = MAX_BIND_PARAMETERS // len(table.__table__.columns)
+    size = min(chunk_size, max_chunk_size)
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def unique_by_id[T](items: Sequence[T]) -> list[T]:
+    """Keeps the latest of items with the same `id`, since a row cannot be upserted or merged twice by one statement."""
+    return list({item.id: item for item in items}.values())  # ty:ignore[unresolved-attribute]
+
+
+def on_conflict_update_changed(stmt: sa_postgresql.Insert, table: type[Base], columns: Sequence[str]) -> ReturningInsert[tuple[bool]]:
+    """Updates a conflicting row only if its content differs, returns `inserted` flag for every written row.
+
+    Rows equal to the stored ones are neither updated nor returned, so they produce no dead tuples and no WAL.
+    """
+    target = table.__table__.c
+    update_columns = [c for c in columns if c != "id"]
+    excluded = stmt.excluded
+    return stmt.on_conflict_do_update(
+        index_elements=[target.id],
+        set_={c: excluded[c] for c in update_columns},
+        where=sa.tuple_(*(target[c] for c in update_columns)).is_distinct_from(sa.tuple_(*(excluded[c] for c in update_columns))),
+    ).returning(sa.literal_column("xmax = 0").label("inserted"))
+
+
+async def execute_upsert(
+    connection: sa_async.AsyncConnection,
+    stmt: ReturningInsert[tuple[bool]],
+    total: int,
+    rows: Sequence[dict[str, Any]] | None = None,
+) -> UpsertResult:
+    written = (await connection.execute(stmt, rows)).all()
+    inserted = sum(1 for row in written if row.inserted)
+    return UpsertResult(inserted=inserted, updated=len(written) - inserted, skipped=total - len(written))
+
+
+async def upsert_dataclasses[T](
+    connection: sa_async.AsyncConnection,
+    table: type[Base],
+    items: Sequence[T],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> UpsertResult:
+    if not items:
+        return UpsertResult()
+
+    # executed with many rows, so it is compiled once and sent as multi-row batches, unlike a statement with inlined values
+    columns, _ = get_row_extractor(type(items[0]))
+    stmt = on_conflict_update_changed(sa_postgresql.insert(table), table, columns)
+    result = UpsertResult()
+    for chunk in chunked(items, table, chunk_size):
+        rows = from_dataclasses(chunk)
+        result += await execute_upsert(connection, stmt, len(rows), rows)
+    return result
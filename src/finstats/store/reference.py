@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import dataclasses
+from collections.abc import Iterable
+
+from finstats.domain import Account, AccountId, Instrument, InstrumentId, Merchant, MerchantId, Tag, TagId, ZenmoneyDiff
+from finstats.store.accounts import AccountsRepository
+from finstats.store.connection import ConnectionScope
+from finstats.store.instruments import InstrumentsRepository
+from finstats.store.merchants import MerchantsRepository
+from finstats.store.tags import TagsRepository
+from finstats.store.timestamp import TimestampRepository
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class ReferenceData:
+    """Snapshot of entities transactions refer to, indexed by id, it is never mutated once built."""
+
+    accounts: dict[AccountId, Account]
+    instruments: dict[InstrumentId, Instrument]
+    merchants: dict[MerchantId, Merchant]
+    tags: dict[TagId, Tag]
+    children_tags: dict[TagId, list[TagId]]
+
+    @staticmethod
+    def build(accounts: Iterable[Account], instruments: Iterable[Instrument], merchants: Iterable[Merchant], tags: Iterable[Tag]) -> ReferenceData:
+        tags_by_id = {tag.id: tag for tag in tags}
+        return ReferenceData(
+            accounts={account.id: account for account in accounts},
+            instruments={instrument.id: instrument for instrument in instruments},
+            merchants={merchant.id: merchant for merchant in merchants},
+            tags=tags_by_id,
+            children_tags=_get_children_tags(tags_by_id.values()),
+        )
+
+    def patch(self, diff: ZenmoneyDiff) -> ReferenceData:
+        """Returns a copy with entities of the diff saved over the current ones."""
+        if not (diff.accounts or diff.instruments or diff.merchants or diff.tags):
+            return self
+
+        tags = self.tags | {tag.id: tag for tag in diff.tags}
+        return ReferenceData(
+            accounts=self.accounts | {account.id: account for account in diff.accounts},
+            instruments=self.instruments | {instrument.id: instrument for instrument in diff.instruments},
+            merchants=self.merchants | {merchant.id: merchant for merchant in diff.merchants},
+            tags=tags,
+            children_tags=_get_children_tags(tags.values()) if diff.tags else self.children_tags,
+        )
+
+
+def _get_children_tags(tags: Iterable[Tag]) -> dict[TagId, list[TagId]]:
+    children: dict[TagId, list[TagId]] = {}
+    for tag in tags:
+        if tag.parent is not None:
+            children.setdefault(tag.parent, []).append(tag.id)
+    return children
+
+
+class ReferenceDataCache:
+    """Process-wide reference data, versioned by the last synced timestamp.
+
+    Syncs of this process patch the snapshot in place of a reload, any other change of the timestamp makes the next read reload it.
+    """
+
+    __slots__ = (
+        "__accounts_repository",
+        "__connection_scope",
+        "__data",
+        "__instruments_repository",
+        "__merchants_repository",
+        "__tags_repository",
+        "__timestamp_repository",
+        "__version",
+    )
+
+    def __init__(
+        self,
+        connection: ConnectionScope,
+        timestamp_repository: TimestampRepository,
+        accounts_repository: AccountsRepository,
+        instruments_repository: InstrumentsRepository,
+        merchants_repository: MerchantsRepository,
+        tags_repository: TagsRepository,
+    ) -> None:
+        self.__connection_scope = connection
+        self.__timestamp_repository = timestamp_repository
+        self.__accounts_repository = accounts_repository
+        self.__instruments_repository = instruments_repository
+        self.__merchants_repository = merchants_repository
+        self.__tags_repository = tags_repository
+        self.__data: ReferenceData | None = None
+        self.__version = 0
+
+    async def get(self) -> ReferenceData:
+        async with self.__connection_scope.acquire():
+            version = await self.__timestamp_repository.get_last_timestamp()
+            if self.__data is not None and self.__version == version:
+                return self.__data
+
+            data = ReferenceData.build(
+                accounts=await self.__accounts_repository.get_accounts(),
+                instruments=await self.__instruments_repository.get_instruments(),
+                merchants=await self.__merchants_repository.get_merchants(),
+                tags=await self.__tags_repository.get_tags(),
+            )
+        # a sync could have patched a newer snapshot meanwhile, the older one is still replaced and reloaded by the next read
+        self.__data = data
+        self.__version = version
+        return data
+
+    def apply(self, diff: ZenmoneyDiff, previous_timestamp: int) -> None:
+        """Patches the snapshot with a diff committed on top of `previous_timestamp`, drops it if the snapshot is of another version."""
+        if self.__data is None or self.__version != previous_timestamp:
+            self.clear()
+            return
+
+        self.__data = self.__data.patch(diff)
+        self.__version = diff.server_timestamp
+
+    def clear(self) -> None:
+        self.__data = None
+        self.__version = 0
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import dataclasses
+import datetime
+import decimal
+from collections.abc import Iterable
+
+import sqlalchemy as sa
+import sqlalchemy.ext.asyncio as sa_async
+from sqlalchemy.dialects import postgresql as sa_postgresql
+
+from finstats.domain import AccountId, InstrumentId, TagId
+from finstats.store.base import TransactionsDailyTable, TransactionsTable
+
+# a day of an account, rows of the rollup are recomputed by these keys
+type AccountDay = tuple[datetime.date, AccountId]
+
+_ROLLUP_COLUMNS = ("date", "account", "first_tag", "instrument", "transaction_type", "income", "outcome", "transactions_count")
+
+
+@dataclasses.dataclass(frozen=True, slots=True, kw_only=True)
+class DailyRollup:
+    date: datetime.date
+    account: AccountId
+    first_tag: TagId | None
+    instrument: InstrumentId
+    transaction_type: str | None
+    income: decimal.Decimal
+    outcome: decimal.Decimal
+    transactions_count: int
+
+
+def get_account_days(rows: Iterable[sa.Row]) -> set[AccountDay]:
+    """Days of both accounts of transactions, rows should have `date`, `income_account` and `outcome_account`."""
+    days: set[AccountDay] = set()
+    for row in rows:
+        days.add((row.date, row.income_account))
+        days.add((row.date, row.outcome_account))
+    return days
+
+
+async def refresh_daily_rollup(connection: sa_async.AsyncConnection, days: set[AccountDay]) -> None:
+    """Recomputes rows of the rollup for the given days of accounts from the current state of transactions."""
+    if not days:
+        return
+
+    dates, accounts = zip(*days, strict=True)
+    selected = sa.select(
+        sa.func.unnest(sa.bindparam(None, list(dates), type_=sa_postgresql.ARRAY(sa.Date))).label("date"),
+        sa.func.unnest(sa.bindparam(None, list(accounts), type_=sa_postgresql.ARRAY(sa.Uuid))).label("account"),
+    ).subquery("days")
+    d = TransactionsDailyTable
+    await connection.execute(sa.delete(d).where(sa.tuple_(d.date, d.account).in_(sa.select(selected.c.date, selected.c.account))))
+
+    t = TransactionsTable
+    rollup = _select_daily_rollup(
+        income_where=sa.tuple_(t.date, t.income_account).in_(sa.select(selected.c.date, selected.c.account)),
+        outcome_where=sa.tuple_(t.date, t.outcome_account).in_(sa.select(selected.c.date, selected.c.account)),
+    )
+    await connection.execute(sa.insert(d).from_select(_ROLLUP_COLUMNS, rollup))
+
+
+async def rebuild_daily_rollup(connection: sa_async.AsyncConnection) -> int:
+    """Recomputes the whole rollup, returns the number of its rows."""
+    d = TransactionsDailyTable
+    await connection.execute(sa.delete(d))
+    result = await connection.execute(sa.insert(d).from_select(_ROLLUP_COLUMNS, _select_daily_rollup(sa.true(), sa.true())))
+    return result.rowcount
+
+
+def _select_daily_rollup(income_where: sa.ColumnElement[bool], outcome_where: sa.ColumnElement[bool]) -> sa.Select:
+    t = TransactionsTable
+    sides = sa.union_all(
+        sa.select(
+            t.id,
+            t.date,
+            t.income_account.label("account"),
+            t.first_tag,
+            t.income_instrument.label("instrument"),
+            t.transaction_type,
+            t.income.label("income"),
+            sa.literal(0, sa.DECIMAL).label("outcome"),
+        ).where(t.deleted.is_(False), t.income != 0, income_where),
+        sa.select(
+            t.id,
+            t.date,
+            t.outcome_account.label("account"),
+            t.first_tag,
+            t.outcome_instrument.label("instrument"),
+            t.transaction_type,
+            sa.literal(0, sa.DECIMAL).label("income"),
+            t.outcome.label("outcome"),
+        ).where(t.deleted.is_(False), t.outcome != 0, outcome_where),
+    ).subquery("sides")
+
+    key = (sides.c.date, sides.c.account, sides.c.first_tag, sides.c.instrument, sides.c.transaction_type)
+    # a transfer between sides of one account is still one transaction
+    return sa.select(
+        *key,
+        sa.func.sum(sides.c.income),
+        sa.func.sum(sides.c.outcome),
+        sa.func.count(sides.c.id.distinct()),
+    ).group_by(*key)
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import dataclasses
+import datetime
+import decimal
+
+import sqlalchemy as sa
+from sqlalchemy import orm
+
+from finstats.domain import AccountId, InstrumentId, TagId
+from finstats.store.base import InstrumentTable, TagTable, TransactionsDailyTable, TransactionsTable
+from finstats.store.connection import ConnectionScope
+from finstats.store.currency import CONVERTED_SCALE, conversion_rate
+from finstats.store.misc import to_dataclasses
+from finstats.store.transactions import TransactionTypeFilter
+
+_INCOME_TYPES = (TransactionTypeFilter.Income.value, TransactionTypeFilter.ReturnIncome.value)
+_OUTCOME_TYPES = (TransactionTypeFilter.Expense.value, TransactionTypeFilter.ReturnExpense.value)
+
+
+@dataclasses.dataclass(frozen=True, slots=True, kw_only=True)
+class TagStats:
+    # the top-level tag, None for transactions without tags
+    category_id: TagId | None
+    # None for totals of the whole category
+    tag_id: TagId | None
+    instrument: InstrumentId
+    income: decimal.Decimal
+    outcome: decimal.Decimal
+    transactions_count: int
+
+
+@dataclasses.dataclass(frozen=True, slots=True, kw_only=True)
+class DailyStats:
+    date: datetime.date
+    instrument: InstrumentId
+    income: decimal.Decimal
+    outcome: decimal.Decimal
+    transactions_count: int
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class TagStatsReport:
+    categories: list[TagStats]
+    tags: list[TagStats]
+
+
+class StatsRepository:
+    __connection_scope: ConnectionScope
+
+    def __init__(self, connection: ConnectionScope) -> None:
+        self.__connection_scope = connection
+
+    async def get_stats_by_tag(
+        self,
+        from_date: datetime.date | None = None,
+        to_date: datetime.date | None = None,
+        account_id: AccountId | None = None,
+        currency: InstrumentId | None = None,
+    ) -> TagStatsReport:
+        """Sums income and outcome by the first tag of transactions and by its top-level tag, separately for every instrument.
+
+        Transfers and debts are not counted, refunds are counted on the side money moved, e.g. a refund of an expense is an income.
+        With `currency` amounts are converted to it before summing, so there is one entry per tag,
+        amounts of instruments without a known rate are still summed in their own instrument.
+        """
+        if from_date is not None and to_date is not None and from_date > to_date:
+            raise ValueError(f"from_date {from_date} > to_date {to_date}")
+
+        t = TransactionsTable
+        # `= false` as in the predicate of the partial index by type and date
+        where_clause = (t.deleted == sa.false()) & t.transaction_type.in_(_INCOME_TYPES + _OUTCOME_TYPES)
+        if from_date:
+            where_clause &= t.date >= from_date
+        if to_date:
+            where_clause &= t.date <= to_date
+        if account_id:
+            where_clause &= (t.income_account == account_id) | (t.outcome_account == account_id)
+
+        amounts = (
+            sa.select(
+                sa.func.coalesce(TagTable.parent, t.first_tag).label("category_id"),
+                t.first_tag.label("tag_id"),
+                sa.case((t.transaction_type.in_(_INCOME_TYPES), t.income_instrument), else_=t.outcome_instrument).label("instrument"),
+                sa.case((t.transaction_type.in_(_INCOME_TYPES), t.income), else_=0).label("income"),
+                sa.case((t.transaction_type.in_(_OUTCOME_TYPES), t.outcome), else_=0).label("outcome"),
+            )
+            .select_from(t)
+            .outerjoin(TagTable, TagTable.id == t.first_tag)
+            .where(where_clause)
+            .subquery("amounts")
+        )
+        if currency is not None:
+            amounts = _convert_amounts(amounts, currency)
+
+        # both levels come from one scan, grouping() tells category totals from rows of transactions without tags
+        stmt = (
+            sa.select(
+                amounts.c.category_id,
+                amounts.c.tag_id,
+                amounts.c.instrument,
+                _sum(amounts.c.income, currency).label("income"),
+                _sum(amounts.c.outcome, currency).label("outcome"),
+                sa.func.count().label("transactions_count"),
+                (sa.func.grouping(amounts.c.tag_id) == 1).label("is_category"),
+            )
+            .group_by(
+                sa.func.grouping_sets(
+                    sa.tuple_(amounts.c.category_id, amounts.c.tag_id, amounts.c.instrument),
+                    sa.tuple_(amounts.c.category_id, amounts.c.instrument),
+                )
+            )
+            .order_by(amounts.c.category_id, amounts.c.tag_id, amounts.c.instrument)
+        )
+
+        async with self.__connection_scope.acquire() as connection:
+            rows = (await connection.execute(stmt)).all()
+
+        report = TagStatsReport(categories=[], tags=[])
+        for row in rows:
+            stats = TagStats(
+                category_id=row.category_id,
+                tag_id=None if row.is_category else row.tag_id,
+                instrument=row.instrument,
+                income=row.income,
+                outcome=row.outcome,
+                transactions_count=row.transactions_count,
+            )
+            (report.categories if row.is_category else report.tags).append(stats)
+        return report
+
+    async def get_daily_stats(
+        self,
+        from_date: datetime.date | None = None,
+        to_date: datetime.date | None = None,
+        account_id: AccountId | None = None,
+    ) -> list[DailyStats]:
+        """Sums income and outcome by day, separately for every instrument, from the daily rollup.
+
+        Transactions are counted as in `get_stats_by_tag`, except that with `account_id` only amounts of this account are summed.
+        """
+        if from_date is not None and to_date is not None and from_date > to_date:
+            raise ValueError(f"from_date {from_date} > to_date {to_date}")
+
+        d = TransactionsDailyTable
+        where_clause = d.transaction_type.in_(_INCOME_TYPES + _OUTCOME_TYPES)
+        if from_date:
+            where_clause &= d.date >= from_date
+        if to_date:
+            where_clause &= d.date <= to_date
+        if account_id:
+            where_clause &= d.account == account_id
+
+        stmt = (
+            sa.select(
+                d.date,
+                d.instrument,
+                sa.func.sum(sa.case((d.transaction_type.in_(_INCOME_TYPES), d.income), else_=0)).label("income"),
+                sa.func.sum(sa.case((d.transaction_type.in_(_OUTCOME_TYPES), d.outcome), else_=0)).label("outcome"),
+                sa.func.sum(d.transactions_count).label("transactions_count"),
+            )
+            .where(where_clause)
+            .group_by(d.date, d.instrument)
+            .order_by(d.date, d.instrument)
+        )
+
+        async with self.__connection_scope.acquire() as connection:
+            result = await connection.execute(stmt)
+            return to_dataclasses(DailyStats, result.all())
+
+
+def _convert_amounts(amounts: sa.Subquery, currency: InstrumentId) -> sa.Subquery:
+    source = orm.aliased(InstrumentTable, name="source_instrument")
+    rate = conversion_rate(amounts.c.instrument, source.rate, currency)
+    return (
+        sa.select(
+            amounts.c.category_id,
+            amounts.c.tag_id,
+            sa.case((rate.is_not(None), currency), else_=amounts.c.instrument).label("instrument"),
+            (amounts.c.income * sa.func.coalesce(rate, 1)).label("income"),
+            (amounts.c.outcome * sa.func.coalesce(rate, 1)).label("outcome"),
+        )
+        .select_from(amounts)
+        .outerjoin(source, source.id == amounts.c.instrument)
+        .subquery("converted_amounts")
+    )
+
+
+def _sum(amount: sa.ColumnElement[decimal.Decimal], currency: InstrumentId | None) -> sa.ColumnElement[decimal.Decimal]:
+    # converted amounts are rounded once per total, not per transaction
+    total = sa.func.sum(amount)
+    return total if currency is None else sa.func.round(total, CONVERTED_SCALE)
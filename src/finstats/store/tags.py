@@ -1,10 +1,10 @@
 import sqlalchemy as sa
-from sqlalchemy.dialects import postgresql as sa_postgresql
 
 from finstats.domain import Tag, TagId
-from finstats.store.base import TagTable
+from finstats.store.base import TagTable, TransactionsTable
 from finstats.store.connection import ConnectionScope
-from finstats.store.misc import from_dataclasses, to_dataclass, to_dataclasses
+from finstats.store.misc import DEFAULT_CHUNK_SIZE, UpsertResult, to_dataclass, to_dataclasses, upsert_dataclasses
+from finstats.store.transactions import refresh_transaction_types, uuid_array
 
 
 class TagsRepository:
@@ -39,17 +39,13 @@ class TagsRepository:
             result = await connection.execute(stmt)
             return to_dataclasses(Tag, result.all())
 
-    async def save_tags(self, tags: list[Tag]) -> None:
+    async def save_tags(self, tags: list[Tag], chunk_size: int = DEFAULT_CHUNK_SIZE) -> UpsertResult:
         if not tags:
-            return
-
-        stmt = sa_postgresql.insert(TagTable).values(from_dataclasses(tags))
-        excluded = stmt.excluded
-        set_cols = {c.name: getattr(excluded, c.name) for c in TagTable.__table__.columns if c.name != "id"}
+            return UpsertResult()
 
         async with self.__connection_scope.acquire() as connection:
-            stmt = stmt.on_conflict_do_update(
-                index_elements=[TagTable.id],
-                set_=set_cols,
-            )
-            await connection.execute(stmt)
+            result = await upsert_dataclasses(connection, TagTable, tags, chunk_size)
+            if result.inserted or result.updated:
+                # the type of a transaction depends on its first tag
+                await refresh_transaction_types(connection, TransactionsTable.first_tag == sa.any_(uuid_array([t.id for t in tags])))
+            return result
@@ -24,3 +24,15 @@ class TimestampRepository:
         stmt = sa.update(TimestampTable).where(TimestampTable.id == 1).values(last_synced_timestamp=dt)
         async with self.__connection_scope.acquire() as connection:
             await connection.execute(stmt)
+
+    async def compare_and_save_last_timestamp(self, expected: int, timestamp: int) -> bool:
+        expected_dt = datetime.datetime.fromtimestamp(expected, tz=datetime.UTC)
+        dt = datetime.datetime.fromtimestamp(timestamp, tz=datetime.UTC)
+        stmt = (
+            sa.update(TimestampTable)
+            .where(TimestampTable.id == 1, TimestampTable.last_synced_timestamp == expected_dt)
+            .values(last_synced_timestamp=dt)
+        )
+        async with self.__connection_scope.acquire() as connection:
+            result = await connection.execute(stmt)
+            return result.rowcount == 1
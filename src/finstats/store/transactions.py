@@ -1,13 +1,26 @@
+from __future__ import annotations
+
+import dataclasses
 import datetime
+import decimal
 import enum
+import json
+import uuid
+from collections.abc import Sequence
 
 import sqlalchemy as sa
+import sqlalchemy.ext.asyncio as sa_async
+from sqlalchemy import orm
 from sqlalchemy.dialects import postgresql as sa_postgresql
 
-from finstats.domain import AccountId, TagId, Transaction, TransactionId
-from finstats.store.base import AccountTable, TagTable, TransactionsTable
+from finstats.domain import AccountId, InstrumentId, TagId, Transaction, TransactionId
+from finstats.store.base import AccountTable, InstrumentTable, MerchantTable, TagTable, TransactionsDailyTable, TransactionsTable
+from finstats.store.cache import VersionedCache
 from finstats.store.connection import ConnectionScope
-from finstats.store.misc import from_dataclasses, to_dataclass, to_dataclasses
+from finstats.store.currency import convert_amount
+from finstats.store.misc import DEFAULT_CHUNK_SIZE, UpsertResult, to_dataclass, to_dataclasses, unique_by_id, upsert_dataclasses
+from finstats.store.rollup import DailyRollup, get_account_days, rebuild_daily_rollup, refresh_daily_rollup
+from finstats.store.timestamp import TimestampRepository
 
 
 class TransactionTypeFilter(enum.StrEnum):
@@ -20,11 +33,85 @@ class TransactionTypeFilter(enum.StrEnum):
     ReturnExpense = "ReturnExpense"
 
 
+class TotalCountMode(enum.StrEnum):
+    Exact = "exact"
+    # planner estimate, unless the exact count is already cached
+    Estimated = "estimated"
+    Skip = "skip"
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class TransactionFilterKey:
+    from_date: datetime.date | None
+    to_date: datetime.date | None
+    not_viewed: bool
+    account_id: AccountId | None
+    tags: frozenset[TagId] | None
+    transaction_type: str | None
+
+
+class TransactionCountCache(VersionedCache[TransactionFilterKey, int]):
+    """Exact counts of transactions by filters, versioned by the last synced timestamp."""
+
+    __slots__ = ()
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class TransactionReferences:
+    """Titles of entities a transaction refers to, None for a missing entity."""
+
+    tags_titles: list[str | None]
+    income_account_title: str | None
+    income_account_type: str | None
+    outcome_account_title: str | None
+    outcome_account_type: str | None
+    income_instrument_title: str | None
+    outcome_instrument_title: str | None
+    merchant_title: str | None
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class ConvertedAmounts:
+    """Amounts of a transaction in another currency, None when a rate of an instrument is unknown."""
+
+    income: decimal.Decimal | None
+    outcome: decimal.Decimal | None
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class TransactionsPage:
+    transactions: list[Transaction]
+    total_count: int | None
+    # stored classification of every returned transaction
+    transaction_types: dict[TransactionId, TransactionTypeFilter]
+    # filled only when requested with `with_references`
+    references: dict[TransactionId, TransactionReferences] = dataclasses.field(default_factory=dict)
+    # filled only when requested with `currency`
+    converted: dict[TransactionId, ConvertedAmounts] = dataclasses.field(default_factory=dict)
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class TransactionCursor:
+    """Position right after a transaction in the `date DESC, created DESC, id DESC` order."""
+
+    date: datetime.date
+    created: datetime.datetime
+    id: TransactionId
+
+    @staticmethod
+    def after(transaction: Transaction) -> TransactionCursor:
+        return TransactionCursor(date=transaction.date, created=transaction.created, id=transaction.id)
+
+
 class TransactionsRepository:
     __connection_scope: ConnectionScope
+    __timestamp_repository: TimestampRepository
+    __count_cache: TransactionCountCache
 
-    def __init__(self, connection: ConnectionScope) -> None:
+    def __init__(self, connection: ConnectionScope, timestamp_repository: TimestampRepository, count_cache: TransactionCountCache) -> None:
         self.__connection_scope = connection
+        self.__timestamp_repository = timestamp_repository
+        self.__count_cache = count_cache
 
     async def get_transaction(self, transaction_id: TransactionId) -> Transaction | None:
         stmt = sa.select(TransactionsTable).where(TransactionsTable.id == transaction_id)
@@ -42,11 +129,49 @@ class TransactionsRepository:
         account_id: AccountId | None = None,
         tags: list[TagId] | None = None,
         transaction_type: TransactionTypeFilter | None = None,
-    ) -> tuple[list[Transaction], int]:
+        cursor: TransactionCursor | None = None,
+        total_count: TotalCountMode = TotalCountMode.Exact,
+    ) -> tuple[list[Transaction], int | None]:
+        page = await self.find_transactions_page(
+            offset=offset,
+            limit=limit,
+            from_date=from_date,
+            to_date=to_date,
+            not_viewed=not_viewed,
+            account_id=account_id,
+            tags=tags,
+            transaction_type=transaction_type,
+            cursor=cursor,
+            total_count=total_count,
+        )
+        return page.transactions, page.total_count
+
+    async def find_transactions_page(
+        self,
+        offset: int = 0,
+        limit: int = 100,
+        from_date: datetime.date | None = None,
+        to_date: datetime.date | None = None,
+        not_viewed: bool = False,
+        account_id: AccountId | None = None,
+        tags: list[TagId] | None = None,
+        transaction_type: TransactionTypeFilter | None = None,
+        cursor: TransactionCursor | None = None,
+        total_count: TotalCountMode = TotalCountMode.Exact,
+        with_references: bool = False,
+        currency: InstrumentId | None = None,
+    ) -> TransactionsPage:
+        """Returns a page of transactions and the total count matching the filters, None if the count is skipped.
+
+        With `cursor` the page starts right after it, so deep pages cost the same as the first one, `offset` is applied after the cursor.
+        With `with_references` titles of tags, accounts, instruments and merchants are fetched by the same query.
+        With `currency` amounts are also converted to it by the same query, using rates of instruments.
+        """
         if from_date is not None and to_date is not None and from_date > to_date:
             raise ValueError(f"from_date {from_date} > to_date {to_date}")
 
-        where_clause = TransactionsTable.deleted.is_(False)
+        # partial indexes are built with `= false`, postgres cannot prove them from `IS false`
+        where_clause = TransactionsTable.deleted == sa.false()
         if from_date:
             where_clause &= TransactionsTable.date >= from_date
 
@@ -54,7 +179,7 @@ class TransactionsRepository:
             where_clause &= TransactionsTable.date <= to_date
 
         if not_viewed:
-            where_clause &= TransactionsTable.viewed.is_(False)
+            where_clause &= TransactionsTable.viewed == sa.false()
 
         if account_id:
             where_clause &= (TransactionsTable.income_account == account_id) | (TransactionsTable.outcome_account == account_id)
@@ -63,11 +188,27 @@ class TransactionsRepository:
             where_clause &= TransactionsTable.tags.op("&&")(tags)
 
         if transaction_type:
-            type_expr = self._get_binary_expression_transaction_type(transaction_type)
-            if type_expr is not None:
-                where_clause &= type_expr
+            where_clause &= TransactionsTable.transaction_type == transaction_type
+
+        filter_key = TransactionFilterKey(
+            from_date=from_date or None,
+            to_date=to_date or None,
+            not_viewed=not_viewed,
+            account_id=account_id or None,
+            tags=frozenset(tags) if tags else None,
+            transaction_type=transaction_type or None,
+        )
+        count_where_clause = where_clause
+
+        if cursor is not None:
+            # a row value comparison, unlike expanded OR-chains, is matched against the sort key index
+            t = TransactionsTable
+            where_clause &= sa.tuple_(t.date, t.created, t.id) < sa.tuple_(
+                sa.literal(cursor.date, t.date.type),
+                sa.literal(cursor.created, t.created.type),
+                sa.literal(cursor.id, t.id.type),
+            )
 
-        stmt_count = sa.select(sa.func.count()).select_from(TransactionsTable).where(where_clause)
         stmt = (
             sa.select(TransactionsTable)
             .order_by(TransactionsTable.date.desc(), TransactionsTable.created.desc(), TransactionsTable.id.desc())
@@ -75,98 +216,218 @@ class TransactionsRepository:
             .limit(limit)
             .where(where_clause)
         )
+        if with_references:
+            stmt = _select_with_references(stmt)
+        if currency is not None:
+            stmt = _select_with_converted_amounts(stmt, currency)
 
         async with self.__connection_scope.acquire() as connection:
-            total = (await connection.execute(stmt_count)).scalar_one()
-            result = await connection.execute(stmt)
-            return to_dataclasses(Transaction, result.all()), total
+            total = await self.__count(connection, count_where_clause, filter_key, total_count)
+            rows = (await connection.execute(stmt)).all()
+            return TransactionsPage(
+                transactions=to_dataclasses(Transaction, rows),
+                total_count=total,
+                transaction_types={row.id: TransactionTypeFilter(row.transaction_type) for row in rows if row.transaction_type is not None},
+                references=dict(zip((row.id for row in rows), to_dataclasses(TransactionReferences, rows), strict=True)) if with_references else {},
+                converted={row.id: ConvertedAmounts(row.converted_income, row.converted_outcome) for row in rows} if currency is not None else {},
+            )
 
-    async def save_transactions(self, transactions: list[Transaction]) -> None:
+    async def save_transactions(self, transactions: list[Transaction], chunk_size: int = DEFAULT_CHUNK_SIZE) -> UpsertResult:
         if not transactions:
-            return
+            return UpsertResult()
 
-        stmt = sa_postgresql.insert(TransactionsTable).values(from_dataclasses(transactions))
-        excluded = stmt.excluded
-        set_cols = {c.name: getattr(excluded, c.name) for c in TransactionsTable.__table__.columns if c.name != "id"}
+        transactions = unique_by_id(transactions)
 
-        async with self.__connection_scope.acquire() as connection:
-            stmt = stmt.on_conflict_do_update(
-                index_elements=[TransactionsTable.id],
-                set_=set_cols,
-            )
-            await connection.execute(stmt)
-
-    @staticmethod
-    def _get_binary_expression_transaction_type(
-        transaction_type: TransactionTypeFilter,
-    ) -> sa.ColumnElement[bool] | None:
         t = TransactionsTable
+        by_ids = t.id == sa.any_(uuid_array([transaction.id for transaction in transactions]))
+        async with self.__connection_scope.acquire() as connection:
+            # an edit can move a transaction to another day or account, so days it is leaving are recomputed too
+            previous = (await connection.execute(sa.select(t.date, t.income_account, t.outcome_account).where(by_ids))).all()
+            result = await upsert_dataclasses(connection, TransactionsTable, transactions, chunk_size)
+            await _update_transaction_types(connection, by_ids)
+            days = get_account_days(previous)
+            days.update((transaction.date, transaction.income_account) for transaction in transactions)
+            days.update((transaction.date, transaction.outcome_account) for transaction in transactions)
+            await refresh_daily_rollup(connection, days)
+        # local writes do not always move the timestamp, e.g. diffs saved without one
+        self.__count_cache.clear()
+        return result
+
+    async def refresh_transaction_types(self) -> int:
+        """Re-derives the stored classification of every transaction and the daily rollup, e.g. after a bulk load that bypassed the repositories."""
+        async with self.__connection_scope.acquire() as connection:
+            updated = len(await _update_transaction_types(connection, sa.true()))
+            await rebuild_daily_rollup(connection)
+            return updated
 
-        income_tx = (t.outcome == 0) & (t.income > 0)
-        expense_tx = (t.income == 0) & (t.outcome > 0)
-        transfer_tx = (t.income > 0) & (t.outcome > 0)
-
-        # первый тег или NULL
-        has_tag = sa.func.cardinality(t.tags) > 0
-        first_tag_id = sa.case((has_tag, t.tags[1]), else_=sa.null())
+    async def rebuild_daily_rollup(self) -> int:
+        """Recomputes the daily rollup from scratch, returns the number of its rows."""
+        async with self.__connection_scope.acquire() as connection:
+            return await rebuild_daily_rollup(connection)
 
-        # tag_type == Income / Expense (строго как _calculate_tag_type)
-        tag_is_income = sa.exists(
-            sa.select(1).where(
-                TagTable.id == first_tag_id,
-                TagTable.show_income.is_(True),
-                TagTable.show_outcome.is_(False),
-            )
-        )
-        tag_is_expense = sa.exists(
-            sa.select(1).where(
-                TagTable.id == first_tag_id,
-                TagTable.show_outcome.is_(True),
-                TagTable.show_income.is_(False),
-            )
-        )
+    async def find_daily_rollup(
+        self,
+        from_date: datetime.date | None = None,
+        to_date: datetime.date | None = None,
+        account_id: AccountId | None = None,
+    ) -> list[DailyRollup]:
+        d = TransactionsDailyTable
+        stmt = sa.select(d).order_by(d.date, d.account, d.first_tag, d.instrument, d.transaction_type)
+        if from_date:
+            stmt = stmt.where(d.date >= from_date)
+        if to_date:
+            stmt = stmt.where(d.date <= to_date)
+        if account_id:
+            stmt = stmt.where(d.account == account_id)
+        async with self.__connection_scope.acquire() as connection:
+            result = await connection.execute(stmt)
+            return to_dataclasses(DailyRollup, result.all())
 
-        # tag_type is None:
-        #  - тега нет
-        #  - или есть тег, но show_income=false и show_outcome=false
-        tag_is_none = ~has_tag | sa.exists(
-            sa.select(1).where(
-                TagTable.id == first_tag_id,
-                TagTable.show_income.is_(False),
-                TagTable.show_outcome.is_(False),
-            )
+    async def __count(
+        self,
+        connection: sa_async.AsyncConnection,
+        where_clause: sa.ColumnElement[bool],
+        filter_key: TransactionFilterKey,
+        mode: TotalCountMode,
+    ) -> int | None:
+        if mode == TotalCountMode.Skip:
+            return None
+
+        version = await self.__timestamp_repository.get_last_timestamp()
+        total = self.__count_cache.get(filter_key, version)
+        if total is not None:
+            return total
+        if mode == TotalCountMode.Estimated:
+            return await _estimate_count(connection, sa.select(TransactionsTable.id).where(where_clause))
+
+        stmt_count: sa.Select[tuple[int]] = sa.select(sa.func.count()).select_from(TransactionsTable).where(where_clause)
+        total = (await connection.execute(stmt_count)).scalar_one()
+        self.__count_cache.put(filter_key, version, total)
+        return total
+
+
+def _select_with_references(stmt: sa.Select) -> sa.Select:
+    # lookups are joined to the already limited page, so they cost the same for every page
+    page = stmt.subquery("page")
+    income_account = orm.aliased(AccountTable, name="income_account_row")
+    outcome_account = orm.aliased(AccountTable, name="outcome_account_row")
+    income_instrument = orm.aliased(InstrumentTable, name="income_instrument_row")
+    outcome_instrument = orm.aliased(InstrumentTable, name="outcome_instrument_row")
+
+    page_tags = sa.func.unnest(page.c.tags).table_valued("id", with_ordinality="tag_position").render_derived(name="page_tags")
+    tags_titles = (
+        sa.select(sa.func.array_agg(sa_postgresql.aggregate_order_by(TagTable.title, page_tags.c.tag_position)))
+        .select_from(page_tags.outerjoin(TagTable, TagTable.id == page_tags.c.id))
+        .scalar_subquery()
+    )
+
+    return (
+        sa.select(
+            page,
+            sa.func.coalesce(tags_titles, sa.cast(sa_postgresql.array([]), sa_postgresql.ARRAY(sa.Text))).label("tags_titles"),
+            income_account.title.label("income_account_title"),
+            income_account.type.label("income_account_type"),
+            outcome_account.title.label("outcome_account_title"),
+            outcome_account.type.label("outcome_account_type"),
+            income_instrument.title.label("income_instrument_title"),
+            outcome_instrument.title.label("outcome_instrument_title"),
+            MerchantTable.title.label("merchant_title"),
         )
-        tag_is_both_type = sa.exists(
-            sa.select(1).where(
-                TagTable.id == first_tag_id,
-                TagTable.show_income.is_(True),
-                TagTable.show_outcome.is_(True),
-            )
+        .select_from(page)
+        .outerjoin(income_account, income_account.id == page.c.income_account)
+        .outerjoin(outcome_account, outcome_account.id == page.c.outcome_account)
+        .outerjoin(income_instrument, income_instrument.id == page.c.income_instrument)
+        .outerjoin(outcome_instrument, outcome_instrument.id == page.c.outcome_instrument)
+        .outerjoin(MerchantTable, MerchantTable.id == page.c.merchant)
+        .order_by(page.c.date.desc(), page.c.created.desc(), page.c.id.desc())
+    )
+
+
+def _select_with_converted_amounts(stmt: sa.Select, currency: InstrumentId) -> sa.Select:
+    page = stmt.subquery("converted_page")
+    income_instrument = orm.aliased(InstrumentTable, name="income_rate_row")
+    outcome_instrument = orm.aliased(InstrumentTable, name="outcome_rate_row")
+    return (
+        sa.select(
+            page,
+            convert_amount(page.c.income, page.c.income_instrument, income_instrument.rate, currency).label("converted_income"),
+            convert_amount(page.c.outcome, page.c.outcome_instrument, outcome_instrument.rate, currency).label("converted_outcome"),
         )
-
-        income_acc_type = sa.select(AccountTable.type).where(AccountTable.id == t.income_account).scalar_subquery()
-        outcome_acc_type = sa.select(AccountTable.type).where(AccountTable.id == t.outcome_account).scalar_subquery()
-
-        match transaction_type:
-            case TransactionTypeFilter.Income:
-                return income_tx & (tag_is_income | tag_is_none | tag_is_both_type)
-
-            case TransactionTypeFilter.ReturnIncome:
-                return income_tx & tag_is_expense
-
-            case TransactionTypeFilter.Expense:
-                return expense_tx & (tag_is_expense | tag_is_none | tag_is_both_type)
-
-            case TransactionTypeFilter.ReturnExpense:
-                return expense_tx & tag_is_income
-
-            case TransactionTypeFilter.LentOut:
-                return transfer_tx & (income_acc_type == "debt")
-
-            case TransactionTypeFilter.DebtRepaid:
-                return transfer_tx & (outcome_acc_type == "debt")
-
-            case TransactionTypeFilter.Transfer:
-                return transfer_tx & (income_acc_type != "debt") & (outcome_acc_type != "debt")
-
-        return None
+        .select_from(page)
+        .outerjoin(income_instrument, income_instrument.id == page.c.income_instrument)
+        .outerjoin(outcome_instrument, outcome_instrument.id == page.c.outcome_instrument)
+        .order_by(page.c.date.desc(), page.c.created.desc(), page.c.id.desc())
+    )
+
+
+async def _estimate_count(connection: sa_async.AsyncConnection, stmt: sa.Select) -> int:
+    # rows estimated by the planner for the top node of a select without an aggregate, EXPLAIN does not execute the query;
+    # under an aggregate the child can be a Gather of a parallel plan, whose rows are per worker
+    compiled = stmt.compile(dialect=connection.dialect)
+    params = tuple(compiled.params[name] for name in compiled.positiontup or ())
+    result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", params)
+    plan = result.scalar_one()
+    plan = json.loads(plan) if isinstance(plan, str) else plan
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def refresh_transaction_types(connection: sa_async.AsyncConnection, where: sa.ColumnElement[bool]) -> int:
+    """Stores the type and the first tag of transactions matching `where`, rows already up to date are not written.
+
+    Has to run whenever a tag or an account a transaction refers to is saved, returns the number of updated rows.
+    The daily rollup is recomputed for days of the updated rows.
+    """
+    updated = await _update_transaction_types(connection, where)
+    await refresh_daily_rollup(connection, get_account_days(updated))
+    return len(updated)
+
+
+async def _update_transaction_types(connection: sa_async.AsyncConnection, where: sa.ColumnElement[bool]) -> Sequence[sa.Row]:
+    t = TransactionsTable
+    transaction_type = _derive_transaction_type()
+    # no self-join: rows just written by the same transaction have no statistics, so the join is planned as a quadratic nested loop
+    stmt = (
+        sa.update(t)
+        .where(where)
+        .where(sa.tuple_(t.transaction_type, t.first_tag).is_distinct_from(sa.tuple_(transaction_type, t.tags[1])))
+        .values(transaction_type=transaction_type, first_tag=t.tags[1])
+        .returning(t.date, t.income_account, t.outcome_account)
+    )
+    return (await connection.execute(stmt)).all()
+
+
+def _derive_transaction_type() -> sa.ColumnElement[str]:
+    # the same rules as calculate_transaction_type of the server, a missing tag or account is treated as absent
+    t = TransactionsTable
+
+    def tag_matches(condition: sa.ColumnElement[bool]) -> sa.ScalarSelect[bool]:
+        return sa.select(condition).where(TagTable.id == t.tags[1]).scalar_subquery()
+
+    def is_debt(account: orm.InstrumentedAttribute[uuid.UUID]) -> sa.ScalarSelect[bool]:
+        return sa.select(AccountTable.type == "debt").where(AccountTable.id == account).scalar_subquery()
+
+    tag_is_income = tag_matches(TagTable.show_income.is_(True) & TagTable.show_outcome.is_(False))
+    tag_is_expense = tag_matches(TagTable.show_outcome.is_(True) & TagTable.show_income.is_(False))
+    return sa.case(
+        (
+            (t.outcome == 0) & (t.income > 0),
+            sa.case((tag_is_expense, TransactionTypeFilter.ReturnIncome.value), else_=TransactionTypeFilter.Income.value),
+        ),
+        (
+            (t.income == 0) & (t.outcome > 0),
+            sa.case((tag_is_income, TransactionTypeFilter.ReturnExpense.value), else_=TransactionTypeFilter.Expense.value),
+        ),
+        (
+            (t.income > 0) & (t.outcome > 0),
+            sa.case(
+                (is_debt(t.income_account), TransactionTypeFilter.LentOut.value),
+                (is_debt(t.outcome_account), TransactionTypeFilter.DebtRepaid.value),
+                else_=TransactionTypeFilter.Transfer.value,
+            ),
+        ),
+        else_=TransactionTypeFilter.Transfer.value,
+    )
+
+
+def uuid_array(ids: list[uuid.UUID]) -> sa.BindParameter:
+    return sa.bindparam(None, ids, type_=sa_postgresql.ARRAY(sa.Uuid))
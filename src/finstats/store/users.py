@@ -1,10 +1,9 @@
 import sqlalchemy as sa
-from sqlalchemy.dialects import postgresql as sa_postgresql
 
 from finstats.domain import User
 from finstats.store.base import UserTable
 from finstats.store.connection import ConnectionScope
-from finstats.store.misc import from_dataclasses, to_dataclass
+from finstats.store.misc import DEFAULT_CHUNK_SIZE, UpsertResult, to_dataclass, upsert_dataclasses
 
 
 class UsersRepository:
@@ -24,17 +23,9 @@ class UsersRepository:
                 raise ValueError(f"Expected exactly 1 user, found {len(rows)}")
             return to_dataclass(User, rows[0])
 
-    async def save_users(self, users: list[User]) -> None:
+    async def save_users(self, users: list[User], chunk_size: int = DEFAULT_CHUNK_SIZE) -> UpsertResult:
         if not users:
-            return
-
-        stmt = sa_postgresql.insert(UserTable).values(from_dataclasses(users))
-        excluded = stmt.excluded
-        set_cols = {c.name: getattr(excluded, c.name) for c in UserTable.__table__.columns if c.name != "id"}
+            return UpsertResult()
 
         async with self.__connection_scope.acquire() as connection:
-            stmt = stmt.on_conflict_do_update(
-                index_elements=[UserTable.id],
-                set_=set_cols,
-            )
-            await connection.execute(stmt)
+            return await upsert_dataclasses(connection, UserTable, users, chunk_size)
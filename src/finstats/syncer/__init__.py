@@ -1,3 +1,4 @@
-from finstats.syncer.syncer import Syncer
+from finstats.syncer.stats import SyncMetrics, SyncStats
+from finstats.syncer.syncer import Syncer, is_empty_diff
 
-__all__ = ["Syncer"]
+__all__ = ["SyncMetrics", "SyncStats", "Syncer", "is_empty_diff"]
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import dataclasses
+import time
+
+from finstats.store import UpsertResult
+from finstats.zenmoney import DiffTimings
+
+PHASES = ("network", "decode", "convert", "db_write")
+
+
+@dataclasses.dataclass(slots=True, kw_only=True)
+class SyncStats:
+    """Timings and counters of a single sync run, all durations are in seconds."""
+
+    source: str
+    previous_timestamp: int
+    server_timestamp: int = 0
+    timings: DiffTimings = dataclasses.field(default_factory=DiffTimings)
+    db_write_seconds: float = 0.0
+    total_seconds: float = 0.0
+    rows: dict[str, UpsertResult] = dataclasses.field(default_factory=dict)
+    # how old the oldest change made visible by this sync could be, None for the initial sync
+    freshness_lag_seconds: float | None = None
+
+    def get_phase_seconds(self) -> dict[str, float]:
+        return {
+            "network": self.timings.network_seconds,
+            "decode": self.timings.decode_seconds,
+            "convert": self.timings.convert_seconds,
+            "db_write": self.db_write_seconds,
+        }
+
+    def add_rows(self, rows: dict[str, UpsertResult]) -> None:
+        for entity, result in rows.items():
+            self.rows[entity] = self.rows.get(entity, UpsertResult()) + result
+
+    def finish(self, started: float) -> None:
+        self.total_seconds = time.perf_counter() - started
+        if self.previous_timestamp > 0:
+            self.freshness_lag_seconds = max(time.time() - self.previous_timestamp, 0.0)
+
+    def as_log_fields(self) -> dict[str, object]:
+        fields: dict[str, object] = {
+            "source": self.source,
+            "server_timestamp": self.server_timestamp,
+            "total_seconds": round(self.total_seconds, 4),
+            "payload_bytes": self.timings.payload_bytes,
+            "freshness_lag_seconds": None if self.freshness_lag_seconds is None else round(self.freshness_lag_seconds, 1),
+        }
+        for phase, seconds in self.get_phase_seconds().items():
+            fields[f"{phase}_seconds"] = round(seconds, 4)
+        for entity, result in self.rows.items():
+            fields[f"{entity}_inserted"] = result.inserted
+            fields[f"{entity}_updated"] = result.updated
+            fields[f"{entity}_skipped"] = result.skipped
+        return fields
+
+
+class SyncMetrics:
+    """Cumulative in-process counters of all sync runs, meant to be read by other surfaces."""
+
+    __slots__ = (
+        "__failures_total",
+        "__last",
+        "__last_success_at",
+        "__payload_bytes_total",
+        "__phase_seconds_total",
+        "__rows_total",
+        "__runs_total",
+    )
+
+    def __init__(self) -> None:
+        self.__runs_total = 0
+        self.__failures_total = 0
+        self.__payload_bytes_total = 0
+        self.__phase_seconds_total = dict.fromkeys(PHASES, 0.0)
+        self.__rows_total: dict[str, UpsertResult] = {}
+        self.__last: SyncStats | None = None
+        self.__last_success_at: float | None = None
+
+    @property
+    def runs_total(self) -> int:
+        return self.__runs_total
+
+    @property
+    def failures_total(self) -> int:
+        return self.__failures_total
+
+    @property
+    def payload_bytes_total(self) -> int:
+        return self.__payload_bytes_total
+
+    @property
+    def phase_seconds_total(self) -> dict[str, float]:
+        return dict(self.__phase_seconds_total)
+
+    @property
+    def rows_total(self) -> dict[str, UpsertResult]:
+        return dict(self.__rows_total)
+
+    @property
+    def last(self) -> SyncStats | None:
+        return self.__last
+
+    @property
+    def last_success_at(self) -> float | None:
+        return self.__last_success_at
+
+    def observe(self, stats: SyncStats) -> None:
+        self.__runs_total += 1
+        self.__payload_bytes_total += stats.timings.payload_bytes
+        for phase, seconds in stats.get_phase_seconds().items():
+            self.__phase_seconds_total[phase] += seconds
+        for entity, result in stats.rows.items():
+            self.__rows_total[entity] = self.__rows_total.get(entity, UpsertResult()) + result
+        self.__last = stats
+        self.__last_success_at = time.time()
+
+    def observe_failure(self) -> None:
+        self.__runs_total += 1
+        self.__failures_total += 1
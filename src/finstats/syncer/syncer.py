@@ -1,19 +1,38 @@
+import asyncio
+import contextvars
 import logging
+import time
+from collections.abc import Coroutine
 
-from finstats.domain import Transaction, ZenmoneyDiff
+from finstats.args import CliArgs
+from finstats.domain import Account, Company, Country, Instrument, Merchant, Tag, Transaction, User, ZenmoneyDiff
 from finstats.store import (
     AccountsRepository,
+    BootstrapLoader,
     CompaniesRepository,
     ConnectionScope,
     CountriesRepository,
     InstrumentsRepository,
     MerchantsRepository,
+    ReferenceDataCache,
     TagsRepository,
     TimestampRepository,
     TransactionsRepository,
+    UpsertResult,
     UsersRepository,
 )
+from finstats.store.base import (
+    AccountTable,
+    CompanyTable,
+    CountryTable,
+    InstrumentTable,
+    MerchantTable,
+    TagTable,
+    TransactionsTable,
+    UserTable,
+)
 from finstats.syncer.file import parse_and_validate_path, write_content_to_file
+from finstats.syncer.stats import SyncMetrics, SyncStats
 from finstats.zenmoney import ZenMoneyClient
 
 log = logging.getLogger(__name__)
@@ -32,7 +51,11 @@ class Syncer:
         timestamp_repository: TimestampRepository,
         transactions_repository: TransactionsRepository,
         users_repository: UsersRepository,
+        bootstrap_loader: BootstrapLoader,
+        reference_cache: ReferenceDataCache,
         zm_client: ZenMoneyClient,
+        sync_metrics: SyncMetrics,
+        cli_args: CliArgs,
     ) -> None:
         self._connection_scope = connection_scope
         self._accounts_repository = accounts_repository
@@ -44,49 +67,193 @@ class Syncer:
         self._timestamp_repository = timestamp_repository
         self._transactions_repository = transactions_repository
         self._users_repository = users_repository
+        self._bootstrap_loader = bootstrap_loader
+        self._reference_cache = reference_cache
         self._client = zm_client
+        self._metrics = sync_metrics
+        self._chunk_size = cli_args.get_sync_chunk_size()
+        self._streaming = cli_args.is_sync_streaming()
+        self._background_tasks: set[asyncio.Task[bool]] = set()
 
     async def dry_run(self, token: str, timestamp: int, out: str) -> None:
         path = parse_and_validate_path(out)
         diff = await self._fetch_diff_and_print(token, timestamp)
         write_content_to_file(path, diff)
 
-    async def sync_once(self, token: str) -> None:
+    async def sync_once(self, token: str) -> bool:
+        """Returns whether ZenMoney has returned any changes."""
+        started = time.perf_counter()
         timestamp = await self._timestamp_repository.get_last_timestamp()
-        diff = await self._fetch_diff_and_print(token, timestamp)
-        await self.save_diff(diff)
+        stats = SyncStats(source="stream" if self._streaming else "diff", previous_timestamp=timestamp)
+        try:
+            if self._streaming:
+                has_changes = await self.sync_stream(token, timestamp, stats=stats)
+            else:
+                diff = await self._sync_and_print(token, ZenmoneyDiff(server_timestamp=timestamp), stats)
+                if timestamp == 0:
+                    await self.bootstrap_diff(diff, stats=stats)
+                else:
+                    await self.save_diff(diff, stats=stats)
+                has_changes = not is_empty_diff(diff)
+        except Exception:
+            self._metrics.observe_failure()
+            raise
+        self._observe(stats, started)
+        return has_changes
 
     async def sync_diff(self, token: str, transactions: list[Transaction]) -> ZenmoneyDiff:
+        started = time.perf_counter()
         timestamp = await self._timestamp_repository.get_last_timestamp()
-        diff = await self._sync_and_print(
-            token=token,
-            request=ZenmoneyDiff(server_timestamp=timestamp, transactions=transactions),
-        )
-        await self.save_diff(diff)
+        stats = SyncStats(source="push", previous_timestamp=timestamp)
+        try:
+            diff = await self._sync_and_print(token, ZenmoneyDiff(server_timestamp=timestamp, transactions=transactions), stats)
+            await self.save_diff(diff, stats=stats)
+        except Exception:
+            self._metrics.observe_failure()
+            raise
+        self._observe(stats, started)
         return diff
 
-    async def save_diff(self, diff: ZenmoneyDiff) -> None:
+    async def save_diff(self, diff: ZenmoneyDiff, expected_timestamp: int | None = None, stats: SyncStats | None = None) -> bool:
+        """Saves diff in one transaction.
+
+        With `expected_timestamp` the diff is saved only if the stored timestamp is still the one the diff was requested from,
+        otherwise it is dropped, so a diff fetched concurrently with another sync never overwrites newer data.
+        """
+        async with self._connection_scope.acquire():
+            if expected_timestamp is None:
+                previous_timestamp = await self._timestamp_repository.get_last_timestamp()
+                await self._timestamp_repository.save_last_timestamp(diff.server_timestamp)
+            elif await self._timestamp_repository.compare_and_save_last_timestamp(expected_timestamp, diff.server_timestamp):
+                previous_timestamp = expected_timestamp
+            else:
+                log.info("skip diff requested from %s, timestamp has been changed by another sync", expected_timestamp)
+                return False
+            results = await self._timed(self._save_entities(diff), stats)
+            self._print_upsert_results(results)
+        self._reference_cache.apply(diff, previous_timestamp)
+        if stats is not None:
+            stats.server_timestamp = diff.server_timestamp
+        return True
+
+    async def bootstrap_diff(self, diff: ZenmoneyDiff, stats: SyncStats | None = None) -> None:
         async with self._connection_scope.acquire():
             await self._timestamp_repository.save_last_timestamp(diff.server_timestamp)
-            await self._accounts_repository.save_accounts(diff.accounts)
-            await self._companies_repository.save_companies(diff.companies)
-            await self._countries_repository.save_countries(diff.countries)
-            await self._instruments_repository.save_instruments(diff.instruments)
-            await self._merchants_repository.save_merchants(diff.merchants)
-            await self._tags_repository.save_tags(diff.tags)
-            for transaction in diff.transactions:
-                await self._transactions_repository.save_transactions([transaction])
-            await self._users_repository.save_users(diff.users)
+            self._print_upsert_results(await self._timed(self._bootstrap_entities(diff), stats))
+            await self._refresh_transaction_types()
+        self._reference_cache.clear()
+        if stats is not None:
+            stats.server_timestamp = diff.server_timestamp
+
+    async def sync_stream(self, token: str, timestamp: int, stats: SyncStats | None = None) -> bool:
+        """Saves the diff batch by batch while it is being downloaded, in one transaction."""
+        if stats is None:
+            stats = SyncStats(source="stream", previous_timestamp=timestamp)
+        async with self._connection_scope.acquire():
+            server_timestamp = timestamp
+            has_changes = False
+            batches = self._client.stream_diff(
+                token=token,
+                diff=ZenmoneyDiff(server_timestamp=timestamp),
+                batch_size=self._chunk_size,
+                timings=stats.timings,
+            )
+            async for batch in batches:
+                self._print_diff(batch)
+                has_changes = has_changes or not is_empty_diff(batch)
+                await self._timed(self._bootstrap_entities(batch) if timestamp == 0 else self._save_entities(batch), stats)
+                if batch.server_timestamp:
+                    server_timestamp = batch.server_timestamp
+            if timestamp == 0:
+                await self._refresh_transaction_types()
+            log.info("sync, new timestamp: %s", server_timestamp)
+            await self._timestamp_repository.save_last_timestamp(server_timestamp)
+            self._print_upsert_results(stats.rows)
+        self._reference_cache.clear()
+        stats.server_timestamp = server_timestamp
+        return has_changes
+
+    @staticmethod
+    async def _timed(
+        save: Coroutine[None, None, dict[str, UpsertResult]],
+        stats: SyncStats | None,
+    ) -> dict[str, UpsertResult]:
+        started = time.perf_counter()
+        results = await save
+        if stats is not None:
+            stats.db_write_seconds += time.perf_counter() - started
+            stats.add_rows(results)
+        return results
+
+    def _observe(self, stats: SyncStats, started: float) -> None:
+        stats.finish(started)
+        self._metrics.observe(stats)
+        log.info("sync finished %s", " ".join(f"{key}={value}" for key, value in stats.as_log_fields().items()))
+
+    async def _save_entities(self, diff: ZenmoneyDiff) -> dict[str, UpsertResult]:
+        async with self._connection_scope.acquire():
+            return {
+                "accounts": await self._accounts_repository.save_accounts(diff.accounts, chunk_size=self._chunk_size),
+                "companies": await self._companies_repository.save_companies(diff.companies, chunk_size=self._chunk_size),
+                "countries": await self._countries_repository.save_countries(diff.countries, chunk_size=self._chunk_size),
+                "instruments": await self._instruments_repository.save_instruments(diff.instruments, chunk_size=self._chunk_size),
+                "merchants": await self._merchants_repository.save_merchants(diff.merchants, chunk_size=self._chunk_size),
+                "tags": await self._tags_repository.save_tags(diff.tags, chunk_size=self._chunk_size),
+                "transactions": await self._transactions_repository.save_transactions(diff.transactions, chunk_size=self._chunk_size),
+                "users": await self._users_repository.save_users(diff.users, chunk_size=self._chunk_size),
+            }
+
+    async def _refresh_transaction_types(self) -> None:
+        # COPY bypasses the repositories, so the stored transaction types and the daily rollup are derived once after the whole load
+        updated = await self._transactions_repository.refresh_transaction_types()
+        log.info("derived types of %d transactions, rebuilt daily rollup", updated)
+
+    async def _bootstrap_entities(self, diff: ZenmoneyDiff) -> dict[str, UpsertResult]:
+        async with self._connection_scope.acquire():
+            return {
+                "accounts": await self._bootstrap_loader.load(AccountTable, Account, diff.accounts),
+                "companies": await self._bootstrap_loader.load(CompanyTable, Company, diff.companies),
+                "countries": await self._bootstrap_loader.load(CountryTable, Country, diff.countries),
+                "instruments": await self._bootstrap_loader.load(InstrumentTable, Instrument, diff.instruments),
+                "merchants": await self._bootstrap_loader.load(MerchantTable, Merchant, diff.merchants),
+                "tags": await self._bootstrap_loader.load(TagTable, Tag, diff.tags),
+                "transactions": await self._bootstrap_loader.load(TransactionsTable, Transaction, diff.transactions),
+                "users": await self._bootstrap_loader.load(UserTable, User, diff.users),
+            }
+
+    def save_diff_in_background(self, diff: ZenmoneyDiff, expected_timestamp: int) -> None:
+        # fresh context, so the task never reuses a connection of the caller's scope
+        task = asyncio.create_task(self._save_diff_in_background(diff, expected_timestamp), context=contextvars.Context())
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def wait_background_saves(self) -> None:
+        if self._background_tasks:
+            await asyncio.gather(*self._background_tasks)
+
+    async def _save_diff_in_background(self, diff: ZenmoneyDiff, expected_timestamp: int) -> bool:
+        started = time.perf_counter()
+        stats = SyncStats(source="piggyback", previous_timestamp=expected_timestamp)
+        try:
+            saved = await self.save_diff(diff, expected_timestamp=expected_timestamp, stats=stats)
+        except Exception:
+            self._metrics.observe_failure()
+            log.exception("failed to save diff requested from %s", expected_timestamp)
+            return False
+        if saved:
+            self._observe(stats, started)
+        return saved
 
     async def _fetch_diff_and_print(self, token: str, timestamp: int) -> ZenmoneyDiff:
-        return await self._sync_and_print(
-            token=token,
-            request=ZenmoneyDiff(server_timestamp=timestamp),
-        )
+        return await self._sync_and_print(token, ZenmoneyDiff(server_timestamp=timestamp))
 
-    async def _sync_and_print(self, token: str, request: ZenmoneyDiff) -> ZenmoneyDiff:
-        diff = await self._client.sync_diff(token=token, diff=request)
+    async def _sync_and_print(self, token: str, request: ZenmoneyDiff, stats: SyncStats | None = None) -> ZenmoneyDiff:
+        diff = await self._client.sync_diff(token=token, diff=request, timings=None if stats is None else stats.timings)
         log.info("sync, new timestamp: %s", diff.server_timestamp)
+        self._print_diff(diff)
+        return diff
+
+    def _print_diff(self, diff: ZenmoneyDiff) -> None:
         if diff.accounts:
             log.info("found changed %d accounts %s", len(diff.accounts), self._cut_list(diff.accounts))
         if diff.companies:
@@ -103,8 +270,19 @@ class Syncer:
             log.info("found changed %d transactions %s", len(diff.transactions), self._cut_list(diff.transactions))
         if diff.users:
             log.info("found changed %d users %s", len(diff.users), self._cut_list(diff.users))
-        return diff
+
+    @staticmethod
+    def _print_upsert_results(results: dict[str, UpsertResult]) -> None:
+        for entity, result in results.items():
+            if result.inserted or result.updated or result.skipped:
+                log.info("saved %s: inserted %d, updated %d, skipped %d", entity, result.inserted, result.updated, result.skipped)
 
     @staticmethod
     def _cut_list[T](items: list[T]) -> list[T]:
         return items[:3] if len(items) > 3 else items
+
+
+def is_empty_diff(diff: ZenmoneyDiff) -> bool:
+    return not (
+        diff.accounts or diff.companies or diff.countries or diff.instruments or diff.merchants or diff.tags or diff.transactions or diff.users
+    )
@@ -1,4 +1,4 @@
-from finstats.zenmoney.client import ZenMoneyClient
-from finstats.zenmoney.models import ZenMoneyClientAuthException, ZenMoneyClientException
+from finstats.zenmoney.client import ZenMoneyClient, ZenMoneyClientMetrics
+from finstats.zenmoney.models import DiffTimings, ZenMoneyClientAuthException, ZenMoneyClientException
 
-__all__ = ["ZenMoneyClient", "ZenMoneyClientAuthException", "ZenMoneyClientException"]
+__all__ = ["DiffTimings", "ZenMoneyClient", "ZenMoneyClientAuthException", "ZenMoneyClientException", "ZenMoneyClientMetrics"]
@@ -1,31 +1,73 @@
 from __future__ import annotations
 
+import contextlib
 import decimal
 import json
+import time
+from collections.abc import AsyncIterator, Generator
 
 import aio_request
 import aiohttp
 import marshmallow_recipe as mr
 
 from finstats.domain import ZenmoneyDiff
-from finstats.zenmoney.convert import diff_to_zm_diff, zm_diff_to_diff
-from finstats.zenmoney.models import ZenMoneyClientAuthException, ZenMoneyClientException, ZmDiffResponse
+from finstats.metrics import Counter, Histogram
+from finstats.zenmoney.convert import diff_to_zm_diff
+from finstats.zenmoney.decode import decode_diff
+from finstats.zenmoney.models import DiffTimings, ZenMoneyClientAuthException, ZenMoneyClientException
+from finstats.zenmoney.stream import parse_diff_stream
 
 ENDPOINT = "https://api.zenmoney.app/v8/"
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class ZenMoneyClientMetrics:
+    __slots__ = ("errors_total", "request_seconds")
+
+    def __init__(self) -> None:
+        self.request_seconds = Histogram(
+            "finstats_zenmoney_request_seconds",
+            "Duration of ZenMoney API calls, streamed calls are measured until the response headers.",
+            ["method"],
+        )
+        self.errors_total = Counter("finstats_zenmoney_errors_total", "Failed ZenMoney API calls.", ["method", "error"])
+
+    @contextlib.contextmanager
+    def measure(self, method: str) -> Generator[None]:
+        started = time.perf_counter()
+        try:
+            with self.count_errors(method):
+                yield
+        finally:
+            self.request_seconds.observe(time.perf_counter() - started, method=method)
+
+    @contextlib.contextmanager
+    def count_errors(self, method: str) -> Generator[None]:
+        try:
+            yield
+        except Exception as e:
+            self.errors_total.inc(method=method, error=type(e).__name__)
+            raise
 
 
 class ZenMoneyClient:
     __slots__ = (
         "__client",
+        "__metrics",
         "__transport",
         "__session",
     )
 
     def __init__(self) -> None:
+        self.__metrics = ZenMoneyClientMetrics()
         self.__session = aiohttp.ClientSession()
         self.__transport = aio_request.AioHttpTransport(self.__session)  # ty:ignore[possibly-missing-attribute]
         self.__client = aio_request.setup(transport=self.__transport, endpoint=ENDPOINT)
 
+    @property
+    def metrics(self) -> ZenMoneyClientMetrics:
+        return self.__metrics
+
     async def dispose(self) -> None:
         if self.__session is not None and not self.__session.closed:
             await self.__session.close()
@@ -33,13 +75,24 @@ class ZenMoneyClient:
             self.__transport = None
             self.__client = None
 
-    async def sync_diff(self, token: str, diff: ZenmoneyDiff, timeout_seconds: int = 20) -> ZenmoneyDiff:
+    async def sync_diff(
+        self,
+        token: str,
+        diff: ZenmoneyDiff,
+        timeout_seconds: int = 20,
+        timings: DiffTimings | None = None,
+    ) -> ZenmoneyDiff:
+        with self.__metrics.measure("diff"):
+            return await self.__sync_diff(token, diff, timeout_seconds, timings)
+
+    async def __sync_diff(self, token: str, diff: ZenmoneyDiff, timeout_seconds: int, timings: DiffTimings | None) -> ZenmoneyDiff:
         if self.__client is None:
             raise Exception("Cannot use not created session, consider using with")
+        if timings is None:
+            timings = DiffTimings()
 
-        diff_request = diff_to_zm_diff(diff)
-        request_data = mr.dump(diff_request, naming_case=mr.CAMEL_CASE)
-        request_body = json.dumps(request_data, default=_json_default, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        started = time.perf_counter()
+        request_body = _dump_diff_request(diff)
         response_ctx = self.__client.request(
             aio_request.post(
                 url="diff",
@@ -63,7 +116,14 @@ class ZenMoneyClient:
             if not response.is_json:
                 raise ZenMoneyClientException("Expected JSON object")
 
-            data = await response.json(loads=lambda x: json.loads(x, parse_float=decimal.Decimal))
+            body = await response.read()
+            received = time.perf_counter()
+            timings.network_seconds += received - started
+            timings.payload_bytes += len(body)
+
+            data = json.loads(body, parse_float=decimal.Decimal)
+            decoded = time.perf_counter()
+            timings.decode_seconds += decoded - received
 
             if not isinstance(data, dict):
                 raise ZenMoneyClientException("Expected JSON object")
@@ -72,8 +132,48 @@ class ZenMoneyClient:
             if err is not None:
                 raise ZenMoneyClientException(f"Server method 'diff' returned error: {err!r}")
 
-            diff_response = mr.load(ZmDiffResponse, data, naming_case=mr.CAMEL_CASE)
-            return zm_diff_to_diff(diff_response)
+            result = decode_diff(data)
+            timings.convert_seconds += time.perf_counter() - decoded
+            return result
+
+    async def stream_diff(
+        self,
+        token: str,
+        diff: ZenmoneyDiff,
+        batch_size: int,
+        timeout_seconds: int = 20,
+        timings: DiffTimings | None = None,
+    ) -> AsyncIterator[ZenmoneyDiff]:
+        """Parses the response incrementally and yields diffs with at most `batch_size` entities of one type each.
+
+        The last yielded diff carries no entities, only the server timestamp, earlier ones have `server_timestamp=0`.
+        `timeout_seconds` limits connecting and every single read, not the whole download.
+        """
+        if self.__session is None:
+            raise Exception("Cannot use not created session, consider using with")
+
+        started = time.perf_counter()
+        response_ctx = self.__session.post(
+            ENDPOINT + "diff",
+            headers={
+                "Authorization": f"Bearer {token}",
+                "Content-Type": "application/json",
+            },
+            data=_dump_diff_request(diff),
+            timeout=aiohttp.ClientTimeout(sock_connect=timeout_seconds, sock_read=timeout_seconds),
+        )
+        with self.__metrics.count_errors("diff_stream"):
+            async with response_ctx as response:
+                self.__metrics.request_seconds.observe(time.perf_counter() - started, method="diff_stream")
+                if response.status == 401:
+                    raise ZenMoneyClientAuthException("Invalid token")
+                if response.status >= 400:
+                    raise ZenMoneyClientException(f"status code is {response.status} with response error: {await response.text()}")
+                if response.content_type != "application/json":
+                    raise ZenMoneyClientException("Expected JSON object")
+
+                async for batch in parse_diff_stream(response.content.iter_chunked(STREAM_CHUNK_SIZE), batch_size, timings):
+                    yield batch
 
     @staticmethod
     async def try_parse_error_from_response(response: aio_request.Response) -> str | None:
@@ -84,6 +184,11 @@ class ZenMoneyClient:
         return text
 
 
+def _dump_diff_request(diff: ZenmoneyDiff) -> bytes:
+    request_data = mr.dump(diff_to_zm_diff(diff), naming_case=mr.CAMEL_CASE)
+    return json.dumps(request_data, default=_json_default, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
 def _json_default(obj: object) -> float:
     """Convert Decimal to float for JSON serialization"""
     if isinstance(obj, decimal.Decimal):
@@ -203,9 +203,9 @@ def _normalize_account_dict(data: dict[str, object]) -> None:
 
 def _normalize_transaction_dict(data: dict[str, object]) -> None:
     if data.get("outcome_account") is None:
-        data["outcome_account"] = _DEFAULT_OUTCOME_ACCOUNT_ID
+        data["outcome_account"] = DEFAULT_OUTCOME_ACCOUNT_ID
     if data.get("tags") is None:
         data["tags"] = []
 
 
-_DEFAULT_OUTCOME_ACCOUNT_ID = uuid.UUID("5c6d2ce9-4d67-450c-b40d-28a7dea1e20e")
+DEFAULT_OUTCOME_ACCOUNT_ID = uuid.UUID("5c6d2ce9-4d67-450c-b40d-28a7dea1e20e")
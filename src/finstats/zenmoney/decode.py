@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import datetime
+import decimal
+import uuid
+from collections.abc import Callable
+from typing import Any
+
+from finstats.domain import Account, Company, Country, Instrument, Merchant, Tag, Transaction, User, ZenmoneyDiff
+from finstats.zenmoney.convert import DEFAULT_OUTCOME_ACCOUNT_ID
+from finstats.zenmoney.models import ZenMoneyClientException
+
+# the same precision as marshmallow gives to decimals of Zm* models
+_CENTS = decimal.Decimal("0.01")
+
+type Decoder[T] = Callable[[dict[str, Any]], T]
+
+
+def decode_diff(data: dict[str, Any]) -> ZenmoneyDiff:
+    """Builds a diff straight from the parsed JSON of a diff response, entities of unknown types are skipped."""
+    server_timestamp = data.get("serverTimestamp")
+    if not isinstance(server_timestamp, int):
+        raise ZenMoneyClientException(f"Expected integer serverTimestamp, got {server_timestamp!r}")
+
+    return ZenmoneyDiff(
+        server_timestamp=server_timestamp,
+        accounts=decode_entities("account", data.get("account") or []),
+        companies=decode_entities("company", data.get("company") or []),
+        countries=decode_entities("country", data.get("country") or []),
+        instruments=decode_entities("instrument", data.get("instrument") or []),
+        merchants=decode_entities("merchant", data.get("merchant") or []),
+        tags=decode_entities("tag", data.get("tag") or []),
+        transactions=decode_entities("transaction", data.get("transaction") or []),
+        users=decode_entities("user", data.get("user") or []),
+    )
+
+
+def decode_entities(key: str, items: list[Any]) -> list[Any]:
+    """Decodes items of the `key` array of a diff response, e.g. `transaction`, into domain entities."""
+    decode = DECODERS[key]
+    try:
+        return [decode(item) for item in items]
+    except (KeyError, TypeError, ValueError, ArithmeticError) as e:
+        raise ZenMoneyClientException(f"Invalid {key!r} in diff: {e!r}") from e
+
+
+def decode_account(data: dict[str, Any]) -> Account:
+    return Account(
+        id=uuid.UUID(data["id"]),
+        changed=_timestamp(data["changed"]),
+        user=data["user"],
+        instrument=data["instrument"],
+        title=data["title"],
+        role=data.get("role"),
+        company=data.get("company"),
+        type=data["type"],
+        sync_id=data.get("syncID") or [],
+        balance=_decimal(data["balance"]),
+        start_balance=_decimal(data["startBalance"]),
+        credit_limit=_decimal(data["creditLimit"]),
+        in_balance=data["inBalance"],
+        savings=data["savings"],
+        enable_correction=data["enableCorrection"],
+        enable_sms=data["enableSMS"],
+        archive=data["archive"],
+        private=data["private"],
+        capitalization=data.get("capitalization"),
+        percent=_optional(_decimal, data.get("percent")),
+        start_date=_optional(_timestamp, data.get("startDate")),
+        end_date_offset=data.get("endDateOffset"),
+        end_date_offset_interval=data.get("endDateOffsetInterval"),
+        payoff_step=data.get("payoffStep"),
+        payoff_interval=data.get("payoffInterval"),
+        balance_correction_type=data["balanceCorrectionType"],
+    )
+
+
+def decode_transaction(data: dict[str, Any]) -> Transaction:
+    outcome_account = data.get("outcomeAccount")
+    return Transaction(
+        id=uuid.UUID(data["id"]),
+        changed=_timestamp(data["changed"]),
+        created=_timestamp(data["created"]),
+        user=data["user"],
+        deleted=data["deleted"],
+        hold=data.get("hold"),
+        viewed=data["viewed"],
+        qr_code=data.get("qrCode"),
+        income_bank=data.get("incomeBankID"),
+        income_instrument=data["incomeInstrument"],
+        income_account=uuid.UUID(data["incomeAccount"]),
+        income=_decimal(data["income"]),
+        outcome_bank=data.get("outcomeBankID"),
+        outcome_instrument=data["outcomeInstrument"],
+        outcome_account=DEFAULT_OUTCOME_ACCOUNT_ID if outcome_account is None else uuid.UUID(outcome_account),
+        outcome=_decimal(data["outcome"]),
+        merchant=_optional(uuid.UUID, data.get("merchant")),
+        payee=data.get("payee"),
+        original_payee=data.get("originalPayee"),
+        comment=data.get("comment"),
+        date=datetime.date.fromisoformat(data["date"]),
+        mcc=data.get("mcc"),
+        reminder_marker=_optional(uuid.UUID, data.get("reminderMarker")),
+        op_income=_optional(_decimal, data.get("opIncome")),
+        op_income_instrument=data.get("opIncomeInstrument"),
+        op_outcome=_optional(_decimal, data.get("opOutcome")),
+        op_outcome_instrument=data.get("opOutcomeInstrument"),
+        latitude=_optional(float, data.get("latitude")),
+        longitude=_optional(float, data.get("longitude")),
+        source=data.get("source"),
+        tags=[uuid.UUID(tag) for tag in data.get("tag") or ()],
+    )
+
+
+def decode_user(data: dict[str, Any]) -> User:
+    return User(
+        id=data["id"],
+        changed=_timestamp(data["changed"]),
+        currency=data["currency"],
+        parent=data.get("parent"),
+        country=data.get("country"),
+        country_code=data["countryCode"],
+        email=data.get("email"),
+        login=data.get("login"),
+        month_start_day=data["monthStartDay"],
+        is_forecast_enabled=data["isForecastEnabled"],
+        plan_balance_mode=data["planBalanceMode"],
+        plan_settings=data["planSettings"],
+        paid_till=_timestamp(data["paidTill"]),
+        subscription=data.get("subscription"),
+        subscription_renewal_date=data.get("subscriptionRenewalDate"),
+    )
+
+
+def decode_tag(data: dict[str, Any]) -> Tag:
+    return Tag(
+        id=uuid.UUID(data["id"]),
+        changed=_timestamp(data["changed"]),
+        user=data["user"],
+        title=data["title"],
+        parent=_optional(uuid.UUID, data.get("parent")),
+        icon=data.get("icon"),
+        static_id=data.get("staticId"),
+        picture=data.get("picture"),
+        color=data.get("color"),
+        show_income=data["showIncome"],
+        show_outcome=data["showOutcome"],
+        budget_income=data["budgetIncome"],
+        budget_outcome=data["budgetOutcome"],
+        required=data.get("required"),
+        archive=data["archive"],
+    )
+
+
+def decode_instrument(data: dict[str, Any]) -> Instrument:
+    return Instrument(
+        id=data["id"],
+        changed=_timestamp(data["changed"]),
+        title=data["title"],
+        short_title=data["shortTitle"],
+        symbol=data["symbol"],
+        rate=_number(data["rate"]),
+    )
+
+
+def decode_country(data: dict[str, Any]) -> Country:
+    return Country(id=data["id"], title=data["title"], currency=data["currency"], domain=data.get("domain"))
+
+
+def decode_merchant(data: dict[str, Any]) -> Merchant:
+    return Merchant(id=uuid.UUID(data["id"]), changed=_timestamp(data["changed"]), user=data["user"], title=data["title"])
+
+
+def decode_company(data: dict[str, Any]) -> Company:
+    return Company(
+        id=data["id"],
+        changed=_timestamp(data["changed"]),
+        title=data["title"],
+        full_title=data.get("fullTitle"),
+        www=data.get("www"),
+        country=data.get("country"),
+        country_code=data.get("countryCode"),
+        deleted=data["deleted"],
+    )
+
+
+DECODERS: dict[str, Decoder[Any]] = {
+    "account": decode_account,
+    "company": decode_company,
+    "country": decode_country,
+    "instrument": decode_instrument,
+    "merchant": decode_merchant,
+    "tag": decode_tag,
+    "transaction": decode_transaction,
+    "user": decode_user,
+}
+
+
+def _timestamp(value: int | float | decimal.Decimal) -> datetime.datetime:
+    return datetime.datetime.fromtimestamp(float(value), datetime.UTC)
+
+
+def _decimal(value: int | str | decimal.Decimal) -> decimal.Decimal:
+    return _number(value).quantize(_CENTS)
+
+
+def _number(value: int | str | decimal.Decimal) -> decimal.Decimal:
+    # like marshmallow, which goes through str, so floats keep their shortest representation
+    return value if type(value) is decimal.Decimal else decimal.Decimal(str(value))
+
+
+def _optional[V, T](parse: Callable[[V], T], value: V | None) -> T | None:
+    return None if value is None else parse(value)
@@ -28,6 +28,16 @@ class ZenMoneyClientAuthException(ZenMoneyClientException):
     pass
 
 
+@dataclasses.dataclass(slots=True)
+class DiffTimings:
+    """Filled by the client while it fetches a diff, all durations are in seconds."""
+
+    network_seconds: float = 0.0
+    decode_seconds: float = 0.0
+    convert_seconds: float = 0.0
+    payload_bytes: int = 0
+
+
 @dataclasses.dataclass(frozen=True, slots=True)
 class ZmDiffRequest:
     server_timestamp: Annotated[int, mr.meta(name="serverTimestamp")]
@@ -159,7 +169,8 @@ class ZmInstrument:
     title: str
     short_title: str
     symbol: str
-    rate: decimal.Decimal
+    # rates of weak currencies are fractions of a kopeck, rounding them to cents breaks conversion
+    rate: Annotated[decimal.Decimal, mr.decimal_meta(places=None)]
 
 
 @dataclasses.dataclass(frozen=True, slots=True, kw_only=True)
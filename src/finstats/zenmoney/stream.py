@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import codecs
+import decimal
+import json
+import re
+import time
+from collections.abc import AsyncIterator
+from typing import Any
+
+from finstats.domain import ZenmoneyDiff
+from finstats.zenmoney.decode import decode_entities
+from finstats.zenmoney.models import DiffTimings, ZenMoneyClientException
+
+_DECODER = json.JSONDecoder(parse_float=decimal.Decimal)
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_AFTER_NUMBER = re.compile(r"[ \t\n\r,\]}]")
+
+
+async def parse_diff_stream(
+    chunks: AsyncIterator[bytes],
+    batch_size: int,
+    timings: DiffTimings | None = None,
+) -> AsyncIterator[ZenmoneyDiff]:
+    """Parses diff response incrementally and yields diffs with at most `batch_size` entities of one type each.
+
+    The last yielded diff carries no entities, only the server timestamp, earlier ones have `server_timestamp=0`.
+    Time spent by the consumer between batches is not accounted in `timings`.
+    """
+    if timings is None:
+        timings = DiffTimings()
+    network_before, convert_before = timings.network_seconds, timings.convert_seconds
+    active_seconds = 0.0
+    resumed = time.perf_counter()
+
+    reader = JsonStreamReader(_timed_chunks(chunks, timings))
+    server_timestamp: object = None
+    async for key in reader.iter_object_keys():
+        field = _STREAM_FIELDS.get(key)
+        if field is None or not await reader.is_array():
+            if key == "serverTimestamp":
+                server_timestamp = await reader.read_value()
+            elif key == "error":
+                raise ZenMoneyClientException(f"Server method 'diff' returned error: {await reader.read_value()!r}")
+            else:
+                await reader.skip_value()
+            continue
+
+        batch: list[dict[str, Any]] = []
+        async for item in reader.iter_array():
+            if not isinstance(item, dict):
+                raise ZenMoneyClientException(f"Expected JSON object in {key!r}, got {item!r}")
+            batch.append(item)
+            if len(batch) >= batch_size or not await reader.has_next_item():
+                diff = _to_diff(key, field, batch, timings)
+                batch = []
+                active_seconds += time.perf_counter() - resumed
+                yield diff
+                resumed = time.perf_counter()
+
+    if not isinstance(server_timestamp, int):
+        raise ZenMoneyClientException(f"Expected integer serverTimestamp, got {server_timestamp!r}")
+
+    active_seconds += time.perf_counter() - resumed
+    network_seconds = timings.network_seconds - network_before
+    convert_seconds = timings.convert_seconds - convert_before
+    timings.decode_seconds += max(active_seconds - network_seconds - convert_seconds, 0.0)
+    yield ZenmoneyDiff(server_timestamp=server_timestamp)
+
+
+async def _timed_chunks(chunks: AsyncIterator[bytes], timings: DiffTimings) -> AsyncIterator[bytes]:
+    while True:
+        started = time.perf_counter()
+        try:
+            chunk = await anext(chunks)
+        except StopAsyncIteration:
+            timings.network_seconds += time.perf_counter() - started
+            return
+        timings.network_seconds += time.perf_counter() - started
+        timings.payload_bytes += len(chunk)
+        yield chunk
+
+
+class JsonStreamReader:
+    """Incremental reader of a JSON document arriving in chunks.
+
+    Only the structure needed to walk a top-level object and its arrays is parsed by hand,
+    every scalar, array element or nested object is decoded with `json` as soon as it is complete,
+    so memory is bounded by the largest single element, not by the whole document.
+    """
+
+    __slots__ = (
+        "__buffer",
+        "__chunks",
+        "__eof",
+        "__position",
+        "__text_decoder",
+    )
+
+    def __init__(self, chunks: AsyncIterator[bytes]) -> None:
+        self.__chunks = chunks
+        self.__text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self.__buffer = ""
+        self.__position = 0
+        self.__eof = False
+
+    async def iter_object_keys(self) -> AsyncIterator[str]:
+        """Yields keys of the object at the current position, the caller has to read the value of every key."""
+        await self.__expect("{")
+        if await self.__peek() == "}":
+            self.__position += 1
+            return
+
+        while True:
+            key = await self.read_value()
+            if not isinstance(key, str):
+                raise ZenMoneyClientException(f"Expected JSON object key, got {key!r}")
+            await self.__expect(":")
+            yield key
+
+            match await self.__peek():
+                case ",":
+                    self.__position += 1
+                case "}":
+                    self.__position += 1
+                    return
+                case char:
+                    raise ZenMoneyClientException(f"Expected ',' or '}}' in JSON object, got {char!r}")
+
+    async def is_array(self) -> bool:
+        return await self.__peek() == "["
+
+    async def iter_array(self) -> AsyncIterator[object]:
+        await self.__expect("[")
+        if await self.__peek() == "]":
+            self.__position += 1
+            return
+
+        while True:
+            yield await self.read_value()
+
+            match await self.__peek():
+                case ",":
+                    self.__position += 1
+                case "]":
+                    self.__position += 1
+                    return
+                case char:
+                    raise ZenMoneyClientException(f"Expected ',' or ']' in JSON array, got {char!r}")
+
+    async def read_value(self) -> object:
+        await self.__peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.__buffer, self.__position)
+            except json.JSONDecodeError as e:
+                if await self.__fill():
+                    continue
+                raise ZenMoneyClientException(f"Invalid JSON: {e}") from e
+
+            # a number may continue in the next chunk even when its start is a valid number, like "12." of "12.5"
+            if _is_number(value) and not _AFTER_NUMBER.match(self.__buffer, end) and await self.__fill():
+                continue
+
+            self.__position = end
+            return value
+
+    async def has_next_item(self) -> bool:
+        """Whether the array being iterated has more items, the reader should stand right after an item."""
+        return await self.__peek() == ","
+
+    async def skip_value(self) -> None:
+        if await self.is_array():
+            async for _ in self.iter_array():
+                pass
+        else:
+            await self.read_value()
+
+    async def __expect(self, char: str) -> None:
+        actual = await self.__peek()
+        if actual != char:
+            raise ZenMoneyClientException(f"Expected {char!r} in JSON, got {actual or 'end of data'!r}")
+        self.__position += 1
+
+    async def __peek(self) -> str:
+        while True:
+            match = _WHITESPACE.match(self.__buffer, self.__position)
+            self.__position = match.end() if match is not None else self.__position
+            if self.__position < len(self.__buffer):
+                return self.__buffer[self.__position]
+            if not await self.__fill():
+                return ""
+
+    async def __fill(self) -> bool:
+        if self.__eof:
+            return False
+
+        try:
+            chunk = await anext(self.__chunks)
+        except StopAsyncIteration:
+            self.__eof = True
+            text = self.__text_decoder.decode(b"", final=True)
+        else:
+            text = self.__text_decoder.decode(chunk)
+
+        self.__buffer = self.__buffer[self.__position :] + text
+        self.__position = 0
+        return True
+
+
+def _is_number(value: object) -> bool:
+    return isinstance(value, int | float | decimal.Decimal) and not isinstance(value, bool)
+
+
+def _to_diff(key: str, field: str, items: list[dict[str, Any]], timings: DiffTimings) -> ZenmoneyDiff:
+    started = time.perf_counter()
+    diff = ZenmoneyDiff(server_timestamp=0, **{field: decode_entities(key, items)})
+    timings.convert_seconds += time.perf_counter() - started
+    return diff
+
+
+# keys of entity arrays in the response and fields of the diff they go to
+_STREAM_FIELDS: dict[str, str] = {
+    "account": "accounts",
+    "company": "companies",
+    "country": "countries",
+    "instrument": "instruments",
+    "merchant": "merchants",
+    "tag": "tags",
+    "transaction": "transactions",
+    "user": "users",
+}
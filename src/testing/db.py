@@ -0,0 +1,21 @@
+import contextlib
+from collections.abc import Generator
+from typing import Any
+
+import sqlalchemy as sa
+import sqlalchemy.event as sa_event
+
+
+@contextlib.contextmanager
+def capture_statements() -> Generator[list[tuple[str, Any]]]:
+    """Collects statements with their parameters executed by any engine while the context is open."""
+    statements: list[tuple[str, Any]] = []
+
+    def before_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:  # noqa: ANN401
+        statements.append((statement, parameters))
+
+    sa_event.listen(sa.Engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        sa_event.remove(sa.Engine, "before_cursor_execute", before_cursor_execute)
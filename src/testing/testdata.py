@@ -218,7 +218,7 @@ InstrumentBYR = domain.Instrument(
     title="Белорусский рубль (до 2016 г.)",
     short_title="BYR",
     symbol="BYR",
-    rate=decimal.Decimal("0.00"),
+    rate=decimal.Decimal("0.0034"),
 )
 InstrumentAZN = domain.Instrument(
     id=10538,
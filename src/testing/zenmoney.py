@@ -1,11 +1,32 @@
+import asyncio
+import dataclasses
+from collections.abc import AsyncIterator
+
 from finstats.domain import ZenmoneyDiff
-from finstats.zenmoney import ZenMoneyClient, ZenMoneyClientAuthException, ZenMoneyClientException
+from finstats.zenmoney import DiffTimings, ZenMoneyClient, ZenMoneyClientAuthException, ZenMoneyClientException
 
 
 class FakeZenMoneyClient(ZenMoneyClient):
     __response_code: int = 200
+    __sync_diff_calls: int = 0
+    __delay_seconds: float = 0
+    __diff: ZenmoneyDiff | None = None
+    __timed_out_calls: int = 0
 
-    async def sync_diff(self, token: str, diff: ZenmoneyDiff, timeout_seconds: int = 20) -> ZenmoneyDiff:
+    async def sync_diff(
+        self,
+        token: str,
+        diff: ZenmoneyDiff,
+        timeout_seconds: int = 20,
+        timings: DiffTimings | None = None,
+    ) -> ZenmoneyDiff:
+        self.__sync_diff_calls += 1
+        if self.__delay_seconds > 0:
+            await asyncio.sleep(self.__delay_seconds)
+        if self.__timed_out_calls > 0:
+            # what the client raises when the deadline expires
+            self.__timed_out_calls -= 1
+            raise ZenMoneyClientException("status code is 408")
         if self.__response_code != 200:
             exc_str = f"status code is {self.__response_code}"
             raise ZenMoneyClientException(exc_str)
@@ -13,6 +34,9 @@ class FakeZenMoneyClient(ZenMoneyClient):
         if token != "ok":
             raise ZenMoneyClientAuthException("Invalid token")
 
+        if self.__diff is not None:
+            return self.__diff
+
         return ZenmoneyDiff(
             server_timestamp=diff.server_timestamp,
             transactions=[],
@@ -25,8 +49,42 @@ class FakeZenMoneyClient(ZenMoneyClient):
             users=[],
         )
 
+    async def stream_diff(
+        self,
+        token: str,
+        diff: ZenmoneyDiff,
+        batch_size: int,
+        timeout_seconds: int = 20,
+        timings: DiffTimings | None = None,
+    ) -> AsyncIterator[ZenmoneyDiff]:
+        result = await self.sync_diff(token, diff, timeout_seconds)
+        for field in dataclasses.fields(result):
+            items = getattr(result, field.name)
+            if not isinstance(items, list):
+                continue
+            for start in range(0, len(items), batch_size):
+                yield ZenmoneyDiff(server_timestamp=0, **{field.name: items[start : start + batch_size]})
+        yield ZenmoneyDiff(server_timestamp=result.server_timestamp)
+
     def set_response_code(self, code: int) -> None:
         self.__response_code = code
 
+    def set_delay(self, seconds: float) -> None:
+        self.__delay_seconds = seconds
+
+    def set_diff(self, diff: ZenmoneyDiff) -> None:
+        self.__diff = diff
+
+    def set_timed_out_calls(self, count: int) -> None:
+        self.__timed_out_calls = count
+
+    @property
+    def sync_diff_calls(self) -> int:
+        return self.__sync_diff_calls
+
     def cleanup(self) -> None:
         self.__response_code: int = 200
+        self.__sync_diff_calls: int = 0
+        self.__delay_seconds: float = 0
+        self.__diff: ZenmoneyDiff | None = None
+        self.__timed_out_calls: int = 0
@@ -6,7 +6,7 @@ import pytest_pg
 import sqlalchemy as sa
 
 from finstats.container import Container
-from finstats.store import ConnectionScope, configure_container, run_migrations
+from finstats.store import ConnectionScope, ReferenceDataCache, TransactionCountCache, configure_container, run_migrations
 
 
 @pytest.fixture(scope="session")
@@ -33,10 +33,14 @@ def connection(container: Container) -> ConnectionScope:
 
 
 @pytest_asyncio.fixture(scope="function", loop_scope="session", autouse=True)
-async def migrate_database(request: pytest.FixtureRequest, connection: ConnectionScope, pg_url_sync: str) -> None:
+async def migrate_database(request: pytest.FixtureRequest, container: Container, connection: ConnectionScope, pg_url_sync: str) -> None:
     if request.node.get_closest_marker("no_migrations"):
         return
 
+    # the database is recreated behind the repositories back
+    container.resolve(TransactionCountCache).clear()
+    container.resolve(ReferenceDataCache).clear()
+
     async with connection.acquire() as conn:
         await conn.execute(sa.text("DROP SCHEMA public CASCADE"))
         await conn.execute(sa.text("CREATE SCHEMA public"))
@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+from finstats.daemons import AdaptiveSchedule
+from finstats.daemons.schedule import run_adaptively
+
+pytestmark = pytest.mark.no_migrations()
+
+
+def test_schedule_should_back_off_exponentially_on_idle_runs() -> None:
+    schedule = AdaptiveSchedule(min_seconds=10, max_seconds=60, jitter=0)
+    assert [schedule.on_success(has_work=False) for _ in range(4)] == [20, 40, 60, 60]
+
+
+def test_schedule_should_back_off_on_failures() -> None:
+    schedule = AdaptiveSchedule(min_seconds=10, max_seconds=100, backoff_factor=3, jitter=0)
+    assert schedule.on_failure() == 30
+    assert schedule.on_failure() == 90
+
+
+def test_schedule_should_reset_to_min_after_run_with_work() -> None:
+    schedule = AdaptiveSchedule(min_seconds=10, max_seconds=60, jitter=0)
+    schedule.on_failure()
+    schedule.on_success(has_work=False)
+    assert schedule.on_success(has_work=True) == 10
+
+
+@pytest.mark.parametrize("random_value, expected", [(0.0, 36.0), (0.5, 40.0), (1.0, 44.0)])
+def test_schedule_should_add_jitter(random_value: float, expected: float) -> None:
+    schedule = AdaptiveSchedule(min_seconds=10, max_seconds=60, jitter=0.1, random_func=lambda: random_value)
+    schedule.on_success(has_work=False)
+    assert schedule.on_success(has_work=False) == pytest.approx(expected)
+
+
+def test_schedule_jitter_should_stay_within_bounds() -> None:
+    schedule = AdaptiveSchedule(min_seconds=10, max_seconds=20, jitter=0.5, random_func=lambda: 0.0)
+    assert schedule.on_success(has_work=True) == 10
+    schedule = AdaptiveSchedule(min_seconds=10, max_seconds=20, jitter=0.5, random_func=lambda: 1.0)
+    assert schedule.on_success(has_work=False) == 20
+
+
+def test_schedule_with_invalid_bounds_should_raise() -> None:
+    with pytest.raises(ValueError, match="max_seconds"):
+        AdaptiveSchedule(min_seconds=10, max_seconds=5)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_run_adaptively_should_not_overlap_runs() -> None:
+    running = 0
+    max_running = 0
+    runs = 0
+
+    async def func() -> bool:
+        nonlocal running, max_running, runs
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+        runs += 1
+        if runs % 2 == 0:
+            raise RuntimeError("upstream failed")
+        return True
+
+    job = run_adaptively(func, schedule=AdaptiveSchedule(min_seconds=0.001, max_seconds=0.002), name="test")
+    await asyncio.sleep(0.2)
+    await job.close()
+
+    assert runs >= 3
+    assert max_running == 1
@@ -0,0 +1,59 @@
+import pytest
+
+from finstats.metrics import Counter, Gauge, Histogram, render_metrics
+
+pytestmark = pytest.mark.no_migrations()
+
+
+def test_counter_should_render_labeled_samples() -> None:
+    counter = Counter("requests_total", "Requests.", ["route"])
+    counter.inc(route="/b")
+    counter.inc(2, route="/a")
+    counter.inc(route="/b")
+
+    assert render_metrics([counter]) == (
+        '# HELP requests_total Requests.\n# TYPE requests_total counter\nrequests_total{route="/a"} 2\nrequests_total{route="/b"} 2\n'
+    )
+
+
+def test_counter_should_not_decrease() -> None:
+    with pytest.raises(ValueError):
+        Counter("requests_total", "Requests.").inc(-1)
+
+
+def test_metric_with_wrong_labels_should_raise() -> None:
+    with pytest.raises(ValueError):
+        Gauge("in_flight", "In flight.", ["route"]).inc(method="GET")
+
+
+def test_gauge_should_render_without_labels() -> None:
+    gauge = Gauge("in_flight", "In flight.")
+    gauge.inc()
+    gauge.inc()
+    gauge.dec()
+    gauge.set(0.5)
+
+    assert render_metrics([gauge]).splitlines()[-1] == "in_flight 0.5"
+
+
+def test_histogram_should_render_cumulative_buckets() -> None:
+    histogram = Histogram("latency_seconds", "Latency.", ["route"], buckets=[0.1, 1])
+    histogram.observe(0.05, route="/a")
+    histogram.observe(0.1, route="/a")
+    histogram.observe(3, route="/a")
+
+    assert render_metrics([histogram]).splitlines()[2:] == [
+        'latency_seconds_bucket{route="/a",le="0.1"} 2',
+        'latency_seconds_bucket{route="/a",le="1"} 2',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 3',
+        'latency_seconds_sum{route="/a"} 3.15',
+        'latency_seconds_count{route="/a"} 3',
+    ]
+    assert histogram.get_count(route="/a") == 3
+
+
+def test_label_values_should_be_escaped() -> None:
+    counter = Counter("errors_total", "Errors.", ["error"])
+    counter.inc(error='say "hi"\\\n')
+
+    assert render_metrics([counter]).splitlines()[-1] == 'errors_total{error="say \\"hi\\"\\\\\\n"} 1'
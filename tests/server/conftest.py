@@ -7,7 +7,9 @@ from pytest_aiohttp import AiohttpClient
 from client.client import FinstatsClient
 from finstats.application import Application
 from finstats.container import Container
+from finstats.server.auth import TokenValidationCache
 from finstats.store import AccountsRepository, InstrumentsRepository, MerchantsRepository, TagsRepository, TransactionsRepository
+from finstats.syncer import Syncer, SyncMetrics
 from finstats.zenmoney import ZenMoneyClient
 from testing import testdata
 from testing.testapp import TestApplication
@@ -25,6 +27,9 @@ async def zm_client(container: Container) -> FakeZenMoneyClient:
 
 @pytest_asyncio.fixture(scope="session", loop_scope="session")
 async def app(container: Container) -> Application:
+    # registered by MyApplication._configure_context, which TestApplication skips; the database and the client come from other fixtures
+    container.register(SyncMetrics)
+    container.register(Syncer)
     app = TestApplication(container)
     app.initialize()
     return app
@@ -38,8 +43,9 @@ async def client(aiohttp_client: AiohttpClient, app: Application) -> AsyncIterat
 
 
 @pytest_asyncio.fixture(scope="function", loop_scope="session", autouse=True)
-async def cleanup_fakes(zm_client: FakeZenMoneyClient) -> None:
+async def cleanup_fakes(zm_client: FakeZenMoneyClient, container: Container, app: Application) -> None:
     zm_client.cleanup()
+    container.resolve(TokenValidationCache).clear()
 
 
 @pytest_asyncio.fixture(scope="function", loop_scope="session", autouse=True)
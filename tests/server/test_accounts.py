@@ -1,8 +1,12 @@
+import dataclasses
+
 import pytest
 
 from client import AccountModel
 from client.client import FinstatsClient
-from finstats.domain import Account
+from finstats.container import Container
+from finstats.domain import Account, ZenmoneyDiff
+from finstats.syncer import Syncer
 from testing import testdata
 
 pytestmark = pytest.mark.asyncio(loop_scope="session")
@@ -44,6 +48,16 @@ async def test_get_accounts_with_archive_and_debts_should_return_archived_debts(
         _assert_account_matches(expected[i], actual_account)
 
 
+async def test_get_accounts_should_return_account_changed_by_sync(container: Container, client: FinstatsClient) -> None:
+    await client.get_accounts()
+    renamed = dataclasses.replace(testdata.CardAccount, title="Renamed")
+
+    await container.resolve(Syncer).save_diff(ZenmoneyDiff(server_timestamp=100, accounts=[renamed]))
+
+    actual = {account.id: account for account in await client.get_accounts()}
+    _assert_account_matches(renamed, actual[renamed.id])
+
+
 def _assert_account_matches(expected: Account, actual: AccountModel) -> None:
     assert expected.id == actual.id
     assert expected.changed == actual.changed
@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+
+from finstats.server.auth import SingleFlight, TokenValidationCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_cache_should_return_none_for_unknown_token() -> None:
+    cache = TokenValidationCache(max_size=10, positive_ttl_seconds=60, negative_ttl_seconds=5)
+    assert cache.get("ok") is None
+    assert cache.misses == 1
+    assert cache.hits == 0
+
+
+def test_cache_should_expire_entries_by_ttl() -> None:
+    clock = FakeClock()
+    cache = TokenValidationCache(max_size=10, positive_ttl_seconds=60, negative_ttl_seconds=5, clock=clock)
+    cache.put("ok", True)
+    cache.put("error", False)
+
+    clock.now = 4
+    assert cache.get("ok") is True
+    assert cache.get("error") is False
+
+    clock.now = 5
+    assert cache.get("ok") is True
+    assert cache.get("error") is None
+
+    clock.now = 60
+    assert cache.get("ok") is None
+    assert cache.hits == 3
+    assert cache.misses == 2
+
+
+def test_cache_should_evict_least_recently_used() -> None:
+    cache = TokenValidationCache(max_size=2, positive_ttl_seconds=60, negative_ttl_seconds=5)
+    cache.put("first", True)
+    cache.put("second", True)
+    assert cache.get("first") is True
+
+    cache.put("third", True)
+    assert len(cache) == 2
+    assert cache.get("second") is None
+    assert cache.get("first") is True
+    assert cache.get("third") is True
+
+
+def test_cache_with_zero_ttl_should_not_store() -> None:
+    cache = TokenValidationCache(max_size=10, positive_ttl_seconds=60, negative_ttl_seconds=0)
+    cache.put("error", False)
+    assert cache.get("error") is None
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_single_flight_should_share_call_between_concurrent_waiters() -> None:
+    single_flight = SingleFlight[int]()
+    calls = 0
+    release = asyncio.Event()
+
+    async def fn() -> int:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return 42
+
+    waiters = [asyncio.create_task(single_flight.do("ok", fn)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    assert await asyncio.gather(*waiters) == [42, 42, 42]
+    assert calls == 1
+    assert len(single_flight) == 0
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_single_flight_waiter_cancellation_should_not_cancel_shared_call() -> None:
+    single_flight = SingleFlight[int]()
+    release = asyncio.Event()
+
+    async def fn() -> int:
+        await release.wait()
+        return 42
+
+    first = asyncio.create_task(single_flight.do("ok", fn))
+    second = asyncio.create_task(single_flight.do("ok", fn))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await second == 42
+    assert first.cancelled()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_single_flight_should_propagate_error_to_all_waiters() -> None:
+    single_flight = SingleFlight[int]()
+
+    async def fn() -> int:
+        await asyncio.sleep(0)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(single_flight.do("ok", fn), single_flight.do("ok", fn), return_exceptions=True)
+    assert all(isinstance(r, ValueError) for r in results)
+    assert len(single_flight) == 0
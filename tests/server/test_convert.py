@@ -0,0 +1,66 @@
+import dataclasses
+from typing import Any
+
+from client import AccountModel, CompanyModel, CountryModel, InstrumentModel, MerchantModel, TagModel, TransactionModel, TransactionType, UserModel
+from finstats.server.convert import (
+    account_model_to_account,
+    account_to_account_model,
+    company_to_company_model,
+    country_to_country_model,
+    instrument_to_instrument_model,
+    merchant_to_merchant_model,
+    tag_model_to_tag,
+    tag_to_tag_model,
+    transaction_model_to_transaction,
+    transaction_to_transaction_model,
+    user_to_user_model,
+)
+from testing import testdata
+
+
+def _by_asdict[T](obj: object, target: type[T], **kwargs: object) -> T:
+    allowed = {field.name for field in dataclasses.fields(target)}  # ty:ignore[invalid-argument-type]
+    data = {key: value for key, value in dataclasses.asdict(obj).items() if key in allowed}  # ty:ignore[invalid-argument-type]
+    return target(**data, **kwargs)
+
+
+def test_converters_should_match_asdict() -> None:
+    for account in testdata.TestAccounts:
+        assert account_to_account_model(account) == _by_asdict(account, AccountModel)
+    for tag in testdata.TestTags:
+        assert tag_to_tag_model(tag, children_ids=[tag.id]) == _by_asdict(tag, TagModel, children=[tag.id])
+    for instrument in testdata.TestInstruments:
+        assert instrument_to_instrument_model(instrument) == _by_asdict(instrument, InstrumentModel)
+    for merchant in testdata.TestMerchants:
+        assert merchant_to_merchant_model(merchant) == _by_asdict(merchant, MerchantModel)
+    for company in testdata.TestCompanies:
+        assert company_to_company_model(company) == _by_asdict(company, CompanyModel)
+    for country in testdata.TestCountries:
+        assert country_to_country_model(country) == _by_asdict(country, CountryModel)
+    for user in testdata.TestUsers:
+        assert user_to_user_model(user) == _by_asdict(user, UserModel)
+
+
+def test_transaction_to_transaction_model_should_match_asdict() -> None:
+    titles: dict[str, Any] = {
+        "tags_titles": ["Salary"],
+        "income_instrument_title": "Russian Ruble",
+        "outcome_instrument_title": "Russian Ruble",
+        "income_account_title": "Card",
+        "outcome_account_title": "Card",
+        "merchant_title": None,
+        "transaction_type": TransactionType.Income,
+    }
+
+    for transaction in testdata.TestTransactions:
+        model = transaction_to_transaction_model(transaction, **titles)
+
+        assert model == _by_asdict(transaction, TransactionModel, **titles)
+        assert transaction_model_to_transaction(model) == transaction
+
+
+def test_model_to_domain_converters_should_roundtrip() -> None:
+    for account in testdata.TestAccounts:
+        assert account_model_to_account(account_to_account_model(account)) == account
+    for tag in testdata.TestTags:
+        assert tag_model_to_tag(tag_to_tag_model(tag, children_ids=[])) == tag
@@ -0,0 +1,28 @@
+import datetime
+import uuid
+
+import pytest
+
+from finstats.server.cursor import decode_transaction_cursor, encode_transaction_cursor
+from finstats.store import TransactionCursor
+
+pytestmark = pytest.mark.no_migrations()
+
+
+def test_transaction_cursor_should_round_trip() -> None:
+    cursor = TransactionCursor(
+        date=datetime.date(2026, 1, 20),
+        created=datetime.datetime(2026, 1, 20, 12, 30, 15, 123456, tzinfo=datetime.UTC),
+        id=uuid.uuid4(),
+    )
+
+    encoded = encode_transaction_cursor(cursor)
+
+    assert encoded.isascii() and "=" not in encoded
+    assert decode_transaction_cursor(encoded) == cursor
+
+
+@pytest.mark.parametrize("value", ["", "not a cursor", "WyIyMDI2LTAxLTIwIl0", "bnVsbA"])
+def test_invalid_transaction_cursor_should_raise(value: str) -> None:
+    with pytest.raises(ValueError, match="invalid cursor"):
+        decode_transaction_cursor(value)
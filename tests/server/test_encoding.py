@@ -0,0 +1,118 @@
+import dataclasses
+import datetime
+import decimal
+import uuid
+
+import pytest
+
+from client import ErrorResponse, TransactionType
+from client.account import GetAccountsResponse
+from client.health import HealthResponse
+from client.instrument import GetInstrumentsResponse
+from client.merchant import GetMerchantsResponse
+from client.stats import CategoryStatsModel, GetStatsByTagResponse, TagStatsModel
+from client.tag import GetTagsResponse
+from client.transaction import GetTransactionsResponse
+from finstats.models import CliException
+from finstats.server.convert import (
+    accounts_to_account_models,
+    instruments_to_instrument_models,
+    merchants_to_merchant_models,
+    tags_to_tag_models,
+    transaction_to_transaction_model,
+)
+from finstats.server.encoding import CompiledResponseEncoder, MrResponseEncoder, create_response_encoder
+from testing import testdata
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class _ResponseWithDict:
+    # dicts are not supported by the compiled encoder
+    values: dict[str, int]
+
+
+def _make_transactions_response() -> GetTransactionsResponse:
+    transactions = [
+        transaction_to_transaction_model(
+            transaction,
+            tags_titles=["Зарплата", 'quoted "title"\n'],
+            income_instrument_title="Russian Ruble",
+            outcome_instrument_title="€ Euro",
+            income_account_title="Card",
+            outcome_account_title="Cash",
+            merchant_title=None,
+            transaction_type=TransactionType.Income,
+            user_currency=testdata.InstrumentRUB.id,
+            income_in_user_currency=decimal.Decimal("1.005"),
+            outcome_in_user_currency=None,
+        )
+        for transaction in testdata.TestTransactions
+    ]
+    transactions.append(
+        dataclasses.replace(
+            transactions[0],
+            income=decimal.Decimal("-0.015"),
+            outcome=decimal.Decimal("1E+3"),
+            changed=datetime.datetime(2026, 1, 17, 12, 30, 0, 123456),
+            latitude=55.751244,
+            longitude=37,
+            hold=True,
+        )
+    )
+    return GetTransactionsResponse(limit=100, offset=0, total_count=None, transactions=transactions, next_cursor="abc")
+
+
+def _make_stats_response() -> GetStatsByTagResponse:
+    tag = TagStatsModel(
+        tag_id=None,
+        tag_title=None,
+        instrument=testdata.InstrumentRUB.id,
+        instrument_title="Russian Ruble",
+        income=decimal.Decimal("10.555"),
+        outcome=decimal.Decimal(0),
+        transactions_count=2,
+    )
+    category = CategoryStatsModel(
+        tag_id=uuid.UUID(int=1),
+        tag_title="Health",
+        instrument=testdata.InstrumentRUB.id,
+        instrument_title=None,
+        income=decimal.Decimal("10.555"),
+        outcome=decimal.Decimal(0),
+        transactions_count=2,
+        tags=[tag, tag],
+    )
+    return GetStatsByTagResponse(categories=[category, dataclasses.replace(category, tags=[])])
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        pytest.param(_make_transactions_response(), id="transactions"),
+        pytest.param(GetTransactionsResponse(limit=10, offset=0, total_count=0, transactions=[]), id="no transactions"),
+        pytest.param(GetAccountsResponse(accounts_to_account_models(testdata.TestAccounts)), id="accounts"),
+        pytest.param(GetTagsResponse(tags_to_tag_models(testdata.TestTags, children_ids_map={})), id="tags"),
+        pytest.param(GetInstrumentsResponse(instruments_to_instrument_models(testdata.TestInstruments)), id="instruments"),
+        pytest.param(GetMerchantsResponse(merchants_to_merchant_models(testdata.TestMerchants)), id="merchants"),
+        pytest.param(_make_stats_response(), id="stats"),
+        pytest.param(HealthResponse(api="ok", last_synced_timestamp="1700000000"), id="health"),
+        pytest.param(ErrorResponse('failed to parse "limit" \\ ошибка'), id="error"),
+        pytest.param(_ResponseWithDict({"b": 1, "a": 2}), id="fallback"),
+    ],
+)
+def test_compiled_encoder_should_write_the_same_bytes_as_mr(response: object) -> None:
+    assert CompiledResponseEncoder().encode(response) == MrResponseEncoder().encode(response)
+
+
+def test_compiled_encoder_should_reuse_encoders() -> None:
+    encoder = CompiledResponseEncoder()
+    response = _make_stats_response()
+
+    assert encoder.encode(response) == encoder.encode(response)
+
+
+def test_create_response_encoder() -> None:
+    assert isinstance(create_response_encoder("compiled"), CompiledResponseEncoder)
+    assert isinstance(create_response_encoder("mr"), MrResponseEncoder)
+    with pytest.raises(CliException):
+        create_response_encoder("orjson")
@@ -0,0 +1,28 @@
+import pytest
+
+from client.client import FinstatsClient
+from finstats.container import Container
+from finstats.server.http_metrics import HttpMetrics
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+
+async def test_metrics_should_expose_route_latency(container: Container, client: FinstatsClient) -> None:
+    request_seconds = container.resolve(HttpMetrics).request_seconds
+    before = request_seconds.get_count(method="GET", route="/api/v1/accounts", status="200")
+
+    await client.get_accounts()
+    text = await client.metrics()
+
+    assert request_seconds.get_count(method="GET", route="/api/v1/accounts", status="200") == before + 1
+    assert 'finstats_http_request_seconds_count{method="GET",route="/api/v1/accounts",status="200"}' in text
+    assert 'finstats_http_requests_in_flight{route="/metrics"} 1' in text
+
+
+async def test_metrics_should_expose_pool_and_sync_lag(client: FinstatsClient) -> None:
+    text = await client.metrics()
+
+    assert "# TYPE finstats_db_pool_acquire_seconds histogram" in text
+    assert "finstats_db_pool_checked_out " in text
+    assert "# TYPE finstats_sync_lag_seconds gauge" in text
+    assert "# TYPE finstats_zenmoney_request_seconds histogram" in text
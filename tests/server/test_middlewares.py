@@ -1,6 +1,12 @@
+import asyncio
+
 import pytest
 
 from client.client import FinstatsClient
+from finstats.container import Container
+from finstats.domain import ZenmoneyDiff
+from finstats.store import TimestampRepository, UsersRepository
+from finstats.syncer import Syncer
 from testing import testdata
 from testing.zenmoney import FakeZenMoneyClient
 
@@ -22,3 +28,82 @@ async def test_zm_client_raises_exception_should_return_500(zm_client: FakeZenMo
 
     with pytest.raises(Exception, match="status code is 500 with response error: Internal Server Error"):
         await client.get_transactions(token="error")
+
+
+async def test_repeated_requests_with_same_token_should_validate_once(zm_client: FakeZenMoneyClient, client: FinstatsClient) -> None:
+    await client.get_transactions()
+    await client.get_accounts()
+    await client.get_tags()
+    assert zm_client.sync_diff_calls == 1
+
+
+async def test_rejected_token_should_be_cached(zm_client: FakeZenMoneyClient, client: FinstatsClient) -> None:
+    for _ in range(2):
+        with pytest.raises(Exception, match="status code is 401 with response error: Invalid Authorization token"):
+            await client.get_transactions(token="error")
+    assert zm_client.sync_diff_calls == 1
+
+
+async def test_zm_client_error_should_not_be_cached(zm_client: FakeZenMoneyClient, client: FinstatsClient) -> None:
+    zm_client.set_response_code(408)
+    with pytest.raises(Exception, match="status code is 500 with response error: Internal Server Error"):
+        await client.get_transactions()
+    # the client retries the failed request by itself, every attempt checks the token again
+    failed_calls = zm_client.sync_diff_calls
+
+    zm_client.set_response_code(200)
+    response = await client.get_transactions()
+    assert response.total_count == len(testdata.TestTransactions)
+    assert zm_client.sync_diff_calls == failed_calls + 1
+
+
+async def test_concurrent_requests_with_same_token_should_share_validation(zm_client: FakeZenMoneyClient, client: FinstatsClient) -> None:
+    zm_client.set_delay(0.1)
+    await asyncio.gather(client.get_transactions(), client.get_accounts(), client.get_tags())
+    assert zm_client.sync_diff_calls == 1
+
+
+async def test_piggyback_auth_check_should_save_non_empty_diff(
+    monkeypatch: pytest.MonkeyPatch,
+    container: Container,
+    zm_client: FakeZenMoneyClient,
+    client: FinstatsClient,
+) -> None:
+    monkeypatch.setenv("AUTH_PIGGYBACK_SYNC", "1")
+    await container.resolve(TimestampRepository).save_last_timestamp(100)
+    zm_client.set_diff(ZenmoneyDiff(server_timestamp=200, users=[testdata.ActiveUser]))
+
+    await client.get_accounts()
+    await container.resolve(Syncer).wait_background_saves()
+
+    assert await container.resolve(TimestampRepository).get_last_timestamp() == 200
+    assert await container.resolve(UsersRepository).get_user() == testdata.ActiveUser
+
+
+async def test_piggyback_sync_timeout_should_fall_back_to_token_check(
+    monkeypatch: pytest.MonkeyPatch,
+    container: Container,
+    zm_client: FakeZenMoneyClient,
+    client: FinstatsClient,
+) -> None:
+    monkeypatch.setenv("AUTH_PIGGYBACK_SYNC", "1")
+    await container.resolve(TimestampRepository).save_last_timestamp(100)
+    zm_client.set_diff(ZenmoneyDiff(server_timestamp=200, users=[testdata.ActiveUser]))
+    zm_client.set_timed_out_calls(1)
+
+    responses = await asyncio.gather(client.get_transactions(), client.get_accounts())
+    await container.resolve(Syncer).wait_background_saves()
+
+    assert responses[0].total_count == len(testdata.TestTransactions)
+    assert zm_client.sync_diff_calls == 2
+    assert await container.resolve(TimestampRepository).get_last_timestamp() == 100
+
+
+async def test_piggyback_diff_should_be_dropped_if_timestamp_changed(container: Container) -> None:
+    timestamp_repository = container.resolve(TimestampRepository)
+    await timestamp_repository.save_last_timestamp(300)
+
+    saved = await container.resolve(Syncer).save_diff(ZenmoneyDiff(server_timestamp=200, users=[testdata.ActiveUser]), expected_timestamp=100)
+
+    assert not saved
+    assert await timestamp_repository.get_last_timestamp() == 300
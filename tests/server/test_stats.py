@@ -0,0 +1,67 @@
+import datetime
+import decimal
+
+import pytest
+
+from client.client import FinstatsClient
+from client.stats import GetDailyStatsQueryData, GetStatsByTagQueryData
+from finstats.container import Container
+from finstats.store import UsersRepository
+from testing import testdata
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+
+async def test_get_stats_by_tag_should_return_categories_with_titles(client: FinstatsClient) -> None:
+    response = await client.get_stats_by_tag()
+
+    categories = {(c.tag_id, c.instrument): c for c in response.categories}
+    salary = categories[(testdata.TagSalary.id, testdata.InstrumentEUR.id)]
+    assert salary.tag_title == testdata.TagSalary.title
+    assert salary.instrument_title == testdata.InstrumentEUR.title
+    assert salary.income == decimal.Decimal("150.00")
+    assert salary.outcome == decimal.Decimal("0.00")
+    assert [(t.tag_id, t.tag_title, t.income) for t in salary.tags] == [(testdata.TagSalary.id, testdata.TagSalary.title, decimal.Decimal("150.00"))]
+
+    no_tag = categories[(None, testdata.InstrumentAMD.id)]
+    assert no_tag.tag_title is None
+    assert no_tag.outcome == decimal.Decimal("15.25")
+
+
+async def test_get_stats_by_tag_with_date_range_should_filter(client: FinstatsClient) -> None:
+    query = GetStatsByTagQueryData(from_date=datetime.date(2026, 1, 18), to_date=datetime.date(2026, 1, 18))
+
+    response = await client.get_stats_by_tag(query)
+
+    assert [(c.tag_id, c.outcome) for c in response.categories] == [(testdata.TagCafes.id, decimal.Decimal("25.40"))]
+
+
+async def test_get_stats_by_tag_in_user_currency_should_convert_amounts(client: FinstatsClient, container: Container) -> None:
+    await container.resolve(UsersRepository).save_users([testdata.ActiveUser])
+
+    response = await client.get_stats_by_tag(GetStatsByTagQueryData(in_user_currency=True))
+
+    categories = {(c.tag_id, c.instrument): c for c in response.categories}
+    salary = categories[(testdata.TagSalary.id, testdata.ActiveUser.currency)]
+    assert (salary.income, salary.outcome) == (decimal.Decimal("150.00"), decimal.Decimal("0.56"))
+    assert (testdata.TagSalary.id, testdata.InstrumentRUB.id) not in categories
+
+
+async def test_get_stats_by_tag_with_invalid_date_range_should_fail(client: FinstatsClient) -> None:
+    with pytest.raises(Exception, match="status code is 400"):
+        await client.get_stats_by_tag(GetStatsByTagQueryData(from_date=datetime.date(2026, 2, 1), to_date=datetime.date(2026, 1, 1)))
+
+
+async def test_get_daily_stats_should_return_days_with_titles(client: FinstatsClient) -> None:
+    response = await client.get_daily_stats(GetDailyStatsQueryData(from_date=datetime.date(2026, 1, 16), to_date=datetime.date(2026, 1, 18)))
+
+    assert [(d.date, d.instrument, d.instrument_title, d.income, d.outcome) for d in response.days] == [
+        (datetime.date(2026, 1, 16), testdata.InstrumentEUR.id, testdata.InstrumentEUR.title, decimal.Decimal("150.00"), decimal.Decimal("0")),
+        (datetime.date(2026, 1, 17), testdata.InstrumentRUB.id, testdata.InstrumentRUB.title, decimal.Decimal("0"), decimal.Decimal("50.00")),
+        (datetime.date(2026, 1, 18), testdata.InstrumentEUR.id, testdata.InstrumentEUR.title, decimal.Decimal("0"), decimal.Decimal("25.40")),
+    ]
+
+
+async def test_get_daily_stats_with_invalid_date_range_should_fail(client: FinstatsClient) -> None:
+    with pytest.raises(Exception, match="status code is 400"):
+        await client.get_daily_stats(GetDailyStatsQueryData(from_date=datetime.date(2026, 2, 1), to_date=datetime.date(2026, 1, 1)))
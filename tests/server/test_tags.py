@@ -1,9 +1,13 @@
+import dataclasses
 import uuid
 
 import pytest
 
 from client.client import FinstatsClient
+from finstats.container import Container
+from finstats.store import TagsRepository
 from testing import testdata
+from testing.db import capture_statements
 
 pytestmark = pytest.mark.asyncio(loop_scope="session")
 
@@ -37,3 +41,18 @@ async def test_get_tags_should_return_all_tags(client: FinstatsClient) -> None:
         assert actual_sorted[i].archive == expected_tag.archive
         expected_children = expected_children_map.get(expected_tag.id, [])
         assert sorted(expected_tag.children) == expected_children
+
+
+async def test_get_tags_should_issue_constant_number_of_statements(container: Container, client: FinstatsClient) -> None:
+    many_tags = [
+        dataclasses.replace(testdata.TagCafes, id=uuid.UUID(int=i), title=f"Tag {i}", parent=testdata.TagCafes.id if i % 2 else None)
+        for i in range(1, 301)
+    ]
+    await container.resolve(TagsRepository).save_tags(many_tags)
+
+    with capture_statements() as statements:
+        tags = await client.get_tags()
+
+    assert len(tags) == len(testdata.TestTags) + len(many_tags)
+    # the version check and a reload of reference data, tables are read once regardless of the number of tags
+    assert len(statements) <= 5
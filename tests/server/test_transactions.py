@@ -1,9 +1,15 @@
+import decimal
+
 import pytest
 
-from client import TransactionModel
+from client import TotalCountMode, TransactionModel
 from client.client import FinstatsClient
+from client.transaction import GetTransactionsQueryData
+from finstats.container import Container
 from finstats.domain import Transaction
+from finstats.store import UsersRepository
 from testing import testdata
+from testing.db import capture_statements
 
 pytestmark = pytest.mark.asyncio(loop_scope="session")
 
@@ -18,6 +24,70 @@ async def test_get_transactions_with_base_filters_should_return_all_transactions
         _assert_transaction_matches(expected[i], actual_transaction)
 
 
+async def test_get_transactions_with_cursor_should_page_through_all(client: FinstatsClient) -> None:
+    expected = _get_base_sorted_transactions()
+    actual: list[TransactionModel] = []
+
+    response = await client.get_transactions(GetTransactionsQueryData(limit=3))
+    actual.extend(response.transactions)
+    while response.next_cursor is not None:
+        response = await client.get_transactions(GetTransactionsQueryData(limit=3, cursor=response.next_cursor))
+        actual.extend(response.transactions)
+
+    assert [t.id for t in actual] == [t.id for t in expected]
+    assert response.total_count == len(expected)
+
+
+async def test_get_transactions_last_page_should_have_no_cursor(client: FinstatsClient) -> None:
+    response = await client.get_transactions(GetTransactionsQueryData(limit=len(testdata.TestTransactions)))
+    assert response.next_cursor is None
+
+
+async def test_get_transactions_with_skipped_count_should_return_null_total(client: FinstatsClient) -> None:
+    response = await client.get_transactions(GetTransactionsQueryData(total_count_mode=TotalCountMode.Skip))
+    assert response.total_count is None
+    assert len(response.transactions) == len(testdata.TestTransactions)
+
+
+@pytest.mark.parametrize("limit", [1, len(testdata.TestTransactions)])
+async def test_get_transactions_should_fetch_page_with_one_query(client: FinstatsClient, limit: int) -> None:
+    with capture_statements() as statements:
+        response = await client.get_transactions(GetTransactionsQueryData(limit=limit, total_count_mode=TotalCountMode.Skip))
+
+    assert len(response.transactions) == limit
+    assert len(statements) == 1
+
+
+async def test_get_transactions_in_user_currency_should_convert_amounts(client: FinstatsClient, container: Container) -> None:
+    await container.resolve(UsersRepository).save_users([testdata.ActiveUser])
+
+    response = await client.get_transactions(GetTransactionsQueryData(in_user_currency=True))
+
+    transactions = {t.id: t for t in response.transactions}
+    salary_return = transactions[testdata.TransactionSalaryReturn.id]
+    assert salary_return.user_currency == testdata.ActiveUser.currency
+    assert (salary_return.income_in_user_currency, salary_return.outcome_in_user_currency) == (decimal.Decimal("0.00"), decimal.Decimal("0.56"))
+    assert transactions[testdata.TransactionSalary.id].income_in_user_currency == decimal.Decimal("150.00")
+
+
+async def test_get_transactions_should_not_convert_amounts_by_default(client: FinstatsClient) -> None:
+    response = await client.get_transactions()
+
+    assert all(t.user_currency is None and t.income_in_user_currency is None for t in response.transactions)
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        pytest.param(GetTransactionsQueryData(cursor="not a cursor"), id="invalid cursor"),
+        pytest.param(GetTransactionsQueryData(cursor="WyIyMDI2LTAxLTIwIl0", offset=1), id="cursor with offset"),
+    ],
+)
+async def test_get_transactions_with_bad_cursor_should_fail(client: FinstatsClient, query: GetTransactionsQueryData) -> None:
+    with pytest.raises(Exception, match="status code is 400"):
+        await client.get_transactions(query)
+
+
 def _get_base_sorted_transactions() -> list[Transaction]:
     return sorted(
         testdata.TestTransactions,
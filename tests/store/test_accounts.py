@@ -4,7 +4,7 @@ from dataclasses import replace
 import pytest
 
 from finstats.container import Container
-from finstats.store import AccountsRepository
+from finstats.store import AccountsRepository, UpsertResult
 from testing import testdata
 
 pytestmark = pytest.mark.asyncio(loop_scope="session")
@@ -43,6 +43,15 @@ async def test_update_should_return_updated(accounts_repository: AccountsReposit
     assert actual == updated
 
 
+async def test_save_should_report_inserted_updated_and_skipped(accounts_repository: AccountsRepository) -> None:
+    result = await accounts_repository.save_accounts(testdata.TestAccounts)
+    assert result == UpsertResult(inserted=len(testdata.TestAccounts))
+
+    updated = replace(testdata.CashAccount, title="Cash Box")
+    result = await accounts_repository.save_accounts([updated, *testdata.TestAccounts[1:]])
+    assert result == UpsertResult(updated=1, skipped=len(testdata.TestAccounts) - 1)
+
+
 async def test_get_accounts_by_id_with_empty_input_should_return_empty(accounts_repository: AccountsRepository) -> None:
     await accounts_repository.save_accounts(testdata.TestAccounts)
     assert await accounts_repository.get_accounts_by_id([]) == []
@@ -0,0 +1,62 @@
+from dataclasses import replace
+
+import pytest
+
+from finstats.container import Container
+from finstats.domain import Account, Tag, Transaction
+from finstats.store import AccountsRepository, BootstrapLoader, ConnectionScope, TagsRepository, TransactionsRepository, UpsertResult
+from finstats.store.base import AccountTable, TagTable, TransactionsTable
+from testing import testdata
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+
+@pytest.fixture(scope="session")
+def bootstrap_loader(container: Container) -> BootstrapLoader:
+    return container.resolve(BootstrapLoader)
+
+
+@pytest.fixture(scope="session")
+def transactions_repository(container: Container) -> TransactionsRepository:
+    return container.resolve(TransactionsRepository)
+
+
+async def test_load_should_write_transactions(bootstrap_loader: BootstrapLoader, transactions_repository: TransactionsRepository) -> None:
+    await bootstrap_loader.load(TransactionsTable, Transaction, testdata.TestTransactions)
+
+    actual, total = await transactions_repository.find_transactions(limit=len(testdata.TestTransactions))
+    assert sorted(actual, key=lambda x: x.id) == sorted(testdata.TestTransactions, key=lambda x: x.id)
+    assert total == len(testdata.TestTransactions)
+
+
+async def test_load_should_update_existing_rows(bootstrap_loader: BootstrapLoader, container: Container) -> None:
+    accounts_repository = container.resolve(AccountsRepository)
+    await accounts_repository.save_accounts(testdata.TestAccounts)
+    updated = replace(testdata.CashAccount, title="Cash Box")
+
+    await bootstrap_loader.load(AccountTable, Account, [updated])
+
+    assert await accounts_repository.get_account(testdata.CashAccount.id) == updated
+
+
+async def test_load_duplicated_rows_should_save_latest(bootstrap_loader: BootstrapLoader, container: Container) -> None:
+    updated = replace(testdata.TagCafes, title="Coffee")
+
+    await bootstrap_loader.load(TagTable, Tag, [testdata.TagCafes, updated])
+
+    assert await container.resolve(TagsRepository).get_tag(testdata.TagCafes.id) == updated
+
+
+async def test_load_several_tables_in_one_transaction(bootstrap_loader: BootstrapLoader, container: Container) -> None:
+    async with container.resolve(ConnectionScope).acquire():
+        await bootstrap_loader.load(TagTable, Tag, testdata.TestTags)
+        await bootstrap_loader.load(AccountTable, Account, testdata.TestAccounts)
+
+    assert await container.resolve(TagsRepository).get_tag(testdata.TagCafes.id) == testdata.TagCafes
+    assert await container.resolve(AccountsRepository).get_account(testdata.CashAccount.id) == testdata.CashAccount
+
+
+async def test_load_unchanged_rows_should_skip(bootstrap_loader: BootstrapLoader) -> None:
+    await bootstrap_loader.load(TagTable, Tag, testdata.TestTags)
+    result = await bootstrap_loader.load(TagTable, Tag, testdata.TestTags)
+    assert result == UpsertResult(skipped=len(testdata.TestTags))
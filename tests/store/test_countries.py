@@ -3,7 +3,7 @@ from dataclasses import replace
 import pytest
 
 from finstats.container import Container
-from finstats.store import CountriesRepository
+from finstats.store import CountriesRepository, UpsertResult
 from testing import testdata
 
 pytestmark = pytest.mark.asyncio(loop_scope="session")
@@ -58,3 +58,15 @@ async def test_save_countries_with_empty_input_should_do_nothing(country_reposit
     await country_repository.save_countries([])
     actual = await country_repository.get_countries_by_id([x.id for x in testdata.TestCountries])
     assert sorted(actual, key=lambda x: x.id) == sorted(testdata.TestCountries, key=lambda x: x.id)
+
+
+async def test_save_unchanged_countries_should_skip(country_repository: CountriesRepository) -> None:
+    await country_repository.save_countries(testdata.TestCountries)
+    result = await country_repository.save_countries(testdata.TestCountries)
+    assert result == UpsertResult(skipped=len(testdata.TestCountries))
+
+
+async def test_save_country_with_changed_nullable_column_should_update(country_repository: CountriesRepository) -> None:
+    await country_repository.save_countries(testdata.TestCountries)
+    result = await country_repository.save_countries([replace(testdata.CountryRussia, domain=None)])
+    assert result == UpsertResult(updated=1)
@@ -0,0 +1,105 @@
+import datetime
+import json
+import uuid
+from typing import Any
+
+import pytest
+import pytest_asyncio
+import sqlalchemy as sa
+
+from finstats.container import Container
+from finstats.store import ConnectionScope, TotalCountMode, TransactionCursor, TransactionsRepository
+from finstats.store.transactions import TransactionTypeFilter
+from testing.db import capture_statements
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+TRANSACTIONS_COUNT = 100_000
+ACCOUNTS_COUNT = 2000
+TAGS_COUNT = 300
+
+
+def _account_id(n: int) -> uuid.UUID:
+    return uuid.UUID(f"00000000-0000-0000-0000-{n:012d}")
+
+
+def _tag_id(n: int) -> uuid.UUID:
+    return uuid.UUID(f"00000000-0000-0000-0001-{n:012d}")
+
+
+@pytest_asyncio.fixture(scope="function", loop_scope="session")
+async def transactions(connection: ConnectionScope) -> None:
+    # a few years of history, every account and tag holds a small share of rows, 1% of rows are not viewed and 2% are deleted
+    async with connection.acquire() as conn:
+        await conn.execute(
+            sa.text(
+                """
+                INSERT INTO transactions (
+                    id, "user", income, outcome, changed, income_instrument, outcome_instrument, created,
+                    deleted, viewed, income_account, outcome_account, tags, date, transaction_type, first_tag
+                )
+                SELECT
+                    gen_random_uuid(), 1,
+                    CASE WHEN i % 10 = 0 THEN 100 ELSE 0 END, CASE WHEN i % 10 = 0 THEN 0 ELSE 50 END,
+                    now(), 1, 1, timestamp '2026-01-01' - i * interval '20 minutes',
+                    i % 50 = 0, i % 100 != 0,
+                    ('00000000-0000-0000-0000-' || lpad((i % :accounts)::text, 12, '0'))::uuid,
+                    ('00000000-0000-0000-0000-' || lpad(((i + 1) % :accounts)::text, 12, '0'))::uuid,
+                    ARRAY[('00000000-0000-0000-0001-' || lpad((i % :tags)::text, 12, '0'))::uuid],
+                    date '2026-01-01' - (i / 72),
+                    CASE WHEN i % 10 = 0 THEN 'Income' ELSE 'Expense' END,
+                    ('00000000-0000-0000-0001-' || lpad((i % :tags)::text, 12, '0'))::uuid
+                FROM generate_series(1, :count) AS i
+                """
+            ),
+            {"count": TRANSACTIONS_COUNT, "accounts": ACCOUNTS_COUNT, "tags": TAGS_COUNT},
+        )
+        await conn.execute(sa.text("ANALYZE transactions"))
+
+
+def _collect_index_names(plan: dict[str, Any]) -> set[str]:
+    names = {plan["Index Name"]} if "Index Name" in plan else set()
+    for child in plan.get("Plans", []):
+        names |= _collect_index_names(child)
+    return names
+
+
+async def _get_used_indexes(connection: ConnectionScope, repository: TransactionsRepository, **filters: Any) -> set[str]:  # noqa: ANN401
+    async with connection.acquire() as conn:
+        with capture_statements() as statements:
+            await repository.find_transactions(limit=100, total_count=TotalCountMode.Skip, **filters)
+
+        (statement, parameters), *_ = [(s, p) for s, p in statements if "ORDER BY" in s]
+        plan = (await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)).scalar_one()
+        plan = json.loads(plan) if isinstance(plan, str) else plan
+        return _collect_index_names(plan[0]["Plan"])
+
+
+@pytest.mark.usefixtures("transactions")
+@pytest.mark.parametrize(
+    "filters, expected_indexes",
+    [
+        pytest.param({}, {"idx_transactions_exist_by_sort_key"}, id="sort key"),
+        pytest.param(
+            {
+                "cursor": TransactionCursor(
+                    date=datetime.date(2025, 1, 1), created=datetime.datetime(2025, 1, 1, tzinfo=datetime.UTC), id=uuid.UUID(int=0)
+                )
+            },
+            {"idx_transactions_exist_by_sort_key"},
+            id="deep cursor",
+        ),
+        pytest.param({"not_viewed": True}, {"idx_transactions_not_viewed_by_sort_key"}, id="not viewed"),
+        pytest.param({"account_id": _account_id(7)}, {"idx_transactions_income_account", "idx_transactions_outcome_account"}, id="account"),
+        pytest.param({"tags": [_tag_id(7)]}, {"idx_transactions_tags"}, id="tags"),
+        pytest.param({"transaction_type": TransactionTypeFilter.Income}, {"idx_transactions_exist_by_type_and_date"}, id="type"),
+    ],
+)
+async def test_find_transactions_should_use_index(
+    container: Container,
+    connection: ConnectionScope,
+    filters: dict[str, Any],
+    expected_indexes: set[str],
+) -> None:
+    used_indexes = await _get_used_indexes(connection, container.resolve(TransactionsRepository), **filters)
+    assert expected_indexes <= used_indexes
@@ -0,0 +1,113 @@
+import dataclasses
+
+import pytest
+import sqlalchemy as sa
+
+from finstats.store.base import TransactionsTable
+from finstats.store.misc import MAX_BIND_PARAMETERS, chunked, from_dataclasses, get_row_extractor, to_dataclass, to_dataclasses, unique_by_id
+from testing import testdata
+
+pytestmark = pytest.mark.no_migrations()
+
+
+def test_chunked_should_split_by_chunk_size() -> None:
+    assert list(chunked([1, 2, 3, 4, 5], TransactionsTable, chunk_size=2)) == [[1, 2], [3, 4], [5]]
+
+
+def test_chunked_should_respect_bind_parameters_limit() -> None:
+    items = list(range(MAX_BIND_PARAMETERS))
+    columns = len(TransactionsTable.__table__.columns)
+
+    chunks = list(chunked(items, TransactionsTable, chunk_size=MAX_BIND_PARAMETERS))
+
+    assert all(len(chunk) * columns <= MAX_BIND_PARAMETERS for chunk in chunks)
+    assert [item for chunk in chunks for item in chunk] == items
+
+
+def test_chunked_with_non_positive_size_should_raise() -> None:
+    with pytest.raises(ValueError, match="chunk_size should be positive"):
+        list(chunked([1], TransactionsTable, chunk_size=0))
+
+
+def test_unique_by_id_should_keep_latest_version_in_first_position() -> None:
+    edited = dataclasses.replace(testdata.TransactionSalary, comment="edited")
+
+    actual = unique_by_id([testdata.TransactionSalary, testdata.TransactionCafeExpense, edited])
+
+    assert actual == [edited, testdata.TransactionCafeExpense]
+
+
+@dataclasses.dataclass(frozen=True, slots=True, kw_only=True)
+class Point:
+    x: int
+    y: int
+
+
+@dataclasses.dataclass(frozen=True)
+class CheckedPoint:
+    x: int
+    y: int
+
+    def __post_init__(self) -> None:
+        if self.x < 0:
+            raise ValueError("x should not be negative")
+
+
+def test_to_dataclasses_should_map_columns_by_name() -> None:
+    rows = _select_rows("SELECT 1 AS y, 'extra' AS label, 2 AS x UNION ALL SELECT 3, 'extra', 4")
+
+    assert to_dataclasses(Point, rows) == [Point(x=2, y=1), Point(x=4, y=3)]
+    assert to_dataclass(Point, rows[0]) == Point(x=2, y=1)
+
+
+def test_to_dataclasses_should_keep_frozen_guard() -> None:
+    point = to_dataclass(Point, _select_rows("SELECT 1 AS x, 2 AS y")[0])
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        point.x = 3  # ty:ignore[invalid-assignment]
+
+
+def test_to_dataclasses_should_run_post_init() -> None:
+    assert to_dataclasses(CheckedPoint, _select_rows("SELECT 1 AS x, 2 AS y")) == [CheckedPoint(1, 2)]
+    with pytest.raises(ValueError, match="x should not be negative"):
+        to_dataclasses(CheckedPoint, _select_rows("SELECT -1 AS x, 2 AS y"))
+
+
+def test_to_dataclasses_with_missing_column_should_raise() -> None:
+    with pytest.raises(AttributeError, match=r"\['y'\]"):
+        to_dataclasses(Point, _select_rows("SELECT 1 AS x"))
+
+
+def test_to_dataclasses_without_rows_should_return_empty_list() -> None:
+    assert to_dataclasses(Point, []) == []
+
+
+def test_from_dataclasses_should_match_asdict() -> None:
+    assert from_dataclasses(testdata.TestTransactions) == [dataclasses.asdict(t) for t in testdata.TestTransactions]
+
+
+def test_from_dataclasses_should_not_copy_values() -> None:
+    [row] = from_dataclasses([testdata.TransactionSalary])
+
+    assert row["tags"] is testdata.TransactionSalary.tags
+
+
+def test_get_row_extractor_should_return_values_in_field_order() -> None:
+    columns, values = get_row_extractor(Point)
+
+    assert columns == ("x", "y")
+    assert values(Point(x=1, y=2)) == (1, 2)
+
+
+def test_get_row_extractor_of_not_dataclass_should_raise() -> None:
+    with pytest.raises(TypeError, match="is not a dataclass"):
+        get_row_extractor(int)
+
+
+def _select_rows(sql: str) -> list[sa.Row]:
+    engine = sa.create_engine("sqlite://")
+    try:
+        with engine.connect() as connection:
+            return list(connection.execute(sa.text(sql)).all())
+    finally:
+        engine.dispose()
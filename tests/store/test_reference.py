@@ -0,0 +1,97 @@
+import dataclasses
+
+import pytest
+import pytest_asyncio
+
+from finstats.container import Container
+from finstats.domain import ZenmoneyDiff
+from finstats.store import (
+    AccountsRepository,
+    InstrumentsRepository,
+    MerchantsRepository,
+    ReferenceDataCache,
+    TagsRepository,
+    TimestampRepository,
+)
+from testing import testdata
+from testing.db import capture_statements
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+
+@pytest.fixture(scope="session")
+def reference_cache(container: Container) -> ReferenceDataCache:
+    return container.resolve(ReferenceDataCache)
+
+
+@pytest_asyncio.fixture(scope="function", loop_scope="session")
+async def reference_data(container: Container) -> None:
+    await container.resolve(AccountsRepository).save_accounts(testdata.TestAccounts)
+    await container.resolve(InstrumentsRepository).save_instruments(testdata.TestInstruments)
+    await container.resolve(MerchantsRepository).save_merchants(testdata.TestMerchants)
+    await container.resolve(TagsRepository).save_tags(testdata.TestTags)
+    await container.resolve(TimestampRepository).save_last_timestamp(100)
+
+
+@pytest.mark.usefixtures("reference_data")
+async def test_get_should_index_reference_data_by_id(reference_cache: ReferenceDataCache) -> None:
+    data = await reference_cache.get()
+
+    assert data.accounts == {account.id: account for account in testdata.TestAccounts}
+    assert data.instruments == {instrument.id: instrument for instrument in testdata.TestInstruments}
+    assert data.merchants == {merchant.id: merchant for merchant in testdata.TestMerchants}
+    assert data.tags == {tag.id: tag for tag in testdata.TestTags}
+    for tag in testdata.TestTags:
+        if tag.parent is not None:
+            assert tag.id in data.children_tags[tag.parent]
+
+
+@pytest.mark.usefixtures("reference_data")
+async def test_get_should_only_check_version_while_timestamp_is_unchanged(reference_cache: ReferenceDataCache) -> None:
+    data = await reference_cache.get()
+
+    with capture_statements() as statements:
+        assert await reference_cache.get() is data
+
+    assert len(statements) == 1
+
+
+@pytest.mark.usefixtures("reference_data")
+async def test_get_should_reload_when_timestamp_changed(container: Container, reference_cache: ReferenceDataCache) -> None:
+    await reference_cache.get()
+    renamed = dataclasses.replace(testdata.CardAccount, title="Renamed")
+    await container.resolve(AccountsRepository).save_accounts([renamed])
+    await container.resolve(TimestampRepository).save_last_timestamp(200)
+
+    data = await reference_cache.get()
+
+    assert data.accounts[renamed.id] == renamed
+
+
+@pytest.mark.usefixtures("reference_data")
+async def test_apply_should_patch_snapshot_of_previous_version(container: Container, reference_cache: ReferenceDataCache) -> None:
+    await reference_cache.get()
+    child = dataclasses.replace(testdata.TagTravel, parent=testdata.TagCafes.id)
+    await container.resolve(TagsRepository).save_tags([child])
+    await container.resolve(TimestampRepository).save_last_timestamp(200)
+
+    reference_cache.apply(ZenmoneyDiff(server_timestamp=200, tags=[child]), previous_timestamp=100)
+    with capture_statements() as statements:
+        data = await reference_cache.get()
+
+    assert len(statements) == 1
+    assert data.tags[child.id] == child
+    assert child.id in data.children_tags[testdata.TagCafes.id]
+
+
+@pytest.mark.usefixtures("reference_data")
+async def test_apply_should_drop_snapshot_of_another_version(container: Container, reference_cache: ReferenceDataCache) -> None:
+    await reference_cache.get()
+    renamed = dataclasses.replace(testdata.CardAccount, title="Renamed")
+    await container.resolve(AccountsRepository).save_accounts([renamed])
+    await container.resolve(TimestampRepository).save_last_timestamp(300)
+
+    reference_cache.apply(ZenmoneyDiff(server_timestamp=300), previous_timestamp=200)
+    data = await reference_cache.get()
+
+    assert data.accounts[renamed.id] == renamed
@@ -0,0 +1,119 @@
+import dataclasses
+import datetime
+import decimal
+
+import pytest
+
+from finstats.container import Container
+from finstats.domain import AccountId, InstrumentId, Transaction
+from finstats.store import DailyRollup, TagsRepository, TransactionsRepository
+from finstats.store.transactions import TransactionTypeFilter
+from testing import testdata
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+
+@pytest.fixture(scope="session")
+def transactions_repository(container: Container) -> TransactionsRepository:
+    return container.resolve(TransactionsRepository)
+
+
+@pytest.fixture(scope="session")
+def tags_repository(container: Container) -> TagsRepository:
+    return container.resolve(TagsRepository)
+
+
+async def test_save_transactions_should_add_both_sides_to_rollup(transactions_repository: TransactionsRepository) -> None:
+    transfer = testdata.TransactionTransferCashToWallet
+    await transactions_repository.save_transactions([transfer])
+
+    actual = await transactions_repository.find_daily_rollup(from_date=transfer.date, to_date=transfer.date)
+
+    assert sorted(actual, key=lambda r: r.instrument) == sorted(
+        [
+            _rollup(transfer, transfer.income_account, transfer.income_instrument, TransactionTypeFilter.Transfer, income=transfer.income),
+            _rollup(transfer, transfer.outcome_account, transfer.outcome_instrument, TransactionTypeFilter.Transfer, outcome=transfer.outcome),
+        ],
+        key=lambda r: r.instrument,
+    )
+
+
+async def test_save_transactions_should_sum_transactions_of_one_day(transactions_repository: TransactionsRepository) -> None:
+    expense = testdata.TransactionTransportExpense
+    another = dataclasses.replace(expense, id=testdata.TransactionNoTagExpense.id, outcome=decimal.Decimal("7.25"))
+    await transactions_repository.save_transactions([expense, another])
+
+    actual = await transactions_repository.find_daily_rollup(account_id=expense.outcome_account)
+
+    assert actual == [
+        _rollup(
+            expense, expense.outcome_account, expense.outcome_instrument, TransactionTypeFilter.Expense, outcome=decimal.Decimal("20.00"), count=2
+        )
+    ]
+
+
+async def test_save_transactions_should_move_edited_transaction_to_new_day(transactions_repository: TransactionsRepository) -> None:
+    expense = testdata.TransactionTransportExpense
+    await transactions_repository.save_transactions([expense])
+
+    moved = dataclasses.replace(expense, date=expense.date + datetime.timedelta(days=1))
+    await transactions_repository.save_transactions([moved])
+
+    actual = await transactions_repository.find_daily_rollup(account_id=expense.outcome_account)
+    assert [r.date for r in actual] == [moved.date]
+
+
+async def test_save_transactions_should_remove_deleted_transaction(transactions_repository: TransactionsRepository) -> None:
+    await transactions_repository.save_transactions(testdata.TestTransactions)
+
+    expense = testdata.TransactionTransportExpense
+    await transactions_repository.save_transactions([dataclasses.replace(expense, deleted=True)])
+
+    assert await transactions_repository.find_daily_rollup(from_date=expense.date, to_date=expense.date, account_id=expense.outcome_account) == []
+
+
+async def test_save_tags_should_update_rollup_type(transactions_repository: TransactionsRepository, tags_repository: TagsRepository) -> None:
+    income = testdata.TransactionCashbackIncome
+    await tags_repository.save_tags(testdata.TestTags)
+    await transactions_repository.save_transactions([income])
+
+    await tags_repository.save_tags([dataclasses.replace(testdata.TagTravel, show_income=True)])
+
+    actual = await transactions_repository.find_daily_rollup(account_id=income.income_account)
+    assert [r.transaction_type for r in actual] == [TransactionTypeFilter.Income]
+
+
+async def test_rebuild_daily_rollup_should_match_incremental_rollup(
+    transactions_repository: TransactionsRepository,
+    tags_repository: TagsRepository,
+) -> None:
+    await transactions_repository.save_transactions(testdata.TestTransactions)
+    await tags_repository.save_tags(testdata.TestTags)
+    await transactions_repository.save_transactions([dataclasses.replace(testdata.TransactionSalary, date=datetime.date(2026, 2, 1))])
+    incremental = await transactions_repository.find_daily_rollup()
+
+    rows = await transactions_repository.rebuild_daily_rollup()
+
+    assert rows == len(incremental)
+    assert await transactions_repository.find_daily_rollup() == incremental
+
+
+def _rollup(
+    transaction: Transaction,
+    account: AccountId,
+    instrument: InstrumentId,
+    transaction_type: TransactionTypeFilter,
+    income: decimal.Decimal = decimal.Decimal(0),
+    outcome: decimal.Decimal = decimal.Decimal(0),
+    count: int = 1,
+) -> DailyRollup:
+    return DailyRollup(
+        date=transaction.date,
+        account=account,
+        first_tag=transaction.tags[0] if transaction.tags else None,
+        instrument=instrument,
+        transaction_type=transaction_type,
+        income=income,
+        outcome=outcome,
+        transactions_count=count,
+    )
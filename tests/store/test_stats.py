@@ -0,0 +1,156 @@
+import dataclasses
+import datetime
+import decimal
+import uuid
+
+import pytest
+import pytest_asyncio
+
+from finstats.container import Container
+from finstats.domain import InstrumentId, TagId
+from finstats.store import DailyStats, InstrumentsRepository, StatsRepository, TagsRepository, TagStats, TransactionsRepository
+from testing import testdata
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+HealthExpense = dataclasses.replace(
+    testdata.TransactionTransportExpense,
+    id=uuid.UUID("5f0c7d1e-1a2b-4c3d-8e9f-000000000001"),
+    outcome=decimal.Decimal("10.00"),
+    tags=[testdata.TagHealth.id],
+)
+SelfCareExpense = dataclasses.replace(
+    testdata.TransactionTransportExpense,
+    id=uuid.UUID("5f0c7d1e-1a2b-4c3d-8e9f-000000000002"),
+    outcome=decimal.Decimal("5.00"),
+    tags=[testdata.TagSelfCare.id],
+)
+
+
+@pytest.fixture(scope="session")
+def stats_repository(container: Container) -> StatsRepository:
+    return container.resolve(StatsRepository)
+
+
+@pytest_asyncio.fixture(scope="function", loop_scope="session", autouse=True)
+async def transactions(container: Container) -> None:
+    await container.resolve(TagsRepository).save_tags(testdata.TestTags)
+    await container.resolve(TransactionsRepository).save_transactions(testdata.TestTransactions + [HealthExpense, SelfCareExpense])
+
+
+async def test_get_stats_by_tag_should_roll_up_children_to_category(stats_repository: StatsRepository) -> None:
+    report = await stats_repository.get_stats_by_tag()
+
+    mdl, self_care, health = testdata.InstrumentMDL.id, testdata.TagSelfCare.id, testdata.TagHealth.id
+    assert _by_key(report.categories)[(self_care, None, mdl)] == _stats(self_care, None, mdl, outcome="15.00", count=2)
+    tags = _by_key(report.tags)
+    assert tags[(self_care, health, mdl)] == _stats(self_care, health, mdl, outcome="10.00", count=1)
+    assert tags[(self_care, self_care, mdl)] == _stats(self_care, self_care, mdl, outcome="5.00", count=1)
+
+
+async def test_get_stats_by_tag_should_split_by_instrument_and_skip_transfers(stats_repository: StatsRepository) -> None:
+    report = await stats_repository.get_stats_by_tag()
+
+    assert set(_by_key(report.categories)) == {
+        (testdata.TagSalary.id, None, testdata.InstrumentEUR.id),
+        (testdata.TagSalary.id, None, testdata.InstrumentRUB.id),
+        (testdata.TagCafes.id, None, testdata.InstrumentEUR.id),
+        (testdata.TagGroceries.id, None, testdata.InstrumentUAH.id),
+        (testdata.TagTravel.id, None, testdata.InstrumentGBP.id),
+        (testdata.TagTravel.id, None, testdata.InstrumentBYR.id),
+        (testdata.TagTransport.id, None, testdata.InstrumentMDL.id),
+        (testdata.TagSelfCare.id, None, testdata.InstrumentMDL.id),
+        (None, None, testdata.InstrumentAMD.id),
+    }
+    categories = _by_key(report.categories)
+    assert categories[(testdata.TagSalary.id, None, testdata.InstrumentEUR.id)].income == decimal.Decimal("150.00")
+    assert categories[(testdata.TagSalary.id, None, testdata.InstrumentRUB.id)].outcome == decimal.Decimal("50.00")
+    assert categories[(testdata.TagTravel.id, None, testdata.InstrumentGBP.id)].income == decimal.Decimal("120.00")
+    assert categories[(None, None, testdata.InstrumentAMD.id)].outcome == decimal.Decimal("15.25")
+
+
+async def test_get_stats_by_tag_should_filter_by_date_and_account(stats_repository: StatsRepository) -> None:
+    report = await stats_repository.get_stats_by_tag(
+        from_date=datetime.date(2026, 1, 16),
+        to_date=datetime.date(2026, 1, 21),
+        account_id=testdata.SavingsAccount.id,
+    )
+
+    assert set(_by_key(report.categories)) == {
+        (testdata.TagGroceries.id, None, testdata.InstrumentUAH.id),
+        (testdata.TagTravel.id, None, testdata.InstrumentGBP.id),
+    }
+
+
+async def test_get_stats_by_tag_with_currency_should_convert_amounts(stats_repository: StatsRepository, container: Container) -> None:
+    await container.resolve(InstrumentsRepository).save_instruments(testdata.TestInstruments)
+
+    report = await stats_repository.get_stats_by_tag(currency=testdata.InstrumentRUB.id)
+
+    categories = _by_key(report.categories)
+    salary = categories[(testdata.TagSalary.id, None, testdata.InstrumentRUB.id)]
+    # 150 EUR of the salary and 50 RUB of its return end up in one entry
+    assert (salary.income, salary.outcome, salary.transactions_count) == (decimal.Decimal("13359.00"), decimal.Decimal("50.00"), 2)
+    assert categories[(testdata.TagSelfCare.id, None, testdata.InstrumentRUB.id)].outcome == decimal.Decimal("66.75")
+    # 120 GBP and 90 BYR, a rate below a kopeck is not rounded away
+    assert categories[(testdata.TagTravel.id, None, testdata.InstrumentRUB.id)].income == decimal.Decimal("12279.91")
+
+
+async def test_get_stats_by_tag_with_invalid_date_range_should_raise(stats_repository: StatsRepository) -> None:
+    with pytest.raises(ValueError):
+        await stats_repository.get_stats_by_tag(from_date=datetime.date(2026, 2, 1), to_date=datetime.date(2026, 1, 1))
+
+
+async def test_get_daily_stats_should_sum_days_and_skip_transfers(stats_repository: StatsRepository) -> None:
+    days = await stats_repository.get_daily_stats(from_date=datetime.date(2026, 1, 16), to_date=datetime.date(2026, 1, 23))
+
+    assert [(d.date.day, d.instrument, d.income, d.outcome, d.transactions_count) for d in days] == [
+        (16, testdata.InstrumentEUR.id, decimal.Decimal("150.00"), decimal.Decimal("0"), 1),
+        (17, testdata.InstrumentRUB.id, decimal.Decimal("0"), decimal.Decimal("50.00"), 1),
+        (18, testdata.InstrumentEUR.id, decimal.Decimal("0"), decimal.Decimal("25.40"), 1),
+        (20, testdata.InstrumentUAH.id, decimal.Decimal("0"), decimal.Decimal("75.00"), 1),
+        (21, testdata.InstrumentGBP.id, decimal.Decimal("120.00"), decimal.Decimal("0"), 1),
+        # the transport expense of testdata and both extra expenses of this module
+        (23, testdata.InstrumentMDL.id, decimal.Decimal("0"), decimal.Decimal("27.75"), 3),
+    ]
+
+
+async def test_get_daily_stats_with_account_should_sum_only_its_amounts(stats_repository: StatsRepository) -> None:
+    days = await stats_repository.get_daily_stats(account_id=testdata.CashAccount.id)
+
+    assert days == [
+        DailyStats(
+            date=datetime.date(2026, 1, 16),
+            instrument=testdata.InstrumentEUR.id,
+            income=decimal.Decimal("150.00"),
+            outcome=decimal.Decimal("0"),
+            transactions_count=1,
+        ),
+        DailyStats(
+            date=datetime.date(2026, 1, 18),
+            instrument=testdata.InstrumentEUR.id,
+            income=decimal.Decimal("0"),
+            outcome=decimal.Decimal("25.40"),
+            transactions_count=1,
+        ),
+    ]
+
+
+async def test_get_daily_stats_with_invalid_date_range_should_raise(stats_repository: StatsRepository) -> None:
+    with pytest.raises(ValueError):
+        await stats_repository.get_daily_stats(from_date=datetime.date(2026, 2, 1), to_date=datetime.date(2026, 1, 1))
+
+
+def _by_key(stats: list[TagStats]) -> dict[tuple[TagId | None, TagId | None, InstrumentId], TagStats]:
+    return {(s.category_id, s.tag_id, s.instrument): s for s in stats}
+
+
+def _stats(category_id: TagId | None, tag_id: TagId | None, instrument: InstrumentId, outcome: str, count: int) -> TagStats:
+    return TagStats(
+        category_id=category_id,
+        tag_id=tag_id,
+        instrument=instrument,
+        income=decimal.Decimal("0.00"),
+        outcome=decimal.Decimal(outcome),
+        transactions_count=count,
+    )
@@ -1,10 +1,26 @@
+import dataclasses
 import datetime
+from typing import Any
 
 import pytest
+import sqlalchemy as sa
 
 from finstats.container import Container
-from finstats.store import AccountsRepository, TagsRepository, TransactionsRepository
-from finstats.store.transactions import TransactionTypeFilter
+from finstats.domain import Transaction
+from finstats.store import (
+    AccountsRepository,
+    BootstrapLoader,
+    ConnectionScope,
+    InstrumentsRepository,
+    MerchantsRepository,
+    TagsRepository,
+    TimestampRepository,
+    TransactionCountCache,
+    TransactionReferences,
+    TransactionsRepository,
+)
+from finstats.store.base import TransactionsTable
+from finstats.store.transactions import TotalCountMode, TransactionCursor, TransactionTypeFilter
 from testing import testdata
 
 pytestmark = pytest.mark.asyncio(loop_scope="session")
@@ -49,6 +65,19 @@ async def test_write_read_many_should_return_transactions(transactions_repositor
     assert total == len(testdata.TestTransactions)
 
 
+async def test_write_in_chunks_should_save_all_transactions(transactions_repository: TransactionsRepository) -> None:
+    await transactions_repository.save_transactions(testdata.TestTransactions, chunk_size=2)
+    actual, total = await transactions_repository.find_transactions(limit=len(testdata.TestTransactions))
+    assert sorted(actual, key=lambda x: x.id) == sorted(testdata.TestTransactions, key=lambda x: x.id)
+    assert total == len(testdata.TestTransactions)
+
+
+async def test_write_duplicated_transaction_should_save_latest(transactions_repository: TransactionsRepository) -> None:
+    changed = dataclasses.replace(testdata.TransactionSalary, comment="changed")
+    await transactions_repository.save_transactions([testdata.TransactionSalary, changed])
+    assert await transactions_repository.get_transaction(testdata.TransactionSalary.id) == changed
+
+
 async def test_find_transactions_with_offset_limit_should_paginate(transactions_repository: TransactionsRepository) -> None:
     await transactions_repository.save_transactions(testdata.TestTransactions)
     actual, total = await transactions_repository.find_transactions(limit=3, offset=2)
@@ -57,6 +86,101 @@ async def test_find_transactions_with_offset_limit_should_paginate(transactions_
     assert total == len(testdata.TestTransactions)
 
 
+async def test_find_transactions_with_cursor_should_continue_after_it(transactions_repository: TransactionsRepository) -> None:
+    await transactions_repository.save_transactions(testdata.TestTransactions)
+    expected = sorted(testdata.TestTransactions, key=lambda x: (x.date, x.created, x.id), reverse=True)
+
+    first_page, _ = await transactions_repository.find_transactions(limit=3)
+    second_page, total = await transactions_repository.find_transactions(limit=3, cursor=TransactionCursor.after(first_page[-1]))
+
+    assert first_page + second_page == expected[:6]
+    assert total == len(testdata.TestTransactions)
+
+
+async def test_find_transactions_with_cursor_after_last_should_return_empty(transactions_repository: TransactionsRepository) -> None:
+    await transactions_repository.save_transactions(testdata.TestTransactions)
+    last = min(testdata.TestTransactions, key=lambda x: (x.date, x.created, x.id))
+
+    actual, _ = await transactions_repository.find_transactions(cursor=TransactionCursor.after(last))
+
+    assert actual == []
+
+
+async def test_find_transactions_count_should_be_cached_until_sync(container: Container, transactions_repository: TransactionsRepository) -> None:
+    await transactions_repository.save_transactions(testdata.TestTransactions)
+    cache = container.resolve(TransactionCountCache)
+
+    _, total = await transactions_repository.find_transactions(tags=[testdata.TagGroceries.id])
+    hits = cache.hits
+    _, cached_total = await transactions_repository.find_transactions(tags=[testdata.TagGroceries.id, testdata.TagGroceries.id])
+    assert cached_total == total
+    assert cache.hits == hits + 1
+
+    await container.resolve(TimestampRepository).save_last_timestamp(1700000000)
+    _, total_after_sync = await transactions_repository.find_transactions(tags=[testdata.TagGroceries.id])
+    assert total_after_sync == total
+    assert cache.hits == hits + 1
+
+
+async def test_find_transactions_count_should_be_invalidated_by_save(transactions_repository: TransactionsRepository) -> None:
+    await transactions_repository.save_transactions(testdata.TestTransactions[:2])
+    _, total = await transactions_repository.find_transactions()
+    assert total == 2
+
+    await transactions_repository.save_transactions(testdata.TestTransactions)
+    _, total = await transactions_repository.find_transactions()
+    assert total == len(testdata.TestTransactions)
+
+
+async def test_find_transactions_with_skipped_count_should_return_none(transactions_repository: TransactionsRepository) -> None:
+    await transactions_repository.save_transactions(testdata.TestTransactions)
+    actual, total = await transactions_repository.find_transactions(total_count=TotalCountMode.Skip)
+    assert len(actual) == len(testdata.TestTransactions)
+    assert total is None
+
+
+async def _seed_transactions(connection: ConnectionScope, count: int) -> None:
+    # every 10th row is an income, rows are spread over a few years
+    async with connection.acquire() as conn:
+        await conn.execute(
+            sa.text(
+                """
+                INSERT INTO transactions (
+                    id, "user", income, outcome, changed, income_instrument, outcome_instrument, created,
+                    deleted, viewed, income_account, outcome_account, tags, date, transaction_type
+                )
+                SELECT
+                    gen_random_uuid(), 1, 0, 50, now(), 1, 1, timestamp '2026-01-01' - i * interval '20 minutes',
+                    false, true, gen_random_uuid(), gen_random_uuid(), ARRAY[]::uuid[], date '2026-01-01' - (i / 72),
+                    CASE WHEN i % 10 = 0 THEN 'Income' ELSE 'Expense' END
+                FROM generate_series(1, :count) AS i
+                """
+            ),
+            {"count": count},
+        )
+        await conn.execute(sa.text("ANALYZE transactions"))
+
+
+@pytest.mark.parametrize("parallel", [False, True], ids=["serial", "parallel"])
+async def test_find_transactions_with_estimated_count_should_return_estimate(
+    connection: ConnectionScope,
+    transactions_repository: TransactionsRepository,
+    parallel: bool,
+) -> None:
+    await _seed_transactions(connection, 50_000)
+    filters: dict[str, Any] = {"from_date": datetime.date(2025, 6, 1), "transaction_type": TransactionTypeFilter.Expense}
+    # the estimate first, an exact count would be served from the cache
+    async with connection.acquire() as conn:
+        if parallel:
+            for setting in ("parallel_setup_cost", "parallel_tuple_cost", "min_parallel_table_scan_size", "min_parallel_index_scan_size"):
+                await conn.execute(sa.text(f"SET LOCAL {setting} = 0"))
+        _, estimate = await transactions_repository.find_transactions(limit=1, total_count=TotalCountMode.Estimated, **filters)
+    _, exact = await transactions_repository.find_transactions(limit=1, **filters)
+
+    assert exact is not None
+    assert estimate == pytest.approx(exact, rel=0.2)
+
+
 async def test_find_transactions_with_date_range_should_filter(transactions_repository: TransactionsRepository) -> None:
     await transactions_repository.save_transactions(testdata.TestTransactions)
     actual, total = await transactions_repository.find_transactions(
@@ -238,3 +362,91 @@ async def test_find_transactions_with_type_expense_return_should_filter(
     ]
     assert actual == expected
     assert total == len(expected)
+
+
+async def test_transaction_type_should_be_derived_when_tags_and_accounts_saved_later(
+    transactions_repository: TransactionsRepository,
+    accounts_repository: AccountsRepository,
+    tags_repository: TagsRepository,
+) -> None:
+    await transactions_repository.save_transactions(testdata.TestTransactions)
+    await tags_repository.save_tags(testdata.TestTags)
+    await accounts_repository.save_accounts(testdata.TestAccounts)
+
+    lent_out, _ = await transactions_repository.find_transactions(transaction_type=TransactionTypeFilter.LentOut)
+    return_income, _ = await transactions_repository.find_transactions(transaction_type=TransactionTypeFilter.ReturnIncome)
+
+    assert lent_out == [testdata.TransactionLentOut]
+    assert return_income == [testdata.TransactionCashbackIncome, testdata.TransactionRefundIncome]
+
+
+async def test_transaction_type_should_be_rederived_when_tag_changed(
+    transactions_repository: TransactionsRepository,
+    tags_repository: TagsRepository,
+) -> None:
+    await tags_repository.save_tags(testdata.TestTags)
+    await transactions_repository.save_transactions(testdata.TestTransactions)
+
+    await tags_repository.save_tags([dataclasses.replace(testdata.TagTravel, show_income=True)])
+    page = await transactions_repository.find_transactions_page(transaction_type=TransactionTypeFilter.ReturnIncome)
+
+    assert page.transactions == []
+    page = await transactions_repository.find_transactions_page(transaction_type=TransactionTypeFilter.Income)
+    assert page.transaction_types[testdata.TransactionCashbackIncome.id] == TransactionTypeFilter.Income
+
+
+async def test_find_transactions_page_should_return_stored_types(
+    transactions_repository: TransactionsRepository,
+    accounts_repository: AccountsRepository,
+    tags_repository: TagsRepository,
+) -> None:
+    await accounts_repository.save_accounts(testdata.TestAccounts)
+    await tags_repository.save_tags(testdata.TestTags)
+    await transactions_repository.save_transactions(testdata.TestTransactions)
+
+    page = await transactions_repository.find_transactions_page()
+
+    assert page.transaction_types[testdata.TransactionSalary.id] == TransactionTypeFilter.Income
+    assert page.transaction_types[testdata.TransactionDebtRepaid.id] == TransactionTypeFilter.DebtRepaid
+    assert page.transaction_types[testdata.TransactionSalaryReturn.id] == TransactionTypeFilter.ReturnExpense
+
+
+async def test_find_transactions_page_with_references_should_return_titles(
+    container: Container,
+    transactions_repository: TransactionsRepository,
+    accounts_repository: AccountsRepository,
+    tags_repository: TagsRepository,
+) -> None:
+    await accounts_repository.save_accounts(testdata.TestAccounts)
+    await tags_repository.save_tags([testdata.TagCafes])
+    await container.resolve(InstrumentsRepository).save_instruments(testdata.TestInstruments)
+    await container.resolve(MerchantsRepository).save_merchants(testdata.TestMerchants)
+    await transactions_repository.save_transactions(testdata.TestTransactions)
+
+    page = await transactions_repository.find_transactions_page(with_references=True)
+
+    assert page.references[testdata.TransactionCafeExpense.id] == TransactionReferences(
+        tags_titles=[testdata.TagCafes.title, None],
+        income_account_title=testdata.CardAccount.title,
+        income_account_type=testdata.CardAccount.type,
+        outcome_account_title=testdata.CashAccount.title,
+        outcome_account_type=testdata.CashAccount.type,
+        income_instrument_title=testdata.InstrumentRUB.title,
+        outcome_instrument_title=testdata.InstrumentEUR.title,
+        merchant_title=testdata.MerchantAlphaMega.title,
+    )
+    assert page.references[testdata.TransactionNoTagExpense.id].tags_titles == []
+
+
+async def test_refresh_transaction_types_should_derive_rows_loaded_in_bulk(
+    container: Container,
+    transactions_repository: TransactionsRepository,
+    tags_repository: TagsRepository,
+) -> None:
+    await tags_repository.save_tags(testdata.TestTags)
+    await container.resolve(BootstrapLoader).load(TransactionsTable, Transaction, testdata.TestTransactions)
+
+    assert await transactions_repository.refresh_transaction_types() == len(testdata.TestTransactions)
+    assert await transactions_repository.refresh_transaction_types() == 0
+    return_income, _ = await transactions_repository.find_transactions(transaction_type=TransactionTypeFilter.ReturnIncome)
+    assert return_income == [testdata.TransactionCashbackIncome, testdata.TransactionRefundIncome]
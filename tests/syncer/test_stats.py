@@ -0,0 +1,56 @@
+import time
+
+import pytest
+
+from finstats.store import UpsertResult
+from finstats.syncer import SyncMetrics, SyncStats
+from finstats.zenmoney import DiffTimings
+
+pytestmark = pytest.mark.no_migrations()
+
+
+def test_sync_stats_should_sum_rows_of_batches() -> None:
+    stats = SyncStats(source="stream", previous_timestamp=0)
+
+    stats.add_rows({"tags": UpsertResult(inserted=2), "users": UpsertResult(skipped=1)})
+    stats.add_rows({"tags": UpsertResult(inserted=1, updated=3)})
+
+    assert stats.rows == {"tags": UpsertResult(inserted=3, updated=3), "users": UpsertResult(skipped=1)}
+
+
+def test_sync_stats_freshness_lag_should_be_measured_from_previous_timestamp() -> None:
+    stats = SyncStats(source="diff", previous_timestamp=int(time.time()) - 60)
+
+    stats.finish(time.perf_counter())
+
+    assert stats.freshness_lag_seconds is not None
+    assert 60 <= stats.freshness_lag_seconds < 70
+
+
+def test_sync_stats_freshness_lag_should_be_none_for_initial_sync() -> None:
+    stats = SyncStats(source="diff", previous_timestamp=0)
+
+    stats.finish(time.perf_counter())
+
+    assert stats.freshness_lag_seconds is None
+    assert stats.as_log_fields()["freshness_lag_seconds"] is None
+
+
+def test_sync_metrics_should_accumulate_runs() -> None:
+    metrics = SyncMetrics()
+    first = SyncStats(source="diff", previous_timestamp=100, timings=DiffTimings(network_seconds=1.5, payload_bytes=10), db_write_seconds=0.5)
+    first.add_rows({"tags": UpsertResult(inserted=1)})
+    second = SyncStats(source="diff", previous_timestamp=200, timings=DiffTimings(network_seconds=0.5, payload_bytes=5))
+    second.add_rows({"tags": UpsertResult(skipped=1)})
+
+    metrics.observe(first)
+    metrics.observe_failure()
+    metrics.observe(second)
+
+    assert metrics.runs_total == 3
+    assert metrics.failures_total == 1
+    assert metrics.payload_bytes_total == 15
+    assert metrics.phase_seconds_total == {"network": 2.0, "decode": 0.0, "convert": 0.0, "db_write": 0.5}
+    assert metrics.rows_total == {"tags": UpsertResult(inserted=1, skipped=1)}
+    assert metrics.last is second
+    assert metrics.last_success_at is not None
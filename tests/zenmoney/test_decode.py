@@ -0,0 +1,97 @@
+import decimal
+import json
+from typing import Any
+
+import marshmallow_recipe as mr
+import pytest
+
+from finstats.zenmoney import ZenMoneyClientException
+from finstats.zenmoney.convert import (
+    DEFAULT_OUTCOME_ACCOUNT_ID,
+    accounts_to_zm_accounts,
+    companies_to_zm_companies,
+    countries_to_zm_countries,
+    instruments_to_zm_instruments,
+    merchants_to_zm_merchants,
+    tags_to_zm_tags,
+    transactions_to_zm_transactions,
+    users_to_zm_users,
+    zm_diff_to_diff,
+)
+from finstats.zenmoney.decode import decode_diff, decode_instrument, decode_transaction
+from finstats.zenmoney.models import ZmDiffResponse
+from testing import testdata
+
+pytestmark = pytest.mark.no_migrations()
+
+
+def _dump(items: list[Any]) -> list[dict[str, Any]]:
+    return [mr.dump(item, naming_case=mr.CAMEL_CASE) for item in items]
+
+
+def _make_response() -> dict[str, Any]:
+    transactions = _dump(transactions_to_zm_transactions(testdata.TestTransactions))
+    # what the API may send besides dumps of complete entities
+    transactions[0].update(outcomeAccount=None, tag=None, income=12, outcome="0.5", changed=1768674600)
+    transactions[1].update(income=decimal.Decimal("10.125"), latitude=decimal.Decimal("55.75"), longitude=37)
+    for key in ("hold", "qrCode", "opIncome", "mcc", "source"):
+        transactions[2].pop(key, None)
+    accounts = _dump(accounts_to_zm_accounts(testdata.TestAccounts))
+    accounts[0].update(syncID=None, percent=decimal.Decimal("7.5"), startDate=1768674600)
+    data = {
+        "serverTimestamp": 1700000000,
+        "account": accounts,
+        "company": _dump(companies_to_zm_companies(testdata.TestCompanies)),
+        "country": _dump(countries_to_zm_countries(testdata.TestCountries)),
+        "instrument": _dump(instruments_to_zm_instruments(testdata.TestInstruments)),
+        "merchant": _dump(merchants_to_zm_merchants(testdata.TestMerchants)),
+        "tag": _dump(tags_to_zm_tags(testdata.TestTags)),
+        "transaction": transactions,
+        "user": _dump(users_to_zm_users(testdata.TestUsers)),
+        "reminder": [{"id": "ignored"}],
+    }
+    # the client parses floats as decimals
+    return json.loads(json.dumps(data, default=str), parse_float=decimal.Decimal)
+
+
+def test_decode_diff_should_match_converters_of_zm_models() -> None:
+    data = _make_response()
+    expected = zm_diff_to_diff(mr.load(ZmDiffResponse, data, naming_case=mr.CAMEL_CASE))
+
+    actual = decode_diff(data)
+
+    assert actual == expected
+    assert len(actual.transactions) == len(testdata.TestTransactions)
+
+
+def test_decode_diff_without_entities_should_return_empty_diff() -> None:
+    actual = decode_diff({"serverTimestamp": 1700000000})
+
+    assert actual == zm_diff_to_diff(ZmDiffResponse(server_timestamp=1700000000))
+
+
+def test_decode_diff_without_timestamp_should_raise() -> None:
+    with pytest.raises(ZenMoneyClientException, match="serverTimestamp"):
+        decode_diff({"transaction": []})
+
+
+def test_decode_diff_with_invalid_entity_should_raise() -> None:
+    [transaction] = _dump(transactions_to_zm_transactions([testdata.TransactionSalary]))
+    del transaction["incomeAccount"]
+
+    with pytest.raises(ZenMoneyClientException, match="Invalid 'transaction'"):
+        decode_diff({"serverTimestamp": 1700000000, "transaction": [transaction]})
+
+
+def test_decode_transaction_should_default_missing_outcome_account() -> None:
+    [transaction] = _dump(transactions_to_zm_transactions([testdata.TransactionSalary]))
+    transaction["outcomeAccount"] = None
+
+    assert decode_transaction(transaction).outcome_account == DEFAULT_OUTCOME_ACCOUNT_ID
+
+
+def test_decode_instrument_should_keep_rate_precision() -> None:
+    [instrument] = _dump(instruments_to_zm_instruments([testdata.InstrumentBYR]))
+    instrument["rate"] = 0.0123
+
+    assert decode_instrument(instrument).rate == decimal.Decimal("0.0123")
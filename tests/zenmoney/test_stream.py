@@ -0,0 +1,126 @@
+import dataclasses
+import decimal
+import json
+from collections.abc import AsyncIterator
+
+import marshmallow_recipe as mr
+import pytest
+
+from finstats.domain import ZenmoneyDiff
+from finstats.zenmoney import DiffTimings, ZenMoneyClientException
+from finstats.zenmoney.convert import accounts_to_zm_accounts, tags_to_zm_tags, transactions_to_zm_transactions, zm_diff_to_diff
+from finstats.zenmoney.models import ZmDiffResponse
+from finstats.zenmoney.stream import JsonStreamReader, parse_diff_stream
+from testing import testdata
+
+pytestmark = [pytest.mark.asyncio(loop_scope="session"), pytest.mark.no_migrations()]
+
+
+async def _chunks(data: bytes, size: int) -> AsyncIterator[bytes]:
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+def _make_payload() -> bytes:
+    data = {
+        "serverTimestamp": 1700000000,
+        "account": [mr.dump(a, naming_case=mr.CAMEL_CASE) for a in accounts_to_zm_accounts(testdata.TestAccounts)],
+        "reminder": [{"id": "ignored", "payee": "Магазин"}],
+        "tag": [mr.dump(t, naming_case=mr.CAMEL_CASE) for t in tags_to_zm_tags(testdata.TestTags)],
+        "transaction": [mr.dump(t, naming_case=mr.CAMEL_CASE) for t in transactions_to_zm_transactions(testdata.TestTransactions)],
+        "deletion": [],
+    }
+    return json.dumps(data, default=_json_default, ensure_ascii=False, indent=1).encode("utf-8")
+
+
+def _json_default(obj: object) -> float:
+    # the API sends amounts as JSON numbers
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+async def _split(data: bytes, offset: int) -> AsyncIterator[bytes]:
+    yield data[:offset]
+    yield data[offset:]
+
+
+async def _collect(data: bytes, chunk_size: int, batch_size: int) -> list[ZenmoneyDiff]:
+    return [batch async for batch in parse_diff_stream(_chunks(data, chunk_size), batch_size)]
+
+
+def _merge(batches: list[ZenmoneyDiff]) -> ZenmoneyDiff:
+    merged = ZenmoneyDiff(server_timestamp=batches[-1].server_timestamp)
+    for batch in batches:
+        for field in dataclasses.fields(batch):
+            value = getattr(batch, field.name)
+            if isinstance(value, list):
+                getattr(merged, field.name).extend(value)
+    return merged
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64 * 1024])
+async def test_parse_diff_stream_should_match_buffered_parsing(chunk_size: int) -> None:
+    payload = _make_payload()
+    expected = zm_diff_to_diff(mr.load(ZmDiffResponse, json.loads(payload, parse_float=decimal.Decimal), naming_case=mr.CAMEL_CASE))
+
+    batches = await _collect(payload, chunk_size, batch_size=3)
+
+    assert _merge(batches) == expected
+
+
+async def test_parse_diff_stream_should_yield_bounded_batches() -> None:
+    batches = await _collect(_make_payload(), 1024, batch_size=3)
+
+    for batch in batches[:-1]:
+        assert batch.server_timestamp == 0
+        assert sum(len(getattr(batch, f.name)) for f in dataclasses.fields(batch) if f.name != "server_timestamp") <= 3
+    assert batches[-1] == ZenmoneyDiff(server_timestamp=1700000000)
+
+
+async def test_parse_diff_stream_should_fill_timings() -> None:
+    payload = _make_payload()
+    timings = DiffTimings()
+
+    _ = [batch async for batch in parse_diff_stream(_chunks(payload, 1024), 3, timings)]
+
+    assert timings.payload_bytes == len(payload)
+    assert timings.network_seconds >= 0
+    assert timings.decode_seconds > 0
+    assert timings.convert_seconds > 0
+
+
+async def test_parse_diff_stream_with_error_should_raise() -> None:
+    with pytest.raises(ZenMoneyClientException, match="returned error"):
+        await _collect(b'{"error": "Unauthorized"}', 4, batch_size=10)
+
+
+async def test_parse_diff_stream_truncated_should_raise() -> None:
+    payload = _make_payload()
+    with pytest.raises(ZenMoneyClientException):
+        await _collect(payload[: len(payload) // 2], 64, batch_size=10)
+
+
+async def test_reader_should_not_cut_number_on_chunk_boundary() -> None:
+    reader = JsonStreamReader(_chunks(b'{"a": 1234567, "b": [1.5, 2]}', 1))
+    values = {}
+    async for key in reader.iter_object_keys():
+        if await reader.is_array():
+            values[key] = [v async for v in reader.iter_array()]
+        else:
+            values[key] = await reader.read_value()
+    assert values == {"a": 1234567, "b": [decimal.Decimal("1.5"), 2]}
+
+
+async def test_parse_diff_stream_should_not_depend_on_chunk_boundaries() -> None:
+    payload = _make_payload()
+    expected = await _collect(payload, len(payload), batch_size=3)
+
+    for offset in range(1, len(payload)):
+        assert [batch async for batch in parse_diff_stream(_split(payload, offset), 3)] == expected, offset
+
+
+async def test_reader_should_not_cut_fraction_on_chunk_boundary() -> None:
+    reader = JsonStreamReader(_split(b"[12.5, 3, 1e5, -0.25]", 4))
+
+    assert [v async for v in reader.iter_array()] == [decimal.Decimal("12.5"), 3, decimal.Decimal("1e5"), decimal.Decimal("-0.25")]